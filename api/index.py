@@ -2,15 +2,26 @@ import os
 import sys
 from pathlib import Path
 
-from asgiref.wsgi import WsgiToAsgi
-from django.core.wsgi import get_wsgi_application
-
 # Ensure project root is on sys.path so Django can be imported when deployed.
 BASE_DIR = Path(__file__).resolve().parent.parent
 if str(BASE_DIR) not in sys.path:
     sys.path.append(str(BASE_DIR))
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "juresanguinisapi.settings")
+# The lean profile skips admin, auth, sessions and the database; set
+# DJANGO_SETTINGS_MODULE=juresanguinisapi.settings to serve the full project.
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "juresanguinisapi.settings_lean")
+
+from asgiref.wsgi import WsgiToAsgi  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+
+application = get_wsgi_application()
+
+if getattr(settings, "PRELOAD_RULES", False):
+    from src.evaluator import load_rule_engine
+
+    # Parse and compile the rules during the cold start rather than the first request.
+    load_rule_engine()
 
 # Vercel's Python runtime expects an ASGI-compatible application called `app`.
-app = WsgiToAsgi(get_wsgi_application())
+app = WsgiToAsgi(application)
@@ -0,0 +1,117 @@
+"""Compare the sync DRF evaluate view with the async-native one under ASGI.
+
+Usage::
+
+    python -m benchmarks.asgi_compare --requests 400 --concurrency 50
+
+Both endpoints are driven in-process through Django's ASGI request handler with
+the same payload and concurrency. Besides throughput and latency percentiles, a
+ticker coroutine records how late the event loop wakes up; the sync view runs on
+Django's single sync-to-async thread and the async view on the bounded executor.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+PAYLOAD = {
+    "applicant": {"id": "app", "name": "Applicant", "birth_date": "1960-07-01", "birth_country": "USA"},
+    "ancestors": [
+        {"id": "a1", "name": "Giorgio", "birth_date": "1890-05-01", "birth_country": "Italy"},
+        {"id": "a2", "name": "Anna", "birth_date": "1930-06-01", "birth_country": "Argentina"},
+    ],
+    "lineage_links": [
+        {"parent_id": "a1", "child_id": "a2", "relationship": "mother"},
+        {"parent_id": "a2", "child_id": "app", "relationship": "father"},
+    ],
+}
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def _measure(path, requests, concurrency):
+    from django.test import AsyncClient
+
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    lags = []
+    errors = 0
+    running = True
+
+    async def ticker():
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - started - 0.001)
+
+    async def one_request(index):
+        nonlocal errors
+        # Vary the applicant so the result cache does not short-circuit evaluation.
+        payload = dict(PAYLOAD, applicant=dict(PAYLOAD["applicant"], name=f"Applicant {index}"))
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(path, payload, content_type="application/json")
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code != 200
+
+    ticker_task = asyncio.ensure_future(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request(index) for index in range(requests)))
+    elapsed = time.perf_counter() - started
+    running = False
+    await ticker_task
+
+    return {
+        "path": path,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "requests_per_second": round(requests / elapsed, 1),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 0.50) * 1000, 2),
+            "p95": round(_percentile(latencies, 0.95) * 1000, 2),
+            "p99": round(_percentile(latencies, 0.99) * 1000, 2),
+        },
+        "event_loop_lag_ms": {
+            "mean": round(statistics.mean(lags) * 1000, 3) if lags else 0.0,
+            "max": round(max(lags) * 1000, 3) if lags else 0.0,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "juresanguinisapi.settings")
+    import django
+
+    django.setup()
+
+    report = {
+        "sync": asyncio.run(_measure("/api/evaluate/", args.requests, args.concurrency)),
+        "async": asyncio.run(_measure("/api/evaluate/async/", args.requests, args.concurrency)),
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
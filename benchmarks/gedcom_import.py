@@ -0,0 +1,156 @@
+"""Time the streaming GEDCOM importer on a large synthetic family tree.
+
+Usage::
+
+    python -m benchmarks.gedcom_import --individuals 100000
+
+Writes a seeded GEDCOM file with about ``--individuals`` people, then reports the
+time of indexing it, of walking up from a youngest-generation applicant to the
+Italian-born ancestors and of loading the people on those lineages, plus the peak
+traced memory of indexing (measured in a second, slower run). Each generation is born of couples from the one before; most
+founders are born in Italy and every spouse marrying in is born abroad, so
+lineages end at different depths.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import IO, List, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.gedcom import GedcomIndex  # noqa: E402
+
+MONTHS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+
+
+def _write_person(
+    handle: IO[str],
+    rng: random.Random,
+    person_id: str,
+    year: int,
+    italian: bool,
+    famc: str | None,
+    fams: List[str],
+) -> None:
+    place = "Palermo, Sicilia, Italia" if italian else rng.choice(
+        ["Boston, Massachusetts, USA", "Buenos Aires, Argentina", "Sao Paulo, Brazil"]
+    )
+    handle.write(f"0 @{person_id}@ INDI\n1 NAME Person /{person_id}/\n")
+    handle.write(f"1 SEX {rng.choice('MF')}\n1 BIRT\n")
+    handle.write(f"2 DATE {rng.randint(1, 28)} {rng.choice(MONTHS)} {year}\n2 PLAC {place}\n")
+    if italian and rng.random() < 0.3:
+        handle.write(f"1 NATU\n2 DATE ABT {year + rng.randint(20, 40)}\n2 PLAC New York, USA\n")
+    handle.write("1 RESI\n2 PLAC Somewhere\n1 OCCU Farmer\n")
+    if famc:
+        handle.write(f"1 FAMC @{famc}@\n")
+    for family_id in fams:
+        handle.write(f"1 FAMS @{family_id}@\n")
+
+
+def generate_gedcom(handle: IO[str], individuals: int, seed: int = 0, founders: int = 2000) -> str:
+    """Write a synthetic GEDCOM tree; returns the id of a youngest-generation person."""
+    rng = random.Random(seed)
+    handle.write("0 HEAD\n1 SOUR benchmarks.gedcom_import\n1 GEDC\n2 VERS 5.5.1\n1 CHAR UTF-8\n")
+    counter = 0
+    families: List[str] = []
+
+    def new_id() -> str:
+        nonlocal counter
+        counter += 1
+        return f"I{counter}"
+
+    generation = [(new_id(), rng.random() < 0.7, None) for _ in range(founders)]
+    year = 1800
+    records = []
+    while True:
+        rng.shuffle(generation)
+        next_generation = []
+        fams = {person_id: [] for person_id, _, _ in generation}
+        for person_id, _, _ in generation:
+            # Each person marries a spouse born abroad, written with this generation.
+            spouse_id = new_id()
+            family_id = f"F{len(families) + 1}"
+            families.append(family_id)
+            fams[person_id].append(family_id)
+            records.append((spouse_id, year, False, None, [family_id]))
+            husband, wife = (person_id, spouse_id) if rng.random() < 0.5 else (spouse_id, person_id)
+            handle.write(f"0 @{family_id}@ FAM\n1 HUSB @{husband}@\n1 WIFE @{wife}@\n")
+            for _ in range(rng.choice((1, 1, 2))):
+                child_id = new_id()
+                handle.write(f"1 CHIL @{child_id}@\n")
+                next_generation.append((child_id, rng.random() < 0.02, family_id))
+        for person_id, italian, famc in generation:
+            records.append((person_id, year, italian, famc, fams[person_id]))
+        for person_id, person_year, italian, famc, person_fams in records:
+            _write_person(handle, rng, person_id, person_year, italian, famc, person_fams)
+        records = []
+        year += 28
+        if counter + len(next_generation) * 2 > individuals:
+            for person_id, italian, famc in next_generation:
+                _write_person(handle, rng, person_id, year, italian, famc, [])
+            handle.write("0 TRLR\n")
+            return next_generation[0][0]
+        generation = next_generation
+
+
+def _timed(run):
+    started = time.perf_counter()
+    value = run()
+    return value, round(time.perf_counter() - started, 3)
+
+
+def _peak_mib(run) -> float:
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(peak / 2**20, 2)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--individuals", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", help="write the GEDCOM file here instead of a temporary file")
+    args = parser.parse_args(argv)
+
+    path = args.keep or tempfile.mkstemp(suffix=".ged")[1]
+    try:
+        with open(path, "w", encoding="utf-8") as handle:
+            applicant = generate_gedcom(handle, args.individuals, args.seed)
+        index, indexing = _timed(lambda: GedcomIndex(path))
+        lineages, walking = _timed(lambda: index.lineages(applicant))
+        people, loading = _timed(
+            lambda: index.load_people(
+                person_id for lineage in lineages for person_id in lineage.person_ids
+            )
+        )
+        report = {
+            "individuals": len(index.offsets),
+            "families": len(index.families),
+            "file_mib": round(os.path.getsize(path) / 2**20, 2),
+            "applicant": applicant,
+            "lineages": len(lineages),
+            "people_loaded": len(people),
+            "seconds": {"index": indexing, "walk": walking, "load_people": loading},
+            "index_peak_mib": _peak_mib(lambda: GedcomIndex(path)),
+        }
+    finally:
+        if not args.keep:
+            os.unlink(path)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
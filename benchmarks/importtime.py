@@ -0,0 +1,75 @@
+"""Report the import cost of the serverless entry point.
+
+Usage::
+
+    python -m benchmarks.importtime --top 20
+    python -m benchmarks.importtime --settings juresanguinisapi.settings
+
+Runs ``python -X importtime -c "import api.index"`` in a fresh interpreter, so the
+numbers reflect a cold start, and prints the total plus the most expensive modules
+by cumulative time as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LEAN_SETTINGS = "juresanguinisapi.settings_lean"
+
+
+def measure_imports(module: str = "api.index", settings: str = LEAN_SETTINGS) -> List[Dict]:
+    """Import ``module`` in a fresh interpreter and return one entry per imported module.
+
+    Entries are ``{"module", "self_us", "cumulative_us"}`` in the order the
+    interpreter reports them (dependencies before their importers).
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append(
+            {"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us)}
+        )
+    return entries
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="api.index")
+    parser.add_argument("--settings", default=LEAN_SETTINGS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    entries = measure_imports(args.module, args.settings)
+    total = next(entry for entry in reversed(entries) if entry["module"] == args.module)
+    slowest = sorted(entries, key=lambda entry: entry["self_us"], reverse=True)[: args.top]
+    report = {
+        "module": args.module,
+        "settings": args.settings,
+        "total_ms": round(total["cumulative_us"] / 1000, 1),
+        "modules_imported": len(entries),
+        "slowest_self_ms": {entry["module"]: round(entry["self_us"] / 1000, 1) for entry in slowest},
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""End-to-end HTTP load test against a locally started server.
+
+Usage::
+
+    python -m benchmarks.loadtest --server wsgi --concurrency 16 --duration 20
+    python -m benchmarks.loadtest --server asgi --workers 4 --path /api/evaluate/async/
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --corpus recorded.jsonl
+
+``--server wsgi`` serves ``juresanguinisapi.wsgi`` from a threaded ``wsgiref``
+server in a child process; ``--server asgi`` runs ``juresanguinisapi.asgi`` under
+uvicorn (``pip install uvicorn``) with ``--workers`` processes. ``--url`` targets
+a server that is already running instead. Request bodies cycle through either the
+seeded synthetic corpus, a JSONL file of recorded payloads or the requests of a
+``capture-*.jsonl`` file written by traffic capture (``src/capture.py``).
+
+Each client thread keeps its own connection, so ``--concurrency`` is the number of
+requests in flight. The JSON report gives throughput, latency percentiles in
+milliseconds, status counts and the error rate; everything runs offline on one box.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import generate_corpus  # noqa: E402
+from src.capture import iter_captured_requests  # noqa: E402
+
+DEFAULT_SETTINGS = "juresanguinisapi.settings"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve_wsgi(port: int) -> None:
+    """Serve the Django WSGI application on a thread-per-request ``wsgiref`` server."""
+    from socketserver import ThreadingMixIn
+    from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+    from juresanguinisapi.wsgi import application
+
+    class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+        request_queue_size = 1024
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    with make_server("127.0.0.1", port, application, ThreadingWSGIServer, QuietHandler) as server:
+        server.serve_forever()
+
+
+def start_server(kind: str, port: int, settings: str = DEFAULT_SETTINGS, workers: int = 1):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings, PYTHONPATH=str(ROOT))
+    if kind == "wsgi":
+        command = [sys.executable, "-m", "benchmarks.loadtest", "--serve-wsgi", str(port)]
+    elif kind == "asgi":
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            raise SystemExit("--server asgi requires uvicorn: pip install uvicorn")
+        command = [
+            sys.executable, "-m", "uvicorn", "juresanguinisapi.asgi:application",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ]
+    else:
+        raise ValueError(f"Unknown server kind {kind!r}")
+    process = subprocess.Popen(command, cwd=ROOT, env=env)
+    _wait_for_port(port, process)
+    return process
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Server did not start listening on port {port}")
+
+
+def load_corpus(path: Optional[str], seed: int, count: int) -> List[bytes]:
+    if path and os.path.basename(path).startswith("capture-"):
+        # Files written by TrafficCapture; malformed captured bodies are kept as text.
+        return [
+            (body if isinstance(body, str) else json.dumps(body, separators=(",", ":"))).encode(
+                "utf-8"
+            )
+            for body in iter_captured_requests(path)
+        ]
+    if path:
+        with open(path, "r", encoding="utf-8") as handle:
+            return [line.strip().encode("utf-8") for line in handle if line.strip()]
+    return [
+        json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        for payload in generate_corpus(seed, count, min_depth=2, max_depth=20)
+    ]
+
+
+def _percentile(ordered: Sequence[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_load(
+    url: str,
+    bodies: Sequence[bytes],
+    concurrency: int = 8,
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+    warmup: int = 20,
+) -> Dict:
+    """Send POST requests until ``requests`` are done or ``duration`` seconds pass."""
+    target = urlsplit(url)
+    path = target.path or "/"
+    bodies_cycle = itertools.cycle(bodies)
+    lock = threading.Lock()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    deadline: Optional[float] = None
+
+    def take(budget: Optional[int]) -> Callable[[], Optional[bytes]]:
+        counter = itertools.count()
+
+        def next_body() -> Optional[bytes]:
+            index = next(counter)
+            if budget is not None and index >= budget:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            with lock:
+                return next(bodies_cycle)
+
+        return next_body
+
+    def send(connection: http.client.HTTPConnection, body: bytes) -> str:
+        try:
+            connection.request("POST", path, body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            if response.will_close:
+                connection.close()
+            return str(response.status)
+        except (OSError, http.client.HTTPException) as exc:
+            connection.close()
+            return type(exc).__name__
+
+    def worker(next_body: Callable[[], Optional[bytes]], record: bool) -> None:
+        connection = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+        while (body := next_body()) is not None:
+            started = time.perf_counter()
+            status = send(connection, body)
+            elapsed = time.perf_counter() - started
+            if record:
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[status] = statuses.get(status, 0) + 1
+        connection.close()
+
+    # Warm-up requests prime the server's rule cache and are left out of the report.
+    _run_threads(worker, (take(warmup), False), concurrency)
+
+    started = time.perf_counter()
+    if duration is not None:
+        deadline = started + duration
+    _run_threads(worker, (take(requests), True), concurrency)
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    total = len(ordered)
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "requests": total,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(ordered, 0.50) * 1000, 2) if total else None,
+            "p95": round(_percentile(ordered, 0.95) * 1000, 2) if total else None,
+            "p99": round(_percentile(ordered, 0.99) * 1000, 2) if total else None,
+            "max": round(ordered[-1] * 1000, 2) if total else None,
+        },
+        "statuses": dict(sorted(statuses.items())),
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+    }
+
+
+def _run_threads(target: Callable, args: Tuple, count: int) -> None:
+    threads = [threading.Thread(target=target, args=args, daemon=True) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--serve-wsgi", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    parser.add_argument("--server", choices=["wsgi", "asgi"], default="wsgi")
+    parser.add_argument("--url", help="base URL of a running server; nothing is started")
+    parser.add_argument("--settings", default=DEFAULT_SETTINGS, help="Django settings module")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--path", default="/api/evaluate/")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run for")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--corpus",
+        help="JSONL file of payloads or a capture-*.jsonl[.gz] file (default: synthetic)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", type=int, default=200, help="synthetic payloads to cycle through")
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.serve_wsgi:
+        serve_wsgi(args.serve_wsgi)
+        return 0
+
+    bodies = load_corpus(args.corpus, args.seed, args.cases)
+    process = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        process = start_server(args.server, port, args.settings, args.workers)
+        base_url = f"http://127.0.0.1:{port}"
+    try:
+        report = run_load(
+            base_url.rstrip("/") + args.path,
+            bodies,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            duration=None if args.requests else args.duration,
+            warmup=args.warmup,
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    report["server"] = "external" if args.url else args.server
+    report["settings"] = None if args.url else args.settings
+    report["workers"] = args.workers if args.server == "asgi" and not args.url else 1
+    report["corpus"] = args.corpus or f"synthetic(seed={args.seed}, cases={args.cases})"
+    report["python"] = platform.python_version()
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(encoded + "\n", encoding="utf-8")
+    else:
+        print(encoded)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""Per-stage microbenchmarks of the evaluation hot path.
+
+Usage::
+
+    python -m benchmarks.microbench --cases 500 -o bench.json
+    python -m benchmarks.microbench --compare bench.json --max-slowdown 1.2
+
+Times request decoding, ``build_feature_flags``, ``RuleLoader.load``, the
+interpreted ``JsonLogicEvaluator`` and ``RuleEngine.evaluate`` separately over a
+seeded synthetic corpus (see ``benchmarks.synthetic``). Each stage is run
+``--repeat`` times; the report gives the median and best per-operation time in
+microseconds as JSON. ``--compare`` prints the ratio against an earlier report
+and exits non-zero when a stage got slower than ``--max-slowdown``.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import generate_corpus  # noqa: E402
+from src.decoder import decode_request  # noqa: E402
+from src.evaluator import DEFAULT_RULE_PATHS  # noqa: E402
+from src.rule_engine.features import build_feature_flags  # noqa: E402
+from src.rule_engine.json_logic import JsonLogicEvaluator  # noqa: E402
+from src.rule_engine.loader import RuleLoader  # noqa: E402
+from src.rule_engine.pipeline import EvaluationContext, RuleEngine  # noqa: E402
+
+
+def _time_stage(run: Callable[[], None], operations: int, repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) / operations * 1e6)
+    return {
+        "operations": operations,
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(min(samples), 3),
+    }
+
+
+def run_benchmarks(
+    seed: int = 0,
+    cases: int = 500,
+    repeat: int = 5,
+    min_depth: int = 2,
+    max_depth: int = 50,
+    event_density: float = 1.0,
+) -> Dict:
+    payloads = list(generate_corpus(seed, cases, min_depth, max_depth, event_density))
+    decoded = [decode_request(payload) for payload in payloads]
+    loader = RuleLoader(DEFAULT_RULE_PATHS)
+    rules = loader.load()
+    engine = RuleEngine(rules, version=loader.fingerprint())
+    now = datetime(2025, 1, 1)
+
+    contexts = []
+    for links, process_context in decoded:
+        contexts.append(
+            EvaluationContext(
+                lineage_chain=links,
+                process_context=process_context,
+                now=now,
+                features=build_feature_flags(links),
+            )
+        )
+    flat_contexts = [context.to_dict() for context in contexts]
+    # Feature extraction annotates links, so it runs on its own copies.
+    feature_chains = [copy.deepcopy(links) for links, _ in decoded]
+
+    def decode() -> None:
+        for payload in payloads:
+            decode_request(payload)
+
+    def features() -> None:
+        for links in feature_chains:
+            build_feature_flags(links)
+
+    def load_rules() -> None:
+        for _ in range(10):
+            RuleLoader(DEFAULT_RULE_PATHS).load()
+
+    def interpret() -> None:
+        for flat_context in flat_contexts:
+            evaluator = JsonLogicEvaluator(flat_context)
+            for rule in rules:
+                evaluator.evaluate(rule.condition)
+
+    def evaluate() -> None:
+        for context in contexts:
+            engine.evaluate(context)
+
+    stages = {
+        "decode_request": _time_stage(decode, cases, repeat),
+        "build_feature_flags": _time_stage(features, cases, repeat),
+        "rule_loader_load": _time_stage(load_rules, 10, repeat),
+        "json_logic_evaluate": _time_stage(interpret, cases * len(rules), repeat),
+        "rule_engine_evaluate": _time_stage(evaluate, cases, repeat),
+    }
+    return {
+        "meta": {
+            "seed": seed,
+            "cases": cases,
+            "repeat": repeat,
+            "depth": [min_depth, max_depth],
+            "event_density": event_density,
+            "rules": len(rules),
+            "rule_set_version": engine.version,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+        },
+        "stages": stages,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare(report: Dict, baseline: Dict, max_slowdown: float) -> List[str]:
+    """Ratios of median times against ``baseline``; returns the stages over ``max_slowdown``."""
+    regressions = []
+    for stage, timing in report["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            continue
+        ratio = timing["median_us"] / previous["median_us"]
+        print(
+            f"{stage:24} {previous['median_us']:>10.2f}us -> {timing['median_us']:>10.2f}us"
+            f"  x{ratio:.2f}",
+            file=sys.stderr,
+        )
+        if ratio > max_slowdown:
+            regressions.append(stage)
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-depth", type=int, default=2)
+    parser.add_argument("--max-depth", type=int, default=50)
+    parser.add_argument("--event-density", type=float, default=1.0)
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        args.seed, args.cases, args.repeat, args.min_depth, args.max_depth, args.event_density
+    )
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(encoded + "\n", encoding="utf-8")
+    else:
+        print(encoded)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.max_slowdown)
+        if regressions:
+            print(f"Slower than x{args.max_slowdown}: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
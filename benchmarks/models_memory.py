@@ -0,0 +1,97 @@
+"""Measure memory held per evaluated case and the cost of encoding results.
+
+Usage::
+
+    python -m benchmarks.models_memory --cases 20000
+
+Decodes and evaluates ``--cases`` copies of a three-generation payload while
+keeping every lineage and result alive, as a batch job accumulating results
+would, and reports the traced allocation per case. Encoding time covers
+``EvaluationResult.to_payload`` alone and followed by compact JSON encoding.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.decoder import decode_request  # noqa: E402
+from src.evaluator import evaluate_lineage, load_rule_engine  # noqa: E402
+
+PAYLOAD = {
+    "applicant": {"id": "app", "name": "Applicant", "birth_date": "1960-07-01", "birth_country": "USA"},
+    "ancestors": [
+        {
+            "id": "a1",
+            "name": "Giorgio",
+            "birth_date": "1890-05-01",
+            "birth_country": "Italy",
+            "events": [{"kind": "naturalization_foreign", "date": "1935-02-01", "country": "USA"}],
+        },
+        {"id": "a2", "name": "Anna", "birth_date": "1930-06-01", "birth_country": "Argentina"},
+    ],
+    "lineage_links": [
+        {"parent_id": "a1", "child_id": "a2", "relationship": "mother"},
+        {"parent_id": "a2", "child_id": "app", "relationship": "father"},
+    ],
+}
+
+
+def _evaluate(engine):
+    lineage_links, process_context = decode_request(PAYLOAD)
+    return evaluate_lineage(lineage_links, process_context=process_context, engine=engine, cache=None)
+
+
+def measure_memory(cases: int) -> float:
+    engine = load_rule_engine()
+    _evaluate(engine)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    results = [_evaluate(engine) for _ in range(cases)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return (after - before) / cases
+
+
+def measure_encoding(cases: int) -> dict:
+    result = _evaluate(load_rule_engine())
+    started = time.perf_counter()
+    for _ in range(cases):
+        result.to_payload()
+    to_payload = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(cases):
+        json.dumps(result.to_payload(), ensure_ascii=False, separators=(",", ":"))
+    to_json = time.perf_counter() - started
+    return {
+        "to_payload_us": round(to_payload / cases * 1e6, 2),
+        "to_payload_and_json_us": round(to_json / cases * 1e6, 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    report = {
+        "cases": args.cases,
+        "bytes_per_case": round(measure_memory(args.cases)),
+        **measure_encoding(args.cases),
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
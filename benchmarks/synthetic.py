@@ -0,0 +1,117 @@
+"""Seeded generator of synthetic evaluation payloads.
+
+Payloads have the same shape as the ``/api/evaluate/`` body. The same seed and
+arguments always produce the same corpus, so benchmark runs on different commits
+measure identical inputs. Lineages mix in the situations the rules care about:
+pre-1948 maternal links, naturalizations while a child was a minor, post-reform
+births with another citizenship, and ancestors born outside Italy.
+"""
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List
+
+EVENT_KINDS = ("marriage", "residence_abroad", "consular_registration", "military_service")
+
+
+def _iso(value: date) -> str:
+    return value.isoformat()
+
+
+def _events(rng: random.Random, born: date, density: float, child_born: date | None) -> List[Dict]:
+    events = []
+    for _ in range(int(density * rng.randint(0, 4))):
+        events.append(
+            {
+                "kind": rng.choice(EVENT_KINDS),
+                "date": _iso(born + timedelta(days=rng.randint(6000, 25000))),
+                "country": rng.choice(["USA", "Argentina", "Brazil", "Italy"]),
+            }
+        )
+    roll = rng.random()
+    if child_born is not None and roll < 0.15:
+        # Naturalized while the child was a minor: the 1912-law minor issue.
+        events.append(
+            {
+                "kind": "naturalization_foreign",
+                "date": _iso(child_born + timedelta(days=rng.randint(365, 17 * 365))),
+                "country": "USA",
+                "metadata": {
+                    "co_resident_child": rng.random() < 0.8,
+                    "jus_soli_country": rng.random() < 0.7,
+                    "child_emancipated": rng.random() < 0.1,
+                },
+            }
+        )
+    elif child_born is not None and roll < 0.25:
+        events.append(
+            {
+                "kind": "naturalization_foreign",
+                "date": _iso(child_born + timedelta(days=rng.randint(-9000, 25000))),
+                "country": "USA",
+            }
+        )
+    elif roll < 0.28:
+        lost = born + timedelta(days=rng.randint(6000, 12000))
+        events.append({"kind": "automatic_loss_by_marriage", "date": _iso(lost)})
+    return events
+
+
+def generate_payload(rng: random.Random, depth: int, event_density: float = 1.0) -> Dict[str, Any]:
+    """One lineage of ``depth`` links, oldest ancestor first."""
+    # Space generations so the youngest can land either side of the 2024 reform.
+    gap = rng.randint(22, 34)
+    births = []
+    born = date(2025 - gap * depth - rng.randint(-15, 10), rng.randint(1, 12), rng.randint(1, 28))
+    for _ in range(depth + 1):
+        births.append(born)
+        born = born + timedelta(days=int(gap * 365.25) + rng.randint(-1500, 1500))
+
+    people = []
+    for index, born in enumerate(births):
+        child_born = births[index + 1] if index < depth else None
+        if index == 0 and rng.random() < 0.9:
+            country = "Italy"
+        else:
+            country = rng.choice(["USA", "Argentina", "Brazil", "Italia"])
+        person = {
+            "id": "app" if index == depth else f"a{index}",
+            "name": f"Person {index}",
+            "birth_date": _iso(born),
+            "birth_country": country,
+            "events": _events(rng, born, event_density, child_born),
+        }
+        if born >= date(2024, 12, 23) and rng.random() < 0.8:
+            person["other_citizenships_at_birth"] = ["USA"]
+            person["notes"] = {"tajani_exemption": rng.random() < 0.3}
+        elif index == depth and rng.random() < 0.1:
+            person["notes"] = {"resident_in_italy_as_descendant": True}
+        people.append(person)
+
+    links = [
+        {
+            "parent_id": people[index]["id"],
+            "child_id": people[index + 1]["id"],
+            # Maternal links before 1948 exercise the court-only path.
+            "relationship": "mother" if rng.random() < 0.3 else "father",
+        }
+        for index in range(depth)
+    ]
+    payload = {"applicant": people[-1], "ancestors": people[:-1], "lineage_links": links}
+    if rng.random() < 0.5:
+        payload["context"] = {"process_type": rng.choice(["ADMIN", "COURT"])}
+    return payload
+
+
+def generate_corpus(
+    seed: int = 0,
+    count: int = 500,
+    min_depth: int = 2,
+    max_depth: int = 50,
+    event_density: float = 1.0,
+) -> Iterator[Dict[str, Any]]:
+    """``count`` payloads with depths drawn uniformly from ``min_depth``..``max_depth``."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_payload(rng, rng.randint(min_depth, max_depth), event_density)
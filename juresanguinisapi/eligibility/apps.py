@@ -1,6 +1,23 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class EligibilityConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "juresanguinisapi.eligibility"
+
+    def ready(self):
+        if getattr(settings, "RULE_STATS", False):
+            from src.rule_engine.registry import RULE_SETS
+
+            RULE_SETS.enable_stats()
+        if getattr(settings, "RULE_TRUTH_TABLES", False):
+            from src.rule_engine.registry import RULE_SETS
+
+            RULE_SETS.enable_truth_tables()
+        if getattr(settings, "AUDIT_LOG", False) and getattr(settings, "AUDIT_SQLITE_WAL", True):
+            from django.db.backends.signals import connection_created
+
+            from .audit import enable_sqlite_wal
+
+            connection_created.connect(enable_sqlite_wal)
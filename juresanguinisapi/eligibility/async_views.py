@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+
+from src.encoding import encode_result
+from src.evaluator import load_rule_engine
+from src.instrumentation import stage
+
+from .views import (
+    audit_evaluation,
+    batch_result_line,
+    decode_evaluation_request,
+    encode_json,
+    timed_evaluation,
+)
+
+
+class BoundedExecutor:
+    """Runs CPU-bound work on a fixed thread pool without blocking the event loop.
+
+    At most ``max_pending`` calls per event loop are submitted to the pool; further
+    callers wait on an asyncio semaphore, so a burst of slow clients costs
+    coroutines rather than threads or an unbounded executor queue.
+    """
+
+    def __init__(self, max_workers, max_pending):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="evaluate")
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(loop, asyncio.Semaphore(self.max_pending))
+        # Copy the caller's context so stage timings recorded on the pool reach its timer.
+        call = functools.partial(contextvars.copy_context().run, fn, *args)
+        async with semaphore:
+            return await loop.run_in_executor(self._executor, call)
+
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        workers = getattr(settings, "EVALUATION_EXECUTOR_WORKERS", None) or min(
+            4, os.cpu_count() or 1
+        )
+        pending = getattr(settings, "EVALUATION_EXECUTOR_MAX_PENDING", None) or workers * 4
+        _executor = BoundedExecutor(workers, pending)
+    return _executor
+
+
+def _json_response(data, status=200):
+    return HttpResponse(encode_json(data), status=status, content_type="application/json")
+
+
+def _evaluate_body(data):
+    lineage_links, process_context = decode_evaluation_request(data)
+    result, seconds = timed_evaluation(lineage_links, process_context)
+    audit_evaluation(lineage_links, process_context, result, seconds)
+    return encode_result(result)
+
+
+def _parse_json_body(request):
+    try:
+        # An empty body validates like ``{}``, as it does through DRF's parsers.
+        return json.loads(request.body) if request.body else {}
+    except ValueError as exc:
+        raise ParseError(f"JSON parse error - {exc}")
+
+
+def _iter_ndjson(body):
+    for raw_line in body.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield ParseError(f"JSON parse error - {exc}")
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncEvaluateLineageView(View):
+    """Async-native counterpart of ``EvaluateLineageView`` for ASGI deployments.
+
+    Decoding and evaluation run on the bounded executor, so the event loop only
+    handles I/O. Responses and error bodies match the synchronous view.
+    """
+
+    http_method_names = ["post"]
+
+    async def post(self, request):
+        try:
+            with stage("parse"):
+                data = _parse_json_body(request)
+            body = await get_executor().run(_evaluate_body, data)
+        except serializers.ValidationError as exc:
+            return _json_response(exc.detail, status=400)
+        except ParseError as exc:
+            return _json_response({"detail": exc.detail}, status=400)
+        return HttpResponse(body, content_type="application/json")
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncEvaluateLineageBatchView(View):
+    """Async-native counterpart of ``EvaluateLineageBatchView``.
+
+    Up to the executor's worker count of items are evaluated concurrently, and
+    lines are still streamed back in input order.
+    """
+
+    http_method_names = ["post"]
+
+    async def post(self, request):
+        if request.content_type == "application/x-ndjson":
+            items = _iter_ndjson(request.body)
+        else:
+            try:
+                items = _parse_json_body(request)
+            except ParseError as exc:
+                return _json_response({"detail": exc.detail}, status=400)
+            if not isinstance(items, list):
+                return _json_response(
+                    {"detail": "Expected a JSON array or NDJSON stream of evaluation requests."},
+                    status=400,
+                )
+
+        return StreamingHttpResponse(
+            self._stream_results(items, load_rule_engine()),
+            content_type="application/x-ndjson",
+        )
+
+    async def _stream_results(self, items, engine):
+        executor = get_executor()
+        window = []
+        for index, item in enumerate(items):
+            window.append(asyncio.ensure_future(executor.run(batch_result_line, index, item, engine)))
+            if len(window) >= executor.max_workers:
+                yield await window.pop(0)
+        for pending in window:
+            yield await pending
@@ -0,0 +1,184 @@
+"""Batched, off-request persistence of served evaluations.
+
+``AuditWriter.submit`` queues what the request already has (lineage, context,
+result and timings) and returns; one background thread hashes the inputs and
+inserts queued evaluations with ``bulk_create`` in a single transaction per batch
+of up to ``batch_size``, waiting at most ``flush_interval`` seconds for a batch to
+fill. A full queue drops the evaluation and counts it rather than delaying the
+response.
+"""
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from src.result_cache import lineage_fingerprint
+
+from .models import EvaluationAudit, EvaluationAuditOutcome
+
+logger = logging.getLogger(__name__)
+
+
+def enable_sqlite_wal(sender, connection, **kwargs):
+    """``connection_created`` receiver switching SQLite databases to write-ahead logging.
+
+    With WAL, readers of the audit table do not block the writer thread and each
+    commit appends to the log instead of rewriting pages; ``synchronous=NORMAL`` is
+    durable across application crashes in this mode.
+    """
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+
+
+class AuditWriter:
+    """Bounded queue of served evaluations written to ``EvaluationAudit`` in batches."""
+
+    def __init__(self, batch_size=500, flush_interval=1.0, maxsize=10_000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, lineage_chain, process_context, result, evaluation_seconds, stages=None):
+        """Queue a served evaluation; returns ``False`` if the queue was full."""
+        item = (
+            timezone.now(),
+            lineage_chain,
+            process_context,
+            result,
+            evaluation_seconds,
+            dict(stages or {}),
+        )
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def join(self):
+        """Wait until every queued evaluation is committed."""
+        self._queue.join()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "written": self.written,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+
+    def write_batch(self, items):
+        """Insert ``submit`` items, and the rules that fired in them, in one transaction."""
+        audits = []
+        outcomes = []
+        for created_at, lineage_chain, process_context, result, seconds, stages in items:
+            audits.append(
+                EvaluationAudit(
+                    created_at=created_at,
+                    input_hash=lineage_fingerprint(
+                        lineage_chain, process_context, result.rule_set_version or ""
+                    ),
+                    rule_set_version=result.rule_set_version,
+                    overall_status=result.overall_status.value,
+                    acquisition_mode=result.acquisition_mode.value,
+                    confidence=result.confidence.value,
+                    court_viability=result.court_viability.value,
+                    needs_lawyer=result.needs_lawyer,
+                    evaluation_ms=round(seconds * 1000, 3),
+                    stage_ms={name: round(value * 1000, 3) for name, value in stages.items()},
+                )
+            )
+            outcomes.append(result.rule_outcomes)
+        with transaction.atomic():
+            # SQLite and PostgreSQL return the new primary keys from bulk_create.
+            EvaluationAudit.objects.bulk_create(audits)
+            EvaluationAuditOutcome.objects.bulk_create(
+                EvaluationAuditOutcome(
+                    audit=audit, rule_id=outcome.rule_id, status=outcome.status.value
+                )
+                for audit, fired in zip(audits, outcomes)
+                for outcome in fired
+            )
+        with self._lock:
+            self.written += len(audits)
+            self.batches += 1
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                close_old_connections()
+                self.write_batch(batch)
+            except Exception:
+                logger.exception("Writing %d audit records failed", len(batch))
+                with self._lock:
+                    self.errors += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_audit_writer = None
+_audit_configured = False
+_audit_lock = threading.Lock()
+
+
+def get_audit_writer():
+    """The process's ``AuditWriter``, or ``None`` unless ``AUDIT_LOG`` is enabled."""
+    global _audit_writer, _audit_configured
+    if not _audit_configured:
+        # Concurrent first requests must not each start a writer thread.
+        with _audit_lock:
+            if not _audit_configured:
+                if getattr(settings, "AUDIT_LOG", False):
+                    _audit_writer = AuditWriter(
+                        batch_size=getattr(settings, "AUDIT_BATCH_SIZE", 500),
+                        flush_interval=getattr(settings, "AUDIT_FLUSH_INTERVAL", 1.0),
+                        maxsize=getattr(settings, "AUDIT_QUEUE_SIZE", 10_000),
+                    )
+                _audit_configured = True
+    return _audit_writer
+
+
+def query_audits(status=None, rule_id=None, since=None, until=None):
+    """Audited evaluations, newest first, filtered on indexed columns."""
+    audits = EvaluationAudit.objects.all()
+    if status:
+        audits = audits.filter(overall_status=status)
+    if rule_id:
+        audits = audits.filter(outcomes__rule_id=rule_id).distinct()
+    if since:
+        audits = audits.filter(created_at__gte=since)
+    if until:
+        audits = audits.filter(created_at__lt=until)
+    return audits.prefetch_related("outcomes")
@@ -0,0 +1,130 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from src.instrumentation import STAGE_METRICS, current_timer, start_timer, stop_timer
+
+
+class StageTimingMiddleware:
+    """Times each request stage and reports it in a ``Server-Timing`` header.
+
+    Stages recorded with ``src.instrumentation.stage`` while the request is handled
+    are listed in order, then ``render`` and the ``total`` time spent under this
+    middleware; all of them are added to ``STAGE_METRICS``. Work done after the
+    response is returned, such as producing a streamed body, is not included.
+
+    Enabled by the ``STAGE_TIMING`` setting. When it is off Django drops the
+    middleware and ``stage`` finds no active timer.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "STAGE_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self._acall(request)
+        timer, token = start_timer()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_timer(token)
+        return self._finish(timer, started, response)
+
+    async def _acall(self, request):
+        timer, token = start_timer()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_timer(token)
+        return self._finish(timer, started, response)
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns, inside get_response.
+        timer = current_timer()
+        if timer is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                timer.record("render", time.perf_counter() - started)
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def _finish(self, timer, started, response):
+        timer.record("total", time.perf_counter() - started)
+        response["Server-Timing"] = timer.server_timing()
+        STAGE_METRICS.observe(timer)
+        return response
+
+
+class TrafficCaptureMiddleware:
+    """Captures the bodies of evaluation requests and responses to JSONL files.
+
+    Only requests routed to a view named in ``CAPTURE_VIEWS`` with a non-streaming
+    response are recorded. The request thread just appends the raw bodies to the
+    ``TrafficCapture`` ring buffer; decoding, redaction and file I/O happen on its
+    flusher thread.
+
+    Enabled by the ``CAPTURE_DIR`` setting; the other ``CAPTURE_*`` settings
+    configure sampling, redaction, buffering and rotation.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        directory = getattr(settings, "CAPTURE_DIR", None)
+        if not directory:
+            raise MiddlewareNotUsed
+        from src.capture import TrafficCapture
+
+        self.get_response = get_response
+        self.views = frozenset(getattr(settings, "CAPTURE_VIEWS", ()))
+        self.capture = TrafficCapture(
+            directory,
+            sample_rate=getattr(settings, "CAPTURE_SAMPLE_RATE", 1.0),
+            redact_fields=getattr(settings, "CAPTURE_REDACT_FIELDS", ("name",)),
+            capacity=getattr(settings, "CAPTURE_BUFFER_SIZE", 10_000),
+            flush_interval=getattr(settings, "CAPTURE_FLUSH_INTERVAL", 1.0),
+            max_bytes=getattr(settings, "CAPTURE_MAX_BYTES", 64 * 2**20),
+            max_age=getattr(settings, "CAPTURE_MAX_AGE", 3600.0),
+            compress=getattr(settings, "CAPTURE_COMPRESS", False),
+        )
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self._acall(request)
+        response = self.get_response(request)
+        self._record(request, response)
+        return response
+
+    async def _acall(self, request):
+        response = await self.get_response(request)
+        self._record(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.resolver_match.url_name in self.views:
+            # Reading ``body`` here keeps it available after the parser consumes the stream.
+            request._captured_body = request.body
+
+    def _record(self, request, response):
+        body = getattr(request, "_captured_body", None)
+        if body is None or response.streaming:
+            return
+        self.capture.record(request.path, response.status_code, body, response.content)
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvaluationAudit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('input_hash', models.CharField(db_index=True, max_length=64)),
+                ('rule_set_version', models.CharField(max_length=64, null=True)),
+                ('overall_status', models.CharField(max_length=64)),
+                ('acquisition_mode', models.CharField(max_length=64)),
+                ('confidence', models.CharField(max_length=16)),
+                ('court_viability', models.CharField(max_length=16)),
+                ('needs_lawyer', models.BooleanField()),
+                ('evaluation_ms', models.FloatField()),
+                ('stage_ms', models.JSONField(default=dict)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['overall_status', 'created_at'], name='eligibility_overall_1d78d8_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EvaluationAuditOutcome',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule_id', models.CharField(max_length=128)),
+                ('status', models.CharField(max_length=64)),
+                ('audit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outcomes', to='eligibility.evaluationaudit')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['rule_id', 'audit'], name='eligibility_rule_id_5936f8_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import models
+
+
+class EvaluationAudit(models.Model):
+    """One served evaluation: a hash of its inputs, the rule set and what it concluded.
+
+    Written in batches by ``audit.AuditWriter`` when ``AUDIT_LOG`` is enabled.
+    """
+
+    created_at = models.DateTimeField(db_index=True)
+    input_hash = models.CharField(max_length=64, db_index=True)
+    rule_set_version = models.CharField(max_length=64, null=True)
+    overall_status = models.CharField(max_length=64)
+    acquisition_mode = models.CharField(max_length=64)
+    confidence = models.CharField(max_length=16)
+    court_viability = models.CharField(max_length=16)
+    needs_lawyer = models.BooleanField()
+    evaluation_ms = models.FloatField()
+    # Request stage durations in milliseconds, when stage timing is enabled. They are
+    # taken when the result is served, so ``render`` and ``total`` are never included,
+    # and they are left empty for batch and family-tree requests.
+    stage_ms = models.JSONField(default=dict)
+
+    class Meta:
+        indexes = [models.Index(fields=["overall_status", "created_at"])]
+        ordering = ["-created_at"]
+
+    def to_payload(self):
+        return {
+            "id": self.pk,
+            "created_at": self.created_at.isoformat(),
+            "input_hash": self.input_hash,
+            "rule_set_version": self.rule_set_version,
+            "overall_status": self.overall_status,
+            "acquisition_mode": self.acquisition_mode,
+            "confidence": self.confidence,
+            "court_viability": self.court_viability,
+            "needs_lawyer": self.needs_lawyer,
+            "rule_ids": [outcome.rule_id for outcome in self.outcomes.all()],
+            "evaluation_ms": self.evaluation_ms,
+            "stage_ms": self.stage_ms,
+        }
+
+
+class EvaluationAuditOutcome(models.Model):
+    """A rule that fired in an audited evaluation, kept in a table to index by rule id."""
+
+    audit = models.ForeignKey(EvaluationAudit, on_delete=models.CASCADE, related_name="outcomes")
+    rule_id = models.CharField(max_length=128)
+    status = models.CharField(max_length=64)
+
+    class Meta:
+        indexes = [models.Index(fields=["rule_id", "audit"])]
+        ordering = ["id"]
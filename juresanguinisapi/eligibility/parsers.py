@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """Parses newline-delimited JSON into a lazy iterator of decoded records.
+
+    Lines are read from the request stream only as the iterator is consumed, so a
+    streaming response can start before the whole body has arrived. A line that is
+    not valid JSON, or not valid in the request encoding, is yielded as a
+    ``ParseError`` instance rather than aborting the remaining records.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        return self._iter_records(stream, encoding)
+
+    @staticmethod
+    def _iter_records(stream, encoding):
+        if stream is None:
+            return
+        for raw_line in stream:
+            # UnicodeDecodeError is a ValueError, so undecodable lines become errors too.
+            try:
+                line = raw_line.decode(encoding).strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+            except ValueError as exc:
+                yield ParseError(f"JSON parse error - {exc}")
+                continue
+            yield record
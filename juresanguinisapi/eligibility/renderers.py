@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from rest_framework.renderers import JSONRenderer
+
+from src.encoding import encode_result
+from src.models import EvaluationResult
+
+
+class EvaluationResultRenderer(JSONRenderer):
+    """``JSONRenderer`` that writes an ``EvaluationResult`` straight to bytes.
+
+    Views can hand the result itself to ``Response`` when this renderer was
+    negotiated (see ``result_response``); the bytes equal ``JSONRenderer`` output
+    for ``result.to_payload()``. Other data, and requests asking for indented or
+    ASCII-only JSON, go through the standard renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, EvaluationResult):
+            return super().render(data, accepted_media_type, renderer_context)
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data.to_payload(), accepted_media_type, renderer_context)
+        return encode_result(data)
@@ -1,7 +1,34 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
+from benchmarks.importtime import LEAN_SETTINGS, ROOT, measure_imports
+from benchmarks.synthetic import generate_corpus
+from src.decoder import DecodeError, decode_request
+from src.encoding import encode_result
+from src.evaluator import evaluate_lineage, load_rule_engine
+from src.instrumentation import STAGE_METRICS
+from src.models import Confidence, RuleOutcome, TransmissionStatus
+from src.result_cache import RESULT_CACHE
+
+from . import audit, views
+from .audit import AuditWriter, query_audits
+from .renderers import EvaluationResultRenderer
+from .serializers import EvaluationRequestSerializer
+from .views import EvaluateLineageView
+
 
 class EvaluateLineageAPITests(TestCase):
     def setUp(self):
@@ -55,3 +82,634 @@ class EvaluateLineageAPITests(TestCase):
 
         self.assertEqual(response.status_code, 400)
         self.assertIn("Unknown parent_id", str(response.data))
+
+
+class EvaluateLineageBatchAPITests(TestCase):
+    valid_payload = {
+        "applicant": {"id": "app", "name": "Applicant", "birth_country": "USA"},
+        "ancestors": [{"id": "a1", "name": "Giorgio", "birth_country": "Italy"}],
+        "lineage_links": [{"parent_id": "a1", "child_id": "app", "relationship": "father"}],
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _lines(self, response):
+        body = b"".join(response.streaming_content).decode("utf-8")
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_streams_results_for_json_array(self):
+        invalid = {"applicant": {"id": "app"}, "ancestors": [], "lineage_links": []}
+        response = self.client.post(
+            reverse("evaluate-lineage-batch"),
+            [self.valid_payload, invalid, self.valid_payload],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = self._lines(response)
+        self.assertEqual([line["index"] for line in lines], [0, 1, 2])
+        self.assertEqual(lines[0]["result"]["overall_status"], "CLEAR_ADMIN_ELIGIBLE")
+        self.assertIn("name", lines[1]["errors"]["applicant"])
+        self.assertEqual(lines[2]["result"], lines[0]["result"])
+
+    def test_accepts_ndjson_stream(self):
+        unknown_parent = dict(
+            self.valid_payload,
+            lineage_links=[{"parent_id": "missing", "child_id": "app", "relationship": "father"}],
+        )
+        body = "\n".join(
+            [json.dumps(self.valid_payload), "{not json", json.dumps(unknown_parent)]
+        )
+        response = self.client.post(
+            reverse("evaluate-lineage-batch"), body, content_type="application/x-ndjson"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        lines = self._lines(response)
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0]["result"]["acquisition_mode"], "AUTOMATIC_BY_BLOOD")
+        self.assertIn("JSON parse error", lines[1]["errors"]["detail"])
+        self.assertIn("Unknown parent_id", lines[2]["errors"][0])
+
+    def test_undecodable_ndjson_line_is_an_item_error(self):
+        valid = json.dumps(self.valid_payload).encode("utf-8")
+        response = self.client.post(
+            reverse("evaluate-lineage-batch"),
+            b"\n".join([valid, b'{"applicant": "\xff"}', valid]),
+            content_type="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        lines = self._lines(response)
+        self.assertEqual([line["index"] for line in lines], [0, 1, 2])
+        self.assertIn("JSON parse error", lines[1]["errors"]["detail"])
+        self.assertEqual(lines[2]["result"], lines[0]["result"])
+
+    def test_rejects_single_object(self):
+        response = self.client.post(
+            reverse("evaluate-lineage-batch"), self.valid_payload, format="json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+def _serializer_decode(payload):
+    """Reference decoding through the DRF serializers."""
+    serializer = EvaluationRequestSerializer(data=payload)
+    if not serializer.is_valid():
+        return "errors", json.loads(json.dumps(serializer.errors))
+    try:
+        people = EvaluationRequestSerializer.build_person_index(serializer.validated_data)
+        links = EvaluationRequestSerializer.build_lineage_links(serializer.validated_data, people)
+    except serializers.ValidationError as exc:
+        return "errors", json.loads(json.dumps(exc.detail))
+    return "ok", links, EvaluationRequestSerializer.normalize_context(serializer.validated_data)
+
+
+def _fast_decode(payload):
+    try:
+        links, context = decode_request(payload)
+    except DecodeError as exc:
+        return "errors", json.loads(json.dumps(exc.detail))
+    return "ok", links, context
+
+
+class RequestDecoderEquivalenceTests(SimpleTestCase):
+    person = {
+        "id": "a1",
+        "name": " Giorgio ",
+        "birth_date": "1890-5-1",
+        "birth_country": "Italy",
+        "other_citizenships_at_birth": ["USA", 7],
+        "events": [
+            {
+                "kind": "naturalization_foreign",
+                "date": "1910-01-01",
+                "country": "",
+                "metadata": {"co_resident_child": True},
+            }
+        ],
+        "notes": {"tajani_exemption": False},
+    }
+    applicant = {"id": "app", "name": "Applicant", "birth_date": None, "birth_country": None}
+    link = {"parent_id": "a1", "child_id": "app", "relationship": "father"}
+
+    def payloads(self):
+        valid = {"applicant": self.applicant, "ancestors": [self.person], "lineage_links": [self.link]}
+        yield valid
+        yield dict(valid, context={"process_type": "COURT", "appointment_filed_date": "2024-03-01"})
+        yield dict(valid, context={"process_type": None, "country_of_filing": ""})
+        yield None
+        yield []
+        yield "not an object"
+        yield {}
+        yield dict(valid, context=None)
+        yield dict(valid, context={"process_type": "LAWSUIT", "appointment_filed_date": "03/01/2024"})
+        yield dict(valid, applicant={"id": "", "name": None, "birth_date": "1990-13-01"})
+        yield dict(valid, applicant=["app"])
+        yield dict(valid, applicant=None)
+        yield dict(valid, ancestors="a1")
+        yield dict(valid, ancestors=[self.person, None, {"id": True, "name": "x\x00"}])
+        yield dict(valid, ancestors=[dict(self.person, other_citizenships_at_birth="USA")])
+        yield dict(valid, ancestors=[dict(self.person, other_citizenships_at_birth=["", None])])
+        yield dict(valid, ancestors=[dict(self.person, events={"kind": "x"}, notes=[])])
+        yield dict(valid, ancestors=[dict(self.person, events=[{"date": 1910}, "birth"])])
+        yield dict(valid, ancestors=[dict(self.person, id="app")])
+        yield dict(valid, lineage_links=[{"parent_id": "a1"}, dict(self.link, notes=None)])
+        yield dict(valid, lineage_links=[dict(self.link, parent_id="missing")])
+        yield dict(valid, lineage_links=[dict(self.link, child_id="missing")])
+
+    def test_decoder_matches_serializers(self):
+        for payload in self.payloads():
+            with self.subTest(payload=payload):
+                expected = _serializer_decode(payload)
+                actual = _fast_decode(payload)
+                self.assertEqual(actual[0], expected[0])
+                if expected[0] == "errors":
+                    self.assertEqual(actual[1], expected[1])
+                else:
+                    self.assertEqual(actual[1], expected[1])
+                    self.assertEqual(actual[2], expected[2])
+
+
+class AsyncEvaluateLineageAPITests(SimpleTestCase):
+    payload = EvaluateLineageBatchAPITests.valid_payload
+
+    async def test_async_view_matches_sync_view(self):
+        sync_response = APIClient().post(reverse("evaluate-lineage"), self.payload, format="json")
+        response = await self.async_client.post(
+            reverse("evaluate-lineage-async"), self.payload, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, sync_response.content)
+
+    async def test_async_view_reports_validation_errors(self):
+        payload = dict(
+            self.payload,
+            lineage_links=[{"parent_id": "missing", "child_id": "app", "relationship": "father"}],
+        )
+        response = await self.async_client.post(
+            reverse("evaluate-lineage-async"), payload, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), ["Unknown parent_id 'missing' in lineage"])
+
+    async def test_async_batch_streams_in_order(self):
+        items = [self.payload, {"applicant": None}] * 5
+        response = await self.async_client.post(
+            reverse("evaluate-lineage-batch-async"), items, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        lines = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+        self.assertEqual([line["index"] for line in lines], list(range(10)))
+        self.assertIn("result", lines[0])
+        self.assertEqual(lines[1]["errors"]["applicant"], ["This field may not be null."])
+
+
+def server_timing(response):
+    return dict(
+        (entry.split(";dur=")[0], float(entry.split(";dur=")[1]))
+        for entry in response["Server-Timing"].split(", ")
+    )
+
+
+@override_settings(STAGE_TIMING=True)
+class StageTimingTests(SimpleTestCase):
+    payload = EvaluateLineageBatchAPITests.valid_payload
+
+    def setUp(self):
+        STAGE_METRICS.clear()
+
+    def test_reports_stages_in_server_timing_header(self):
+        response = APIClient().post(reverse("evaluate-lineage"), self.payload, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        timings = server_timing(response)
+        self.assertEqual(list(timings)[:2], ["parse", "decode"])
+        self.assertIn("render", timings)
+        self.assertEqual(list(timings)[-1], "total")
+        self.assertLessEqual(sum(timings.values()) - timings["total"], timings["total"] + 0.01)
+
+    async def test_async_view_records_stages_run_on_the_executor(self):
+        response = await self.async_client.post(
+            reverse("evaluate-lineage-async"), self.payload, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("decode", server_timing(response))
+        self.assertIn("total", server_timing(response))
+
+    def test_metrics_endpoint_serves_histograms(self):
+        APIClient().post(reverse("evaluate-lineage"), self.payload, format="json")
+        APIClient().post(reverse("evaluate-lineage"), {"applicant": None}, format="json")
+
+        response = self.client.get(reverse("stage-metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode("utf-8")
+        self.assertIn(
+            'evaluation_stage_duration_seconds_count{stage="decode"} 2', body
+        )
+        self.assertIn(
+            'evaluation_stage_duration_seconds_bucket{stage="total",le="+Inf"} 2', body
+        )
+
+    @override_settings(STAGE_TIMING=False)
+    def test_disabled_by_default(self):
+        response = APIClient().post(reverse("evaluate-lineage"), self.payload, format="json")
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertNotIn('stage="total"', STAGE_METRICS.render())
+
+
+class RuleStatsAPITests(TestCase):
+    payload = EvaluateLineageBatchAPITests.valid_payload
+
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = get_user_model().objects.create_user("staff", password="x", is_staff=True)
+
+    def enable_stats(self):
+        engine = load_rule_engine()
+        engine.enable_stats()
+        self.addCleanup(setattr, engine, "stats", None)
+
+    def test_requires_staff_user(self):
+        response = self.client.get(reverse("rule-stats"))
+        self.assertIn(response.status_code, (401, 403))
+
+        self.client.force_authenticate(get_user_model().objects.create_user("user", password="x"))
+        self.assertEqual(self.client.get(reverse("rule-stats")).status_code, 403)
+
+    def test_reports_disabled_stats(self):
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(reverse("rule-stats"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"enabled": False})
+
+    def test_reports_and_resets_rule_counters(self):
+        self.enable_stats()
+        # Cached results skip the engine, so only a fresh evaluation is counted.
+        RESULT_CACHE.clear()
+        self.client.post(reverse("evaluate-lineage"), self.payload, format="json")
+        self.client.force_authenticate(self.staff)
+
+        response = self.client.get(reverse("rule-stats"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["enabled"])
+        self.assertEqual(response.data["passes"], 1)
+        self.assertEqual(
+            [entry["rule_id"] for entry in response.data["rules"]],
+            [rule.id for rule in load_rule_engine().rules],
+        )
+
+        self.assertEqual(self.client.delete(reverse("rule-stats")).status_code, 204)
+        self.assertEqual(self.client.get(reverse("rule-stats")).data["passes"], 0)
+
+
+class ResultEncodingTests(SimpleTestCase):
+    payload = EvaluateLineageBatchAPITests.valid_payload
+
+    def test_matches_json_renderer_over_synthetic_corpus(self):
+        renderer = JSONRenderer()
+        for payload in generate_corpus(seed=7, count=200, min_depth=2, max_depth=30):
+            result = evaluate_lineage(*decode_request(payload), cache=None)
+            self.assertEqual(encode_result(result), renderer.render(result.to_payload()))
+
+    def test_escapes_strings_like_json_renderer(self):
+        result = evaluate_lineage(*decode_request(self.payload), cache=None)
+        notes = 'Quote " backslash \\ tab \t line\u2028sep\u2029 accents àè \U0001f1ee\U0001f1f9 \x00'
+        outcome = RuleOutcome("odd", TransmissionStatus.CONTESTED_EDGE_CASE, notes, Confidence.LOW, True)
+        result.rule_outcomes = [outcome, outcome]
+        result.explanations = [f"odd: {notes}", ""]
+        for version in (None, "v\u2028"):
+            result.rule_set_version = version
+            self.assertEqual(encode_result(result), JSONRenderer().render(result.to_payload()))
+
+    def test_renderer_is_opt_in_and_matches_default_output(self):
+        url = reverse("evaluate-lineage")
+        default = APIClient().post(url, self.payload, format="json")
+        # Views read DEFAULT_RENDERER_CLASSES when defined, so patch the view directly.
+        with mock.patch.object(
+            EvaluateLineageView, "renderer_classes", [EvaluationResultRenderer]
+        ):
+            fast = APIClient().post(url, self.payload, format="json")
+            indented = APIClient().post(
+                url, self.payload, format="json", HTTP_ACCEPT="application/json; indent=2"
+            )
+            invalid = APIClient().post(url, {"applicant": None}, format="json")
+
+        self.assertIsInstance(default.data, dict)
+        self.assertNotIsInstance(fast.data, dict)
+        self.assertEqual(fast["Content-Type"], "application/json")
+        self.assertEqual(fast.content, default.content)
+        self.assertEqual(json.loads(indented.content), default.json())
+        self.assertIn(b'\n  "overall_status"', indented.content)
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(invalid.json()["applicant"], ["This field may not be null."])
+
+
+class EvaluateFamilyTreeAPITests(SimpleTestCase):
+    def test_evaluates_every_descendant(self):
+        payload = {
+            "persons": [
+                {"id": "a1", "name": "Giorgio", "birth_date": "1890-05-01", "birth_country": "Italy"},
+                {"id": "c1", "name": "Maria", "birth_date": "1920-06-01", "birth_country": "USA"},
+                {"id": "c2", "name": "Luca", "birth_date": "1925-06-01", "birth_country": "USA"},
+                {"id": "g1", "name": "Anna", "birth_date": "1945-06-01", "birth_country": "USA"},
+            ],
+            "lineage_links": [
+                {"parent_id": "a1", "child_id": "c1", "relationship": "father"},
+                {"parent_id": "a1", "child_id": "c2", "relationship": "father"},
+                {"parent_id": "c1", "child_id": "g1", "relationship": "mother"},
+            ],
+        }
+
+        response = APIClient().post(reverse("evaluate-family-tree"), payload, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        results = {item["person_id"]: item for item in response.data["results"]}
+        self.assertEqual(set(results), {"c1", "c2", "g1"})
+        self.assertEqual(results["g1"]["path"], ["a1", "c1", "g1"])
+        self.assertEqual(results["g1"]["result"]["overall_status"], "COURT_ONLY_1948")
+        self.assertEqual(results["c2"]["result"]["overall_status"], "CLEAR_ADMIN_ELIGIBLE")
+
+    def test_rejects_unknown_target(self):
+        payload = {"persons": [{"id": "a1", "name": "Giorgio"}], "lineage_links": [], "targets": ["x"]}
+
+        response = APIClient().post(reverse("evaluate-family-tree"), payload, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["targets"], ["Unknown person id 'x' in targets"])
+
+
+class WhatIfAPITests(SimpleTestCase):
+    payload = {
+        "applicant": {"id": "app", "name": "Applicant", "birth_date": "1990-07-01", "birth_country": "USA"},
+        "ancestors": [
+            {"id": "a1", "name": "Giorgio", "birth_date": "1890-05-01", "birth_country": "Italy"},
+            {"id": "a2", "name": "Maria", "birth_date": "1920-06-01", "birth_country": "Argentina"},
+        ],
+        "lineage_links": [
+            {"parent_id": "a1", "child_id": "a2", "relationship": "father"},
+            {"parent_id": "a2", "child_id": "app", "relationship": "mother"},
+        ],
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_patches_reevaluate_session(self):
+        created = self.client.post(reverse("evaluate-whatif"), self.payload, format="json")
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(created.data["result"]["overall_status"], "CLEAR_ADMIN_ELIGIBLE")
+        url = reverse("evaluate-whatif-patch", args=[created.data["session_id"]])
+
+        patched = self.client.post(
+            url,
+            {"patches": [{"op": "set_birth_date", "person_id": "app", "birth_date": "1940-01-01"}]},
+            format="json",
+        )
+        self.assertEqual(patched.status_code, 200)
+        self.assertEqual(patched.data["result"]["overall_status"], "COURT_ONLY_1948")
+
+        invalid = self.client.post(url, {"patches": [{"op": "set_note"}]}, format="json")
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(invalid.json()["patches"]["0"]["person_id"], ["This field is required."])
+
+    def test_unknown_session_returns_404(self):
+        response = self.client.post(
+            reverse("evaluate-whatif-patch", args=["missing"]), {"patches": []}, format="json"
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+LEAN_REQUEST_SCRIPT = """
+import io, json, sys
+from wsgiref.util import setup_testing_defaults
+import api.index
+
+body = json.dumps({
+    "applicant": {"id": "app", "name": "Applicant", "birth_date": "1990-07-01", "birth_country": "USA"},
+    "ancestors": [{"id": "a1", "name": "Giorgio", "birth_date": "1890-05-01", "birth_country": "Italy"}],
+    "lineage_links": [{"parent_id": "a1", "child_id": "app", "relationship": "father"}],
+}).encode()
+environ = {"REQUEST_METHOD": "POST", "PATH_INFO": "/api/evaluate/", "CONTENT_TYPE": "application/json",
+           "CONTENT_LENGTH": str(len(body)), "wsgi.input": io.BytesIO(body)}
+setup_testing_defaults(environ)
+statuses = []
+chunks = api.index.application(environ, lambda status, headers: statuses.append(status))
+body = json.loads(b"".join(chunks))
+deferred = ["src.shadow", "src.whatif", "src.family_tree", "juresanguinisapi.eligibility.audit"]
+loaded = [name for name in deferred if name in sys.modules]
+print(json.dumps({"status": statuses[0], "body": body, "loaded": loaded}))
+"""
+
+
+class LeanServerlessProfileTests(SimpleTestCase):
+    def test_entry_point_skips_unused_django_apps(self):
+        modules = {entry["module"] for entry in measure_imports("api.index", LEAN_SETTINGS)}
+
+        self.assertIn("api.index", modules)
+        # Rules are compiled while the entry point is imported.
+        self.assertIn("src.rule_engine.pipeline", modules)
+        for unused in (
+            "django.contrib.admin",
+            "django.contrib.auth",
+            "django.contrib.sessions",
+            "django.contrib.messages",
+            "django.contrib.staticfiles",
+            "django.db.backends.sqlite3",
+        ):
+            self.assertFalse(
+                any(module == unused or module.startswith(unused + ".") for module in modules),
+                f"{unused} imported by the lean entry point",
+            )
+
+    def test_entry_point_serves_evaluate(self):
+        completed = subprocess.run(
+            [sys.executable, "-c", LEAN_REQUEST_SCRIPT],
+            cwd=ROOT,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE=LEAN_SETTINGS),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        response = json.loads(completed.stdout)
+
+        self.assertEqual(response["status"], "200 OK")
+        self.assertEqual(response["body"]["overall_status"], "CLEAR_ADMIN_ELIGIBLE")
+        # Serving the request did not load what only the full project's views use.
+        self.assertEqual(response["loaded"], [])
+
+    def test_rejects_features_needing_the_full_project(self):
+        for name in ("AUDIT_LOG", "RULE_STATS"):
+            completed = subprocess.run(
+                [sys.executable, "-c", "import juresanguinisapi.settings_lean"],
+                cwd=ROOT,
+                env=dict(os.environ, **{name: "true"}),
+                capture_output=True,
+                text=True,
+            )
+
+            self.assertNotEqual(completed.returncode, 0)
+            self.assertIn(f"ImproperlyConfigured: {name} is not supported", completed.stderr)
+
+    @override_settings(ROOT_URLCONF="juresanguinisapi.urls_lean")
+    def test_lean_urls_serve_stage_metrics(self):
+        self.assertEqual(reverse("stage-metrics"), "/api/metrics/")
+        response = self.client.get("/api/metrics/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+
+
+class ShadowEvaluationTests(SimpleTestCase):
+    payload = EvaluateLineageBatchAPITests.valid_payload
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_submits_served_result_to_shadow_evaluator(self):
+        shadow = mock.Mock()
+        with mock.patch.multiple(views, _shadow_evaluator=shadow, _shadow_configured=True):
+            response = self.client.post(reverse("evaluate-lineage"), self.payload, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        lineage_links, process_context, result = shadow.submit.call_args.args
+        self.assertEqual([link.child.id for link in lineage_links], ["app"])
+        self.assertEqual(process_context, {})
+        self.assertEqual(result.to_payload()["overall_status"], response.data["overall_status"])
+
+    def test_disabled_without_candidate_rules(self):
+        with mock.patch.multiple(views, _shadow_evaluator=None, _shadow_configured=False):
+            self.assertIsNone(views.get_shadow_evaluator())
+
+
+class TrafficCaptureTests(SimpleTestCase):
+    payload = EvaluateLineageBatchAPITests.valid_payload
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def captured(self):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            for name in os.listdir(self.directory):
+                with open(os.path.join(self.directory, name), encoding="utf-8") as handle:
+                    lines = handle.read().splitlines()
+                if lines:
+                    return [json.loads(line) for line in lines]
+            time.sleep(0.01)
+        self.fail("Nothing was captured")
+
+    def test_captures_evaluate_requests_only(self):
+        with override_settings(CAPTURE_DIR=self.directory, CAPTURE_FLUSH_INTERVAL=0.01):
+            client = APIClient()
+            client.post(reverse("evaluate-lineage-batch"), [self.payload], format="json")
+            response = client.post(reverse("evaluate-lineage"), self.payload, format="json")
+
+        (line,) = self.captured()
+        self.assertEqual(line["path"], reverse("evaluate-lineage"))
+        self.assertEqual(line["status"], 200)
+        self.assertEqual(line["request"]["applicant"]["name"], "[REDACTED]")
+        self.assertEqual(line["request"]["lineage_links"], self.payload["lineage_links"])
+        self.assertEqual(line["response"], response.json())
+
+
+@override_settings(AUDIT_LOG=True)
+class AuditLogTests(TransactionTestCase):
+    payload = EvaluateLineageBatchAPITests.valid_payload
+
+    def setUp(self):
+        self.client = APIClient()
+        self.writer = AuditWriter(batch_size=10, flush_interval=0.01)
+        patcher = mock.patch.multiple(audit, _audit_writer=self.writer, _audit_configured=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_records_evaluations_in_batches(self):
+        maternal = json.loads(json.dumps(self.payload))
+        maternal["applicant"]["birth_date"] = "1930-01-01"
+        maternal["lineage_links"][0]["relationship"] = "mother"
+        RESULT_CACHE.clear()
+        for body in (self.payload, maternal, self.payload):
+            self.client.post(reverse("evaluate-lineage"), body, format="json")
+        self.writer.join()
+
+        self.assertEqual(self.writer.stats()["written"], 3)
+        self.assertLess(self.writer.stats()["batches"], 3)
+        records = list(query_audits())
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0].input_hash, records[2].input_hash)
+        self.assertEqual(records[0].rule_set_version, load_rule_engine().version)
+
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("staff", password="x", is_staff=True)
+        )
+        response = self.client.get(reverse("audit-log"), {"rule_id": "maternal_1948_court_only"})
+        self.assertEqual(response.status_code, 200)
+        (result,) = response.data["results"]
+        self.assertEqual(result["overall_status"], "COURT_ONLY_1948")
+        self.assertEqual(result["rule_ids"], ["maternal_1948_court_only"])
+
+        response = self.client.get(reverse("audit-log"), {"status": "CLEAR_ADMIN_ELIGIBLE"})
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(reverse("audit-log"), {"since": "2999-01-01T00:00:00"})
+        self.assertEqual(response.data["results"], [])
+        response = self.client.get(reverse("audit-log"), {"until": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+        for limit in ("-5", "0", "1001", "ten"):
+            response = self.client.get(reverse("audit-log"), {"limit": limit})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("limit", response.data)
+        response = self.client.get(reverse("audit-log"), {"limit": "1"})
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_requires_staff_user(self):
+        self.client.force_authenticate(get_user_model().objects.create_user("user", password="x"))
+        self.assertEqual(self.client.get(reverse("audit-log")).status_code, 403)
+
+    def test_records_every_evaluation_route(self):
+        tree = {
+            "persons": [
+                {"id": "a1", "name": "Giorgio", "birth_date": "1890-05-01", "birth_country": "Italy"},
+                {"id": "c1", "name": "Maria", "birth_date": "1920-06-01", "birth_country": "USA"},
+                {"id": "c2", "name": "Luca", "birth_date": "1925-06-01", "birth_country": "USA"},
+            ],
+            "lineage_links": [
+                {"parent_id": "a1", "child_id": "c1", "relationship": "father"},
+                {"parent_id": "a1", "child_id": "c2", "relationship": "father"},
+            ],
+        }
+        self.client.post(reverse("evaluate-lineage-async"), self.payload, format="json")
+        self.client.post(
+            reverse("evaluate-lineage-batch"), [self.payload, {"applicant": None}], format="json"
+        ).getvalue()
+        self.client.post(reverse("evaluate-family-tree"), tree, format="json")
+        created = self.client.post(reverse("evaluate-whatif"), self.payload, format="json")
+        self.client.post(
+            reverse("evaluate-whatif-patch", args=[created.data["session_id"]]),
+            {"patches": [{"op": "set_birth_date", "person_id": "app", "birth_date": "1940-01-01"}]},
+            format="json",
+        )
+        self.writer.join()
+
+        # One async, one valid batch item, two tree lineages and two what-if results.
+        records = list(query_audits())
+        self.assertEqual(len(records), 6)
+        # The session's lineage was copied before it was patched.
+        self.assertNotEqual(records[0].input_hash, records[1].input_hash)
+        # The async view and the batch item evaluated the same payload.
+        self.assertEqual(records[-1].input_hash, records[-2].input_hash)
+        self.assertEqual(records[1].input_hash, records[-1].input_hash)
@@ -1,7 +1,34 @@
 from django.urls import path
 
-from .views import EvaluateLineageView
+from .async_views import AsyncEvaluateLineageBatchView, AsyncEvaluateLineageView
+from .views import (
+    AuditLogView,
+    EvaluateFamilyTreeView,
+    EvaluateLineageBatchView,
+    EvaluateLineageView,
+    RuleStatsView,
+    StageMetricsView,
+    WhatIfPatchView,
+    WhatIfSessionView,
+)
 
 urlpatterns = [
     path("evaluate/", EvaluateLineageView.as_view(), name="evaluate-lineage"),
+    path("evaluate/batch/", EvaluateLineageBatchView.as_view(), name="evaluate-lineage-batch"),
+    path("evaluate/async/", AsyncEvaluateLineageView.as_view(), name="evaluate-lineage-async"),
+    path(
+        "evaluate/batch/async/",
+        AsyncEvaluateLineageBatchView.as_view(),
+        name="evaluate-lineage-batch-async",
+    ),
+    path("evaluate/tree/", EvaluateFamilyTreeView.as_view(), name="evaluate-family-tree"),
+    path("evaluate/whatif/", WhatIfSessionView.as_view(), name="evaluate-whatif"),
+    path(
+        "evaluate/whatif/<str:session_id>/",
+        WhatIfPatchView.as_view(),
+        name="evaluate-whatif-patch",
+    ),
+    path("metrics/", StageMetricsView.as_view(), name="stage-metrics"),
+    path("rules/stats/", RuleStatsView.as_view(), name="rule-stats"),
+    path("audit/", AuditLogView.as_view(), name="audit-log"),
 ]
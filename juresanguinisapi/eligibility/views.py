@@ -1,46 +1,324 @@
-from rest_framework import status
+import copy
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterator
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views import View
+from rest_framework import serializers, status
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from src.evaluator import evaluate_lineage
+from src.decoder import DecodeError, decode_family_tree_request, decode_request
+from src.encoding import encode_result
+from src.evaluator import evaluate_lineage, load_rule_engine
+from src.instrumentation import STAGE_METRICS, current_timer, stage
+
+from .parsers import NDJSONParser
+from .renderers import EvaluationResultRenderer
+
+# The evaluate, batch and metrics views are all the lean serverless profile serves.
+# Modules only the other views, shadow evaluation or the audit log need are
+# imported where they are used, so a cold start does not load them.
+
+logger = logging.getLogger(__name__)
+
+
+def decode_evaluation_request(data):
+    """Validates a request payload and returns its lineage chain and process context."""
+    try:
+        with stage("decode"):
+            return decode_request(data)
+    except DecodeError as exc:
+        raise serializers.ValidationError(exc.detail)
+
+
+def encode_json(data):
+    """Compact JSON matching the output of DRF's ``JSONRenderer``."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def result_response(request, result, status=status.HTTP_200_OK):
+    """A ``Response`` for ``result`` that skips the payload dict when it can.
+
+    With ``EvaluationResultRenderer`` negotiated the result is rendered straight to
+    bytes; otherwise the response carries ``result.to_payload()`` as usual.
+    """
+    if isinstance(getattr(request, "accepted_renderer", None), EvaluationResultRenderer):
+        return Response(result, status=status)
+    return Response(result.to_payload(), status=status)
+
+
+_shadow_evaluator = None
+_shadow_configured = False
+_shadow_lock = threading.Lock()
+
+
+def get_shadow_evaluator():
+    """The process's ``ShadowEvaluator``, or ``None`` unless ``SHADOW_RULES_DIR`` is set."""
+    global _shadow_evaluator, _shadow_configured
+    if not _shadow_configured:
+        # Concurrent first requests must not each start a worker on the same database.
+        with _shadow_lock:
+            if not _shadow_configured:
+                rules_dir = getattr(settings, "SHADOW_RULES_DIR", None)
+                if rules_dir:
+                    from src.shadow import ShadowEvaluator
+
+                    _shadow_evaluator = ShadowEvaluator(
+                        rules_dir,
+                        settings.SHADOW_DB_PATH,
+                        maxsize=getattr(settings, "SHADOW_QUEUE_SIZE", 1024),
+                    )
+                _shadow_configured = True
+    return _shadow_evaluator
+
 
-from .serializers import EvaluationRequestSerializer
+def audit_evaluation(lineage_chain, process_context, result, evaluation_seconds, stages=True):
+    """Queues a served evaluation for the audit log when ``AUDIT_LOG`` is enabled.
+
+    With ``stages`` the request's stage timings are stored too. They are taken when
+    the result is served, so they stop before ``render`` and ``total``; requests
+    serving several results pass ``False``.
+    """
+    if not getattr(settings, "AUDIT_LOG", False):
+        return
+    from .audit import get_audit_writer
+
+    audit = get_audit_writer()
+    if audit is None:
+        return
+    timer = current_timer() if stages else None
+    audit.submit(
+        lineage_chain,
+        process_context,
+        result,
+        evaluation_seconds,
+        timer.durations if timer is not None else None,
+    )
+
+
+def timed_evaluation(lineage_links, process_context, engine=None):
+    """``evaluate_lineage`` and the seconds it took."""
+    started = time.perf_counter()
+    result = evaluate_lineage(lineage_links, process_context=process_context, engine=engine)
+    return result, time.perf_counter() - started
+
+
+def batch_result_line(index, item, engine):
+    """Evaluates one batch item and returns its NDJSON line, errors included."""
+    line = {"index": index}
+    try:
+        if isinstance(item, ParseError):
+            raise item
+        lineage_links, process_context = decode_evaluation_request(item)
+        result, seconds = timed_evaluation(lineage_links, process_context, engine)
+        audit_evaluation(lineage_links, process_context, result, seconds, stages=False)
+        return b'{"index":%d,"result":%s}\n' % (index, encode_result(result))
+    except serializers.ValidationError as exc:
+        line["errors"] = exc.detail
+    except ParseError as exc:
+        line["errors"] = {"detail": exc.detail}
+    except Exception:
+        logger.exception("Batch evaluation failed for item %s", index)
+        line["errors"] = {"detail": "Evaluation failed."}
+    return (encode_json(line) + "\n").encode("utf-8")
 
 
 class EvaluateLineageView(APIView):
     """Accepts applicant lineage data and returns an eligibility evaluation."""
 
     def post(self, request):
-        serializer = EvaluationRequestSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        with stage("parse"):
+            data = request.data
+        lineage_links, process_context = decode_evaluation_request(data)
+        result, seconds = timed_evaluation(lineage_links, process_context)
+        shadow = get_shadow_evaluator()
+        if shadow is not None:
+            shadow.submit(lineage_links, process_context, result)
+        audit_evaluation(lineage_links, process_context, result, seconds)
+        return result_response(request, result)
+
+
+class EvaluateLineageBatchView(APIView):
+    """Evaluates many lineage payloads and streams one NDJSON result line per item.
+
+    The body is either a JSON array or an ``application/x-ndjson`` stream of
+    objects shaped like the single-evaluation payload. Items are answered in input
+    order; an invalid item produces an error line instead of failing the batch.
+    """
+
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def post(self, request):
+        items = request.data
+        if not isinstance(items, (list, Iterator)):
+            raise ParseError("Expected a JSON array or NDJSON stream of evaluation requests.")
 
-        people = EvaluationRequestSerializer.build_person_index(serializer.validated_data)
-        lineage_links = EvaluationRequestSerializer.build_lineage_links(
-            serializer.validated_data, people
+        return StreamingHttpResponse(
+            self._stream_results(items, load_rule_engine()),
+            content_type="application/x-ndjson",
         )
-        process_context = EvaluationRequestSerializer.normalize_context(
-            serializer.validated_data
+
+    def _stream_results(self, items, engine):
+        for index, item in enumerate(items):
+            yield batch_result_line(index, item, engine)
+
+
+class EvaluateFamilyTreeView(APIView):
+    """Evaluates every descendant in a family tree, or the selected ``targets``, at once."""
+
+    def post(self, request):
+        from src.family_tree import evaluate_family_tree
+
+        try:
+            people, links, targets, process_context = decode_family_tree_request(request.data)
+            started = time.perf_counter()
+            evaluations = evaluate_family_tree(people, links, targets, process_context)
+            elapsed = time.perf_counter() - started
+        except DecodeError as exc:
+            raise serializers.ValidationError(exc.detail)
+        # Lineages share the tree's feature pass, so each is charged an equal share.
+        for evaluation in evaluations:
+            audit_evaluation(
+                evaluation.result.lineage,
+                process_context,
+                evaluation.result,
+                elapsed / len(evaluations),
+                stages=False,
+            )
+        return Response({"results": [evaluation.to_payload() for evaluation in evaluations]})
+
+
+def audit_whatif(session, result, evaluation_seconds):
+    # Later patches edit the session's people in place, so the writer gets a copy.
+    if getattr(settings, "AUDIT_LOG", False):
+        audit_evaluation(
+            copy.deepcopy(session.lineage_chain),
+            session.process_context,
+            result,
+            evaluation_seconds,
+        )
+
+
+class WhatIfSessionView(APIView):
+    """Starts a what-if session from an evaluation payload.
+
+    The lineage is kept server-side so later edits can be sent as small patches
+    to ``WhatIfPatchView`` instead of re-submitting the whole tree.
+    """
+
+    def post(self, request):
+        from src.whatif import WHATIF_SESSIONS, WhatIfSession
+
+        lineage_links, process_context = decode_evaluation_request(request.data)
+        started = time.perf_counter()
+        session = WhatIfSession(lineage_links, process_context)
+        seconds = time.perf_counter() - started
+        audit_whatif(session, session.result, seconds)
+        session_id = WHATIF_SESSIONS.add(session)
+        return Response(
+            {"session_id": session_id, "result": session.result.to_payload()},
+            status=status.HTTP_201_CREATED,
         )
 
-        result = evaluate_lineage(lineage_links, process_context=process_context)
-
-        payload = {
-            "overall_status": result.overall_status.value,
-            "confidence": result.confidence.value,
-            "court_viability": result.court_viability.value,
-            "needs_lawyer": result.needs_lawyer,
-            "acquisition_mode": result.acquisition_mode.value,
-            "explanations": result.explanations,
-            "rule_outcomes": [
-                {
-                    "rule_id": outcome.rule_id,
-                    "status": outcome.status.value,
-                    "notes": outcome.notes,
-                    "confidence": outcome.confidence.value,
-                    "needs_lawyer": outcome.needs_lawyer,
-                }
-                for outcome in result.rule_outcomes
-            ],
-        }
-
-        return Response(payload, status=status.HTTP_200_OK)
+
+class WhatIfPatchView(APIView):
+    """Applies patches to a what-if session and returns the re-evaluated result."""
+
+    def post(self, request, session_id):
+        from src.whatif import WHATIF_SESSIONS
+
+        session = WHATIF_SESSIONS.get(session_id)
+        if session is None:
+            raise NotFound("Unknown or expired what-if session.")
+        if not isinstance(request.data, dict) or "patches" not in request.data:
+            raise serializers.ValidationError({"patches": ["This field is required."]})
+        try:
+            started = time.perf_counter()
+            result = session.apply(request.data["patches"])
+            seconds = time.perf_counter() - started
+        except DecodeError as exc:
+            raise serializers.ValidationError(exc.detail)
+        audit_whatif(session, result, seconds)
+        return Response({"session_id": session_id, "result": result.to_payload()})
+
+
+class RuleStatsView(APIView):
+    """Per-rule hit counts and condition timings of the default rule set, for staff users.
+
+    Counters are recorded while ``RULE_STATS`` is enabled and only cover requests that
+    missed the result cache. ``DELETE`` resets them.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        stats = load_rule_engine().stats
+        if stats is None:
+            return Response({"enabled": False})
+        return Response({"enabled": True, **stats.to_payload()})
+
+    def delete(self, request):
+        stats = load_rule_engine().stats
+        if stats is not None:
+            stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AuditLogView(APIView):
+    """Audited evaluations for staff users, newest first.
+
+    Filters: ``status`` (overall status), ``rule_id`` (a rule that fired), ``since``
+    and ``until`` (ISO 8601 datetimes, ``until`` exclusive) and ``limit`` (1 to
+    1000, default 100). Evaluations are recorded while ``AUDIT_LOG`` is enabled and
+    appear once the background writer has committed them.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        from .audit import query_audits
+
+        params = request.query_params
+        filters = {}
+        for name in ("since", "until"):
+            if params.get(name):
+                value = parse_datetime(params[name])
+                if value is None:
+                    raise serializers.ValidationError({name: ["Expected an ISO 8601 datetime."]})
+                if timezone.is_naive(value):
+                    value = timezone.make_aware(value)
+                filters[name] = value
+        try:
+            limit = int(params.get("limit", 100))
+        except ValueError:
+            raise serializers.ValidationError({"limit": ["Expected an integer."]})
+        if not 1 <= limit <= 1000:
+            raise serializers.ValidationError({"limit": ["Expected between 1 and 1000."]})
+        audits = query_audits(
+            status=params.get("status"), rule_id=params.get("rule_id"), **filters
+        )[:limit]
+        return Response({"results": [audit.to_payload() for audit in audits]})
+
+
+class StageMetricsView(View):
+    """Serves the per-stage latency histograms in the Prometheus text format.
+
+    Histograms are only filled while ``STAGE_TIMING`` is enabled.
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request):
+        return HttpResponse(
+            STAGE_METRICS.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
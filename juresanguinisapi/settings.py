@@ -19,6 +19,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "juresanguinisapi.eligibility.middleware.StageTimingMiddleware",
+    "juresanguinisapi.eligibility.middleware.TrafficCaptureMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -65,3 +67,51 @@ REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
     "DEFAULT_PARSER_CLASSES": ["rest_framework.parsers.JSONParser"],
 }
+
+# Thread pool used by the async evaluate views; defaults to min(4, CPU count) workers
+# with four queued evaluations per worker before callers wait on the event loop.
+EVALUATION_EXECUTOR_WORKERS = int(os.environ.get("EVALUATION_EXECUTOR_WORKERS", "0")) or None
+EVALUATION_EXECUTOR_MAX_PENDING = int(os.environ.get("EVALUATION_EXECUTOR_MAX_PENDING", "0")) or None
+
+# Per-stage request timing: a Server-Timing header on every response and the
+# histograms served at /api/metrics/. Off by default.
+STAGE_TIMING = os.environ.get("STAGE_TIMING", "false").lower() in {"1", "true", "yes"}
+
+# Per-rule hit counts and condition timings, served to staff users at /api/rules/stats/.
+RULE_STATS = os.environ.get("RULE_STATS", "false").lower() in {"1", "true", "yes"}
+
+# Evaluate through precomputed outcome tables over the feature-flag space
+# (src/rule_engine/truth_table.py). Off by default.
+RULE_TRUTH_TABLES = os.environ.get("RULE_TRUTH_TABLES", "false").lower() in {"1", "true", "yes"}
+
+# Shadow evaluation: /api/evaluate/ requests are re-evaluated in the background
+# against the rule files in SHADOW_RULES_DIR and differences are recorded in
+# SHADOW_DB_PATH. Requests are dropped, not delayed, once SHADOW_QUEUE_SIZE are queued.
+SHADOW_RULES_DIR = os.environ.get("SHADOW_RULES_DIR") or None
+SHADOW_DB_PATH = os.environ.get("SHADOW_DB_PATH", str(BASE_DIR / "shadow.sqlite3"))
+SHADOW_QUEUE_SIZE = int(os.environ.get("SHADOW_QUEUE_SIZE", "1024"))
+
+# Traffic capture: requests to the CAPTURE_VIEWS and their responses are buffered in
+# memory and written by a background thread to rotating JSONL files in CAPTURE_DIR,
+# with CAPTURE_REDACT_FIELDS masked in request bodies. Off unless CAPTURE_DIR is set.
+CAPTURE_DIR = os.environ.get("CAPTURE_DIR") or None
+CAPTURE_VIEWS = ("evaluate-lineage", "evaluate-lineage-async")
+CAPTURE_SAMPLE_RATE = float(os.environ.get("CAPTURE_SAMPLE_RATE", "1.0"))
+CAPTURE_REDACT_FIELDS = tuple(
+    field for field in os.environ.get("CAPTURE_REDACT_FIELDS", "name").split(",") if field
+)
+CAPTURE_BUFFER_SIZE = int(os.environ.get("CAPTURE_BUFFER_SIZE", "10000"))
+CAPTURE_FLUSH_INTERVAL = float(os.environ.get("CAPTURE_FLUSH_INTERVAL", "1.0"))
+CAPTURE_MAX_BYTES = int(os.environ.get("CAPTURE_MAX_BYTES", str(64 * 2**20)))
+CAPTURE_MAX_AGE = float(os.environ.get("CAPTURE_MAX_AGE", "3600"))
+CAPTURE_COMPRESS = os.environ.get("CAPTURE_COMPRESS", "false").lower() in {"1", "true", "yes"}
+
+# Audit log: every /api/evaluate/ result is stored in the default database by a
+# background writer, AUDIT_BATCH_SIZE rows per transaction at most AUDIT_FLUSH_INTERVAL
+# seconds apart, and served to staff users at /api/audit/. SQLite databases are
+# switched to WAL mode unless AUDIT_SQLITE_WAL is false. Off by default.
+AUDIT_LOG = os.environ.get("AUDIT_LOG", "false").lower() in {"1", "true", "yes"}
+AUDIT_BATCH_SIZE = int(os.environ.get("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.environ.get("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_QUEUE_SIZE = int(os.environ.get("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_SQLITE_WAL = os.environ.get("AUDIT_SQLITE_WAL", "true").lower() in {"1", "true", "yes"}
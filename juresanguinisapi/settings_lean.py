@@ -0,0 +1,81 @@
+"""Minimal settings for the serverless entry point in ``api/index.py``.
+
+Only the apps, middleware and DRF defaults that ``/api/evaluate/`` needs are
+configured: no admin, auth, sessions, messages, staticfiles, templates or
+database, so none of those modules are imported on a cold start.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from . import settings as full_settings
+from .settings import (  # noqa: F401
+    ALLOWED_HOSTS,
+    BASE_DIR,
+    CAPTURE_BUFFER_SIZE,
+    CAPTURE_COMPRESS,
+    CAPTURE_DIR,
+    CAPTURE_FLUSH_INTERVAL,
+    CAPTURE_MAX_AGE,
+    CAPTURE_MAX_BYTES,
+    CAPTURE_REDACT_FIELDS,
+    CAPTURE_SAMPLE_RATE,
+    CAPTURE_VIEWS,
+    DEBUG,
+    EVALUATION_EXECUTOR_MAX_PENDING,
+    EVALUATION_EXECUTOR_WORKERS,
+    RULE_TRUTH_TABLES,
+    SECRET_KEY,
+    SHADOW_DB_PATH,
+    SHADOW_QUEUE_SIZE,
+    SHADOW_RULES_DIR,
+    STAGE_TIMING,
+)
+
+INSTALLED_APPS = [
+    "rest_framework",
+    "juresanguinisapi.eligibility",
+]
+
+MIDDLEWARE = [
+    "juresanguinisapi.eligibility.middleware.StageTimingMiddleware",
+    "juresanguinisapi.eligibility.middleware.TrafficCaptureMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+ROOT_URLCONF = "juresanguinisapi.urls_lean"
+
+TEMPLATES = []
+
+DATABASES = {}
+
+# Features that need what this profile leaves out fail loudly instead of doing nothing.
+UNSUPPORTED_FEATURES = {
+    "AUDIT_LOG": "the audit log is written to the database",
+    "RULE_STATS": "rule counters are only served by the staff-only /api/rules/stats/",
+}
+for name, reason in UNSUPPORTED_FEATURES.items():
+    if getattr(full_settings, name):
+        raise ImproperlyConfigured(
+            f"{name} is not supported by the lean settings: {reason}. "
+            "Use DJANGO_SETTINGS_MODULE=juresanguinisapi.settings."
+        )
+
+LANGUAGE_CODE = "en-us"
+TIME_ZONE = "UTC"
+USE_I18N = False
+USE_TZ = True
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+    "DEFAULT_PARSER_CLASSES": ["rest_framework.parsers.JSONParser"],
+    # The evaluate routes are public; without these DRF would import
+    # django.contrib.auth to build its default authenticators and anonymous user.
+    "DEFAULT_AUTHENTICATION_CLASSES": [],
+    "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.AllowAny"],
+    "UNAUTHENTICATED_USER": None,
+}
+
+# Compile the rule set while the module is imported instead of on the first request.
+PRELOAD_RULES = os.environ.get("PRELOAD_RULES", "true").lower() in {"1", "true", "yes"}
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from juresanguinisapi.eligibility.views import (
+    EvaluateLineageBatchView,
+    EvaluateLineageView,
+    StageMetricsView,
+)
+
+urlpatterns = [
+    path("api/evaluate/", EvaluateLineageView.as_view(), name="evaluate-lineage"),
+    path("api/evaluate/batch/", EvaluateLineageBatchView.as_view(), name="evaluate-lineage-batch"),
+    path("api/metrics/", StageMetricsView.as_view(), name="stage-metrics"),
+]
@@ -0,0 +1,181 @@
+"""Offline batch evaluator for JSONL case files.
+
+Usage::
+
+    python -m src.batch cases.jsonl -o results.jsonl --workers 8
+    python -m src.batch cases.jsonl -o results.jsonl --rule-stats stats.json
+
+Each input line is an evaluation payload shaped like the ``/api/evaluate/`` body.
+Output lines match the ``/api/evaluate/batch/`` stream: ``{"index": n, "result": ...}``
+or ``{"index": n, "errors": ...}``, always in input order. ``--rule-stats`` writes
+the per-rule hit counts and condition timings of the run, summed over all workers.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.decoder import DecodeError, decode_request
+from src.evaluator import evaluate_lineage, load_rule_engine
+from src.rule_engine.pipeline import RuleEngine
+from src.rule_engine.stats import RuleStats
+
+
+logger = logging.getLogger(__name__)
+
+_worker_engine: Optional[RuleEngine] = None
+_worker_barrier = None
+
+
+def _init_worker(rule_paths: Optional[List[str]], record_stats: bool = False, barrier=None) -> None:
+    global _worker_engine, _worker_barrier
+    _worker_engine = load_rule_engine(rule_paths)
+    _worker_barrier = barrier
+    if record_stats:
+        # A private engine, so the counters cover this run only.
+        _worker_engine = RuleEngine(
+            _worker_engine.rules, version=_worker_engine.version, record_stats=True
+        )
+
+
+def _worker_stats(_) -> Dict:
+    # Every worker blocks here until all have taken a task, so each reports exactly once.
+    _worker_barrier.wait()
+    return _worker_engine.stats.to_payload()
+
+
+def evaluate_line(item: Tuple[int, str]) -> Tuple[str, bool]:
+    """Evaluate one raw JSONL record; returns the output line and whether it succeeded."""
+    index, line = item
+    output = {"index": index}
+    try:
+        payload = json.loads(line)
+    except json.JSONDecodeError as exc:
+        output["errors"] = {"detail": f"JSON parse error - {exc}"}
+    else:
+        try:
+            lineage_links, process_context = decode_request(payload)
+            # Historical re-runs rarely repeat a case, so the result cache would only churn.
+            result = evaluate_lineage(
+                lineage_links, process_context=process_context, engine=_worker_engine, cache=None
+            )
+            output["result"] = result.to_payload()
+        except DecodeError as exc:
+            output["errors"] = exc.detail
+        except Exception:
+            # A failing record must not abort the pool and leave the output half written.
+            logger.exception("Batch evaluation failed for record %s", index)
+            output["errors"] = {"detail": "Evaluation failed."}
+    return json.dumps(output, ensure_ascii=False, separators=(",", ":")) + "\n", "result" in output
+
+
+def _read_records(handle: IO[str], in_flight: threading.Semaphore) -> Iterator[Tuple[int, str]]:
+    index = 0
+    for line in handle:
+        if not line.strip():
+            continue
+        # Block until the writer has drained results, keeping memory constant.
+        in_flight.acquire()
+        yield index, line
+        index += 1
+
+
+def run_batch(
+    source: IO[str],
+    sink: IO[str],
+    workers: int = 1,
+    chunksize: int = 64,
+    rule_paths: Optional[List[str]] = None,
+    rule_stats: Optional[RuleStats] = None,
+) -> Tuple[int, int]:
+    """Evaluate every record in ``source`` and write results to ``sink`` in input order.
+
+    Returns the number of records processed and how many of them failed. When
+    ``rule_stats`` is given, the workers' per-rule counters are merged into it.
+    """
+    in_flight = threading.Semaphore(max(workers, 1) * chunksize * 4)
+    records = _read_records(source, in_flight)
+    processed = failed = 0
+
+    def drain(results: Iterable[Tuple[str, bool]]) -> None:
+        nonlocal processed, failed
+        for line, ok in results:
+            sink.write(line)
+            processed += 1
+            failed += not ok
+            in_flight.release()
+
+    record_stats = rule_stats is not None
+    if workers <= 1:
+        _init_worker(rule_paths, record_stats)
+        drain(map(evaluate_line, records))
+        if record_stats:
+            rule_stats.merge(_worker_engine.stats.to_payload())
+    else:
+        barrier = multiprocessing.Barrier(workers) if record_stats else None
+        initargs = (rule_paths, record_stats, barrier)
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+            drain(pool.imap(evaluate_line, records, chunksize=chunksize))
+            if record_stats:
+                for payload in pool.map(_worker_stats, range(workers), chunksize=1):
+                    rule_stats.merge(payload)
+    return processed, failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate a JSONL file of lineage payloads.")
+    parser.add_argument("input", help="JSONL input file, or '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes"
+    )
+    parser.add_argument("--chunksize", type=int, default=64, help="records per worker task")
+    parser.add_argument(
+        "--rules",
+        nargs="+",
+        help="rule files to evaluate against (default: the standard rules, from the bundle if built)",
+    )
+    parser.add_argument(
+        "--rule-stats", metavar="PATH", help="write per-rule hit and cost statistics as JSON"
+    )
+    args = parser.parse_args(argv)
+
+    rule_stats = None
+    if args.rule_stats:
+        engine = load_rule_engine(args.rules)
+        rule_stats = RuleStats([rule.id for rule in engine.rules], engine.version)
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    started = time.perf_counter()
+    try:
+        processed, failed = run_batch(
+            source, sink, args.workers, args.chunksize, args.rules, rule_stats
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    elapsed = time.perf_counter() - started
+    rate = processed / elapsed if elapsed else 0.0
+    print(
+        f"{processed} records ({failed} errors) in {elapsed:.2f}s "
+        f"with {args.workers} worker(s): {rate:,.0f} records/s",
+        file=sys.stderr,
+    )
+    if rule_stats is not None:
+        with open(args.rule_stats, "w", encoding="utf-8") as handle:
+            json.dump(rule_stats.to_payload(), handle, indent=2)
+            handle.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
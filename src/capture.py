@@ -0,0 +1,196 @@
+"""Buffered capture of evaluation traffic to rotating JSONL files.
+
+``TrafficCapture.record`` appends the raw request and response bodies of a
+request to an in-memory ring buffer and returns; a background thread drains the
+buffer every ``flush_interval`` seconds, decodes and redacts the bodies and writes
+one JSON line per exchange::
+
+    {"ts": 1760000000.0, "path": "/api/evaluate/", "status": 200,
+     "request": {...}, "response": {...}}
+
+Files are named ``capture-<UTC time>-<pid>-<n>.jsonl`` (``.jsonl.gz`` when
+compressed) and rotated once ``max_bytes`` of JSON have been written to them or
+they are ``max_age`` seconds old. When the buffer is full the oldest exchanges are
+overwritten, so a slow disk costs captured traffic, never request latency.
+Captured files replay with ``python -m benchmarks.loadtest --corpus FILE``.
+"""
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REDACTED = "[REDACTED]"
+
+# (timestamp, path, status, request body, response body)
+Exchange = Tuple[float, str, int, bytes, bytes]
+
+
+def redact(value: Any, fields: frozenset) -> Any:
+    """A copy of decoded JSON ``value`` with every key in ``fields`` replaced, at any depth."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in fields else redact(item, fields) for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item, fields) for item in value]
+    return value
+
+
+def _decode_body(body: bytes) -> Any:
+    try:
+        return json.loads(body)
+    except ValueError:
+        # Kept as text so malformed requests can be replayed as sent.
+        return body.decode("utf-8", errors="replace")
+
+
+def iter_captured_requests(path: str) -> Iterator[Any]:
+    """Request payloads of a capture file, compressed or not, in capture order."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)["request"]
+
+
+class TrafficCapture:
+    """Ring buffer of request/response exchanges flushed to JSONL by a background thread."""
+
+    def __init__(
+        self,
+        directory: str,
+        sample_rate: float = 1.0,
+        redact_fields: Iterable[str] = ("name",),
+        capacity: int = 10_000,
+        flush_interval: float = 1.0,
+        max_bytes: int = 64 * 2**20,
+        max_age: float = 3600.0,
+        compress: bool = False,
+    ):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.redact_fields = frozenset(redact_fields)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        os.makedirs(directory, exist_ok=True)
+        self._buffer: Deque[Exchange] = deque(maxlen=capacity)
+        self._file: Optional[IO[str]] = None
+        self._file_bytes = 0
+        self._file_opened = 0.0
+        self._file_count = 0
+        self._write_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.sampled_out = 0
+        self.overwritten = 0
+        self.written = 0
+        self._thread = threading.Thread(target=self._run, name="traffic-capture", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, path: str, status: int, request_body: bytes, response_body: bytes) -> bool:
+        """Buffer one exchange unless it is sampled out; never blocks on I/O."""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return False
+        buffer = self._buffer
+        if len(buffer) == self.capacity:
+            self.overwritten += 1
+        # deque.append is atomic; a full deque drops its oldest entry.
+        buffer.append((time.time(), path, status, request_body, response_body))
+        return True
+
+    def flush(self) -> None:
+        """Write every buffered exchange and flush the current file."""
+        with self._write_lock:
+            buffer = self._buffer
+            while buffer:
+                try:
+                    exchange = buffer.popleft()
+                except IndexError:
+                    break
+                self._write(exchange)
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._thread.join()
+        self.flush()
+        with self._write_lock:
+            self._close_file()
+        atexit.unregister(self.close)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "overwritten": self.overwritten,
+            "sampled_out": self.sampled_out,
+            "files": self._file_count,
+        }
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+                with self._write_lock:
+                    if self._file is not None and self._expired():
+                        self._close_file()
+            except Exception:
+                logger.exception("Traffic capture flush failed")
+
+    def _write(self, exchange: Exchange) -> None:
+        timestamp, path, status, request_body, response_body = exchange
+        record = {
+            "ts": round(timestamp, 6),
+            "path": path,
+            "status": status,
+            "request": redact(_decode_body(request_body), self.redact_fields),
+            "response": _decode_body(response_body),
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        if self._file is not None and (self._file_bytes >= self.max_bytes or self._expired()):
+            self._close_file()
+        if self._file is None:
+            self._open_file()
+        self._file.write(line)
+        self._file_bytes += len(line)
+        self.written += 1
+
+    def _expired(self) -> bool:
+        return time.monotonic() - self._file_opened >= self.max_age
+
+    def _open_file(self) -> None:
+        self._file_count += 1
+        stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        name = f"capture-{stamp}-{os.getpid()}-{self._file_count}.jsonl"
+        path = os.path.join(self.directory, name + ".gz" if self.compress else name)
+        if self.compress:
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+        self._file_bytes = 0
+        self._file_opened = time.monotonic()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+__all__ = ["TrafficCapture", "iter_captured_requests", "redact"]
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.models import CitizenshipEvent, LineageLink, Person
+from src.schemas import applicant_input_schema, family_tree_input_schema
+
+
+class DecodeError(ValueError):
+    """Raised when an evaluation request payload cannot be turned into domain objects.
+
+    ``detail`` has the same shape and messages as the errors produced by the API
+    serializers, so callers can report it exactly as they would a DRF validation error.
+    """
+
+    def __init__(self, detail: Any):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class _Invalid(Exception):
+    def __init__(self, detail: Any):
+        self.detail = detail
+
+
+# Sentinels for "key not present in the payload" and "leave the attribute unset".
+_MISSING = object()
+_OMIT = object()
+
+NON_FIELD_ERRORS = "non_field_errors"
+
+_REQUIRED = "This field is required."
+_NULL = "This field may not be null."
+_BLANK = "This field may not be blank."
+_INVALID_STRING = "Not a valid string."
+_INVALID_DATE = "Date has wrong format. Use one of these formats instead: YYYY-MM-DD."
+_DATETIME = "Expected a date but got a datetime."
+_NOT_A_LIST = 'Expected a list of items but got type "{}".'
+_NOT_A_DICT = 'Expected a dictionary of items but got type "{}".'
+_NOT_AN_OBJECT = "Invalid data. Expected a dictionary, but got {}."
+_INVALID_CHOICE = '"{}" is not a valid choice.'
+
+_DATE_RE = re.compile(r"(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})$")
+
+# Domain objects built from schema definitions; other objects decode to plain dicts.
+_FACTORIES: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "person": lambda attrs: Person(**attrs),
+    "citizenship_event": lambda attrs: CitizenshipEvent(**attrs),
+}
+
+Decoder = Callable[[Any], Any]
+
+
+def parse_date(value: Any) -> date:
+    """ISO-8601 date parsing with the same acceptance rules as the API's ``DateField``."""
+    if isinstance(value, datetime):
+        raise _Invalid([_DATETIME])
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except TypeError:
+        raise _Invalid([_INVALID_DATE])
+    except ValueError:
+        match = _DATE_RE.match(value)
+        if match:
+            try:
+                return date(**{key: int(part) for key, part in match.groupdict().items()})
+            except ValueError:
+                pass
+        raise _Invalid([_INVALID_DATE])
+
+
+def _decode_string(value: Any) -> str:
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise _Invalid([_INVALID_STRING])
+    text = str(value).strip()
+    errors = []
+    if "\x00" in text:
+        errors.append("Null characters are not allowed.")
+    for character in text:
+        if 0xD800 <= ord(character) <= 0xDFFF:
+            errors.append(f"Surrogate characters are not allowed: U+{ord(character):X}.")
+            break
+    if errors:
+        raise _Invalid(errors)
+    return text
+
+
+def _choice_decoder(choices: List[str]) -> Decoder:
+    by_string = {str(choice): choice for choice in choices}
+
+    def decode_choice(value: Any) -> str:
+        try:
+            return by_string[str(value)]
+        except KeyError:
+            raise _Invalid([_INVALID_CHOICE.format(value)])
+
+    return decode_choice
+
+
+def _decode_dict(value: Any) -> Dict[str, Any]:
+    if not isinstance(value, dict):
+        raise _Invalid([_NOT_A_DICT.format(type(value).__name__)])
+    return {str(key): item for key, item in value.items()}
+
+
+def _resolve(node: Dict[str, Any], root: Dict[str, Any]) -> Tuple[Dict[str, Any], str | None]:
+    ref = node.get("$ref")
+    if not ref:
+        return node, None
+    name = ref.rsplit("/", 1)[-1]
+    return root["definitions"][name], name
+
+
+def _is_nested_object(node: Dict[str, Any]) -> bool:
+    return node.get("type") == "object" and "properties" in node
+
+
+def _compile_object(node: Dict[str, Any], root: Dict[str, Any], name: str | None) -> Decoder:
+    required = set(node.get("required", []))
+    fields = [
+        (field_name, _compile_field(field_node, root, field_name in required))
+        for field_name, field_node in node["properties"].items()
+    ]
+    factory = _FACTORIES.get(name, dict)
+
+    def decode_object(value: Any) -> Any:
+        if not isinstance(value, Mapping):
+            raise _Invalid({NON_FIELD_ERRORS: [_NOT_AN_OBJECT.format(type(value).__name__)]})
+        attrs = {}
+        errors = {}
+        for field_name, decode in fields:
+            try:
+                decoded = decode(value.get(field_name, _MISSING))
+            except _Invalid as exc:
+                errors[field_name] = exc.detail
+                continue
+            if decoded is not _OMIT:
+                attrs[field_name] = decoded
+        if errors:
+            raise _Invalid(errors)
+        return factory(attrs)
+
+    return decode_object
+
+
+def _compile_array(node: Dict[str, Any], root: Dict[str, Any]) -> Decoder:
+    item_node, item_name = _resolve(node["items"], root)
+
+    if _is_nested_object(item_node):
+        decode_item = _compile_object(item_node, root, item_name)
+
+        def decode_nested_item(item: Any) -> Any:
+            if item is None:
+                raise _Invalid([_NULL])
+            return decode_item(item)
+
+        def decode_nested_list(value: Any) -> List[Any]:
+            if not isinstance(value, list):
+                raise _Invalid({NON_FIELD_ERRORS: [_NOT_A_LIST.format(type(value).__name__)]})
+            return _decode_items(value, decode_nested_item)
+
+        return decode_nested_list
+
+    decode_scalar = _compile_field(item_node, root, required=True)
+
+    def decode_list(value: Any) -> List[Any]:
+        if isinstance(value, (str, Mapping)) or not hasattr(value, "__iter__"):
+            raise _Invalid([_NOT_A_LIST.format(type(value).__name__)])
+        return _decode_items(value, decode_scalar)
+
+    return decode_list
+
+
+def _decode_items(values: Any, decode_item: Decoder) -> List[Any]:
+    items = []
+    errors = {}
+    for index, item in enumerate(values):
+        try:
+            items.append(decode_item(item))
+        except _Invalid as exc:
+            errors[index] = exc.detail
+    if errors:
+        raise _Invalid(errors)
+    return items
+
+
+def _compile_field(node: Dict[str, Any], root: Dict[str, Any], required: bool) -> Decoder:
+    """Compile one schema property into a decoder applying the API's empty-value rules.
+
+    Required properties reject null and blank values. Optional scalars accept null
+    (and blank strings); optional arrays and free-form objects default to empty.
+    """
+    node, name = _resolve(node, root)
+    kind = node.get("type")
+    nullable = not required
+    is_string = False
+    default: Any = _OMIT
+
+    if "enum" in node:
+        decode = _choice_decoder(node["enum"])
+    elif kind == "string" and node.get("format") == "date":
+        decode = parse_date
+    elif kind == "string":
+        decode = _decode_string
+        is_string = True
+    elif kind == "array":
+        decode = _compile_array(node, root)
+        nullable, default = False, list
+    elif _is_nested_object(node):
+        decode = _compile_object(node, root, name)
+        nullable = False
+    elif kind == "object":
+        decode = _decode_dict
+        nullable, default = False, dict
+    else:
+        raise ValueError(f"Unsupported schema node {node}")
+
+    def decode_field(value: Any) -> Any:
+        if is_string and (value == "" or (isinstance(value, str) and not value.strip())):
+            if required:
+                raise _Invalid([_BLANK])
+            return ""
+        if value is _MISSING:
+            if required:
+                raise _Invalid([_REQUIRED])
+            return default() if default is not _OMIT else _OMIT
+        if value is None:
+            if not nullable:
+                raise _Invalid([_NULL])
+            return None
+        return decode(value)
+
+    return decode_field
+
+
+def _compile_request_decoder(schema: Dict[str, Any]) -> Decoder:
+    return _compile_object(schema, schema, None)
+
+
+def _compile_definition_decoder(name: str) -> Decoder:
+    schema = applicant_input_schema()
+    return _compile_object(schema["definitions"][name], schema, name)
+
+
+_decode_payload = _compile_request_decoder(applicant_input_schema())
+_decode_tree_payload = _compile_request_decoder(family_tree_input_schema())
+_decode_event = _compile_definition_decoder("citizenship_event")
+
+
+def decode_date(value: Any) -> date:
+    """Validate one date the way a ``format: date`` property is validated."""
+    try:
+        return parse_date(value)
+    except _Invalid as exc:
+        raise DecodeError(exc.detail)
+
+
+def decode_citizenship_event(data: Any) -> CitizenshipEvent:
+    """Validate one event object as it would be validated inside a person's ``events``."""
+    try:
+        return _decode_event(data)
+    except _Invalid as exc:
+        raise DecodeError(exc.detail)
+
+
+def decode_request(data: Any) -> Tuple[List[LineageLink], Dict[str, Any]]:
+    """Validate an evaluation payload and build its lineage chain and process context.
+
+    Validation is driven by ``applicant_input_schema`` and builds ``Person``,
+    ``CitizenshipEvent`` and ``LineageLink`` objects in the same pass, reporting
+    errors with the messages and nesting the API serializers use.
+    """
+    if data is None:
+        raise DecodeError({NON_FIELD_ERRORS: ["No data provided"]})
+    try:
+        attrs = _decode_payload(data)
+    except _Invalid as exc:
+        raise DecodeError(exc.detail)
+
+    applicant: Person = attrs["applicant"]
+    people = {applicant.id: applicant}
+    for ancestor in attrs["ancestors"]:
+        if ancestor.id == applicant.id:
+            raise DecodeError({NON_FIELD_ERRORS: ["Applicant id must be distinct from ancestors"]})
+        people[ancestor.id] = ancestor
+
+    return _build_links(attrs["lineage_links"], people), _process_context(attrs)
+
+
+def _build_links(link_items: List[Dict[str, Any]], people: Dict[str, Person]) -> List[LineageLink]:
+    links: List[LineageLink] = []
+    for link_data in link_items:
+        parent_id = link_data["parent_id"]
+        child_id = link_data["child_id"]
+        if parent_id not in people:
+            raise DecodeError([f"Unknown parent_id '{parent_id}' in lineage"])
+        if child_id not in people:
+            raise DecodeError([f"Unknown child_id '{child_id}' in lineage"])
+        links.append(
+            LineageLink(
+                parent=people[parent_id],
+                child=people[child_id],
+                relationship=link_data["relationship"],
+                notes=link_data["notes"],
+            )
+        )
+    return links
+
+
+def _process_context(attrs: Dict[str, Any]) -> Dict[str, Any]:
+    process_context = dict(attrs.get("context") or {})
+    filed_date = process_context.get("appointment_filed_date")
+    if isinstance(filed_date, date):
+        process_context["appointment_filed_date"] = filed_date.isoformat()
+    return process_context
+
+
+def decode_family_tree_request(
+    data: Any,
+) -> Tuple[Dict[str, Person], List[LineageLink], List[str], Dict[str, Any]]:
+    """Validate a family-tree payload.
+
+    Returns the people by id, the parent-child links, the ids of the people to
+    evaluate (empty for every descendant) and the process context.
+    """
+    if data is None:
+        raise DecodeError({NON_FIELD_ERRORS: ["No data provided"]})
+    try:
+        attrs = _decode_tree_payload(data)
+    except _Invalid as exc:
+        raise DecodeError(exc.detail)
+
+    people: Dict[str, Person] = {}
+    for person in attrs["persons"]:
+        if person.id in people:
+            raise DecodeError({NON_FIELD_ERRORS: [f"Duplicate person id '{person.id}'"]})
+        people[person.id] = person
+    targets = attrs.get("targets") or []
+    for target in targets:
+        if target not in people:
+            raise DecodeError({"targets": [f"Unknown person id '{target}' in targets"]})
+    return people, _build_links(attrs["lineage_links"], people), targets, _process_context(attrs)
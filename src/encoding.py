@@ -0,0 +1,112 @@
+"""Direct byte encoding of evaluation results.
+
+``encode_result`` writes an ``EvaluationResult`` as the same bytes DRF's
+``JSONRenderer`` produces for ``result.to_payload()`` with the default settings
+(compact separators, non-ASCII kept as UTF-8, U+2028 and U+2029 escaped), without
+building the payload dict or walking it with the generic encoder.
+
+Enum values are encoded once at import. Rule outcomes, explanations and rule-set
+versions repeat across results, because outcomes are shared per rule, so their
+encodings are memoized in bounded tables.
+"""
+from __future__ import annotations
+
+import json
+from typing import Dict, Optional, Tuple
+
+from src.models import (
+    AcquisitionMode,
+    Confidence,
+    CourtViability,
+    EvaluationResult,
+    OverallStatus,
+    RuleOutcome,
+    TransmissionStatus,
+)
+
+
+# Entries kept per memo table before it is emptied; far above any rule set's size.
+MEMO_LIMIT = 4096
+
+
+def encode_string(value: str) -> bytes:
+    encoded = json.dumps(value, ensure_ascii=False)
+    return encoded.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode("utf-8")
+
+
+_ENUM_BYTES: Dict[object, bytes] = {
+    member: encode_string(member.value)
+    for enum in (AcquisitionMode, Confidence, CourtViability, OverallStatus, TransmissionStatus)
+    for member in enum
+}
+
+_strings: Dict[str, bytes] = {}
+# Keyed by identity, which is cheaper than hashing the fields; the entry keeps the
+# outcome alive so its id cannot be reused while the entry exists.
+_outcomes: Dict[int, Tuple[RuleOutcome, bytes]] = {}
+
+
+def _memo_string(value: str) -> bytes:
+    encoded = _strings.get(value)
+    if encoded is None:
+        if len(_strings) >= MEMO_LIMIT:
+            _strings.clear()
+        encoded = _strings[value] = encode_string(value)
+    return encoded
+
+
+def _optional_string(value: Optional[str]) -> bytes:
+    return b"null" if value is None else _memo_string(value)
+
+
+def encode_outcome(outcome: RuleOutcome) -> bytes:
+    entry = _outcomes.get(id(outcome))
+    if entry is not None and entry[0] is outcome:
+        return entry[1]
+    if len(_outcomes) >= MEMO_LIMIT:
+        _outcomes.clear()
+    encoded = b"".join(
+        (
+            b'{"rule_id":',
+            encode_string(outcome.rule_id),
+            b',"status":',
+            _ENUM_BYTES[outcome.status],
+            b',"notes":',
+            encode_string(outcome.notes),
+            b',"confidence":',
+            _ENUM_BYTES[outcome.confidence],
+            b',"needs_lawyer":',
+            b"true" if outcome.needs_lawyer else b"false",
+            b"}",
+        )
+    )
+    _outcomes[id(outcome)] = (outcome, encoded)
+    return encoded
+
+
+def encode_result(result: EvaluationResult) -> bytes:
+    """The compact JSON encoding of ``result.to_payload()``."""
+    return b"".join(
+        (
+            b'{"overall_status":',
+            _ENUM_BYTES[result.overall_status],
+            b',"confidence":',
+            _ENUM_BYTES[result.confidence],
+            b',"court_viability":',
+            _ENUM_BYTES[result.court_viability],
+            b',"needs_lawyer":',
+            b"true" if result.needs_lawyer else b"false",
+            b',"acquisition_mode":',
+            _ENUM_BYTES[result.acquisition_mode],
+            b',"explanations":[',
+            b",".join([_memo_string(explanation) for explanation in result.explanations]),
+            b'],"rule_outcomes":[',
+            b",".join([encode_outcome(outcome) for outcome in result.rule_outcomes]),
+            b'],"rule_set_version":',
+            _optional_string(result.rule_set_version),
+            b"}",
+        )
+    )
+
+
+__all__ = ["encode_outcome", "encode_result", "encode_string"]
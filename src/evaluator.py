@@ -3,10 +3,12 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Dict, List
 
+from src.instrumentation import stage
 from src.models import EvaluationResult, LineageLink
+from src.result_cache import RESULT_CACHE, CachedEvaluation, ResultCache, lineage_fingerprint
 from src.rule_engine.features import build_feature_flags
-from src.rule_engine.loader import RuleLoader
 from src.rule_engine.pipeline import EvaluationContext, RuleEngine
+from src.rule_engine.registry import RULE_SETS
 
 
 DEFAULT_RULE_PATHS = [
@@ -16,23 +18,55 @@ DEFAULT_RULE_PATHS = [
     "rules/reform.yaml",
 ]
 
+# Built by ``python -m src.rule_engine.bundle``; used for the default rule files only.
+DEFAULT_BUNDLE_PATH = "rules/rules.bundle"
+
+
+def load_rule_engine(rule_paths=None) -> RuleEngine:
+    if not rule_paths:
+        return RULE_SETS.get_engine(DEFAULT_RULE_PATHS, bundle_path=DEFAULT_BUNDLE_PATH)
+    return RULE_SETS.get_engine(rule_paths)
+
 
 def evaluate_lineage(
-    lineage_chain: List[LineageLink], process_context: Dict | None = None, rule_paths=None
+    lineage_chain: List[LineageLink],
+    process_context: Dict | None = None,
+    rule_paths=None,
+    engine: RuleEngine | None = None,
+    cache: ResultCache | None = RESULT_CACHE,
 ) -> EvaluationResult:
     process_context = process_context or {}
-    rule_paths = rule_paths or DEFAULT_RULE_PATHS
+    if engine is None:
+        with stage("rules"):
+            engine = load_rule_engine(rule_paths)
 
-    features = build_feature_flags(lineage_chain)
-    rules = RuleLoader(rule_paths).load()
-    engine = RuleEngine(rules)
+    # Engines built outside the registry carry no version and are never cached.
+    cache_key = None
+    if cache is not None and engine.version is not None:
+        with stage("cache"):
+            cache_key = lineage_fingerprint(lineage_chain, process_context, engine.version)
+            cached = cache.get(cache_key, engine.version)
+        if cached is not None:
+            return cached.to_result(lineage_chain)
+
+    with stage("features"):
+        features = build_feature_flags(lineage_chain)
     context = EvaluationContext(
         lineage_chain=lineage_chain,
         process_context=process_context,
         now=datetime.utcnow(),
         features=features,
     )
-    return engine.evaluate(context)
+    with stage("evaluate"):
+        result = engine.evaluate(context)
+    if cache_key is not None:
+        cache.put(cache_key, engine.version, CachedEvaluation.from_result(result))
+    return result
 
 
-__all__ = ["evaluate_lineage", "DEFAULT_RULE_PATHS"]
+__all__ = [
+    "evaluate_lineage",
+    "load_rule_engine",
+    "DEFAULT_BUNDLE_PATH",
+    "DEFAULT_RULE_PATHS",
+]
@@ -0,0 +1,181 @@
+"""Evaluation of every descendant in a family tree in one pass.
+
+The tree is a DAG of people joined by parent-child ``LineageLink`` objects. Each
+lineage evaluated is a path from a person without recorded parents down to a
+descendant. Person facts and link flags are computed once per person and link,
+and the chain-level flags of every path prefix are memoized, so descendants that
+share ancestors reuse the work done for them.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.decoder import DecodeError
+from src.evaluator import load_rule_engine
+from src.models import EvaluationResult, LineageLink, Person, TransmissionStatus
+from src.rule_engine.features import (
+    PersonFacts,
+    apply_link_features,
+    default_feature_flags,
+    person_facts,
+)
+from src.rule_engine.pipeline import EvaluationContext, RuleEngine
+
+
+# Pedigree collapse can multiply paths; beyond this a request is rejected.
+MAX_LINEAGES_PER_PERSON = 64
+
+
+@dataclass(slots=True)
+class _Prefix:
+    """A root-to-person path, sharing its ancestors' prefixes."""
+
+    previous: Optional["_Prefix"]
+    link: Optional[LineageLink]
+    person: Person
+    flags: Dict[str, bool]
+    broken: bool
+
+    def chain(self) -> List[LineageLink]:
+        links = []
+        prefix = self
+        while prefix.link is not None:
+            links.append(prefix.link)
+            prefix = prefix.previous
+        links.reverse()
+        return links
+
+    def path(self) -> Tuple[str, ...]:
+        ids = []
+        prefix = self
+        while prefix is not None:
+            ids.append(prefix.person.id)
+            prefix = prefix.previous
+        return tuple(reversed(ids))
+
+
+@dataclass(slots=True)
+class DescendantEvaluation:
+    person_id: str
+    path: Tuple[str, ...]
+    result: EvaluationResult
+
+    def to_payload(self) -> Dict:
+        return {
+            "person_id": self.person_id,
+            "path": list(self.path),
+            "result": self.result.to_payload(),
+        }
+
+
+def _topological_order(people: Dict[str, Person], links: List[LineageLink]) -> List[str]:
+    pending_parents = {person_id: 0 for person_id in people}
+    children: Dict[str, List[str]] = {}
+    for link in links:
+        pending_parents[link.child.id] += 1
+        children.setdefault(link.parent.id, []).append(link.child.id)
+    ready = deque(person_id for person_id, count in pending_parents.items() if not count)
+    order = []
+    while ready:
+        person_id = ready.popleft()
+        order.append(person_id)
+        for child_id in children.get(person_id, ()):
+            pending_parents[child_id] -= 1
+            if not pending_parents[child_id]:
+                ready.append(child_id)
+    if len(order) != len(people):
+        raise DecodeError({"lineage_links": ["Lineage links must not form a cycle"]})
+    return order
+
+
+def _ancestors_and_self(
+    targets: List[str], parent_links: Dict[str, List[LineageLink]]
+) -> Set[str]:
+    seen = set(targets)
+    pending = list(targets)
+    while pending:
+        for link in parent_links.get(pending.pop(), ()):
+            parent_id = link.parent.id
+            if parent_id not in seen:
+                seen.add(parent_id)
+                pending.append(parent_id)
+    return seen
+
+
+def evaluate_family_tree(
+    people: Dict[str, Person],
+    links: List[LineageLink],
+    targets: Iterable[str] | None = None,
+    process_context: Dict | None = None,
+    engine: RuleEngine | None = None,
+) -> List[DescendantEvaluation]:
+    """Evaluate every lineage ending at each of ``targets``.
+
+    Without targets every person with at least one recorded parent is evaluated.
+    Results are grouped by target, once per distinct target; a person reachable
+    through several ancestors gets one result per path. Each result equals
+    ``evaluate_lineage`` on its path. Only the targets and their ancestors are
+    walked, so ``MAX_LINEAGES_PER_PERSON`` applies to them alone.
+    """
+    process_context = process_context or {}
+    engine = engine or load_rule_engine()
+    now = datetime.utcnow()
+
+    parent_links: Dict[str, List[LineageLink]] = {}
+    for link in links:
+        parent_links.setdefault(link.child.id, []).append(link)
+    targets = list(
+        dict.fromkeys(
+            targets or [person_id for person_id in people if person_id in parent_links]
+        )
+    )
+    relevant = _ancestors_and_self(targets, parent_links)
+
+    facts: Dict[str, PersonFacts] = {
+        person_id: person_facts(people[person_id]) for person_id in relevant
+    }
+    prefixes: Dict[str, List[_Prefix]] = {}
+    for person_id in _topological_order(people, links):
+        if person_id not in relevant:
+            continue
+        person = people[person_id]
+        incoming = parent_links.get(person_id)
+        if not incoming:
+            prefixes[person_id] = [_Prefix(None, None, person, {}, False)]
+            continue
+        extended = []
+        for link in incoming:
+            link_flags: Dict[str, bool] = {}
+            broken = apply_link_features(
+                link, facts[link.parent.id], facts[person_id], link_flags
+            )
+            if broken:
+                link.parent_citizenship_status_at_birth = TransmissionStatus.BROKEN_NATURALIZATION
+            for previous in prefixes[link.parent.id]:
+                flags = dict(previous.flags, **link_flags) if link_flags else previous.flags
+                extended.append(_Prefix(previous, link, person, flags, previous.broken or broken))
+        if len(extended) > MAX_LINEAGES_PER_PERSON:
+            message = f"Person '{person_id}' has more than {MAX_LINEAGES_PER_PERSON} lineages"
+            raise DecodeError({"lineage_links": [message]})
+        prefixes[person_id] = extended
+
+    evaluations = []
+    for person_id in targets:
+        for prefix in prefixes[person_id]:
+            features = default_feature_flags()
+            features.update(prefix.flags)
+            if prefix.broken:
+                features["parent_citizenship_status"] = TransmissionStatus.BROKEN_NATURALIZATION.value
+            context = EvaluationContext(
+                lineage_chain=prefix.chain(),
+                process_context=process_context,
+                now=now,
+                features=features,
+            )
+            evaluations.append(
+                DescendantEvaluation(person_id, prefix.path(), engine.evaluate(context))
+            )
+    return evaluations
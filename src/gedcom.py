@@ -0,0 +1,380 @@
+"""Streaming GEDCOM importer for lineage evaluation.
+
+Usage::
+
+    python -m src.gedcom family.ged --applicant I123
+    python -m src.gedcom family.ged --applicant I123 --payloads > cases.jsonl
+
+A GEDCOM file is read twice. The first pass streams every line and keeps only
+what is needed to walk the tree: the byte offset of each individual's record, the
+families each individual was born into, each family's husband and wife, and
+whether an individual was born in Italy. The walk then goes up from the applicant
+to the nearest Italian-born ancestor on every path. The second pass seeks to the
+records of the individuals on those paths and builds ``Person`` objects with
+their birth and naturalization (``NATU``) details; no other records are decoded.
+
+Each lineage becomes a parent-to-child ``LineageLink`` chain for
+``evaluate_lineage``. ``--payloads`` instead writes one ``/api/evaluate/`` request
+body per lineage, which ``python -m src.batch`` accepts as is.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass
+from datetime import date
+from typing import IO, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.evaluator import evaluate_lineage
+from src.models import CitizenshipEvent, LineageLink, Person
+from src.rule_engine.features import ITALY, normalize_country
+
+
+# Generations walked up from the applicant before a path is abandoned.
+MAX_GENERATIONS = 12
+# Pedigree collapse can multiply paths; beyond this an import is rejected.
+MAX_LINEAGES = 64
+
+MONTHS = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12,
+}
+# Qualifiers of approximate and ranged dates; the first date given is used.
+DATE_QUALIFIERS = {"ABT", "CAL", "EST", "BEF", "AFT", "BET", "FROM", "TO", "INT"}
+
+# Keys recording the precision of an imprecise date: in the metadata of a
+# naturalization event, and in the notes of a person for their birth date.
+DATE_PRECISION = "date_precision"
+BIRTH_DATE_PRECISION = "birth_date_precision"
+
+_CALENDAR_ESCAPE = re.compile(r"@#D[A-Z ]+@")
+
+
+class GedcomError(ValueError):
+    pass
+
+
+def parse_gedcom_date(value: str) -> Tuple[Optional[date], Optional[str]]:
+    """The date a GEDCOM date value refers to, and how precisely it is known.
+
+    Partial dates resolve to their first day (``MAR 1890`` is 1 March 1890, with
+    precision ``"month"``) and qualified or ranged dates to their first date, with
+    precision ``"approximate"``. Exact dates have precision ``"day"``; unreadable
+    values give ``(None, None)``.
+    """
+    words = _CALENDAR_ESCAPE.sub("", value).upper().split()
+    approximate = False
+    if words and words[0] in DATE_QUALIFIERS:
+        approximate = True
+        words = words[1:]
+    for stop in ("AND", "TO"):
+        if stop in words:
+            words = words[: words.index(stop)]
+    # A parenthesised phrase follows the date, or replaces it entirely.
+    for position, word in enumerate(words):
+        if word.startswith("("):
+            words = words[:position]
+            break
+    # Dual years such as ``1699/00`` keep their first year.
+    words = [word.split("/")[0] if word[:1].isdigit() else word for word in words]
+    try:
+        if len(words) == 3:
+            parsed, precision = date(int(words[2]), MONTHS[words[1]], int(words[0])), "day"
+        elif len(words) == 2:
+            parsed, precision = date(int(words[1]), MONTHS[words[0]], 1), "month"
+        elif len(words) == 1:
+            parsed, precision = date(int(words[0]), 1, 1), "year"
+        else:
+            return None, None
+    except (KeyError, ValueError):
+        return None, None
+    return parsed, "approximate" if approximate else precision
+
+
+def place_country(place: str) -> Optional[str]:
+    """The last comma-separated part of a GEDCOM place, where the country goes."""
+    country = place.rsplit(",", 1)[-1].strip()
+    return country or None
+
+
+def _xref(value: bytes) -> str:
+    return value.strip().strip(b"@").decode("utf-8", "replace")
+
+
+@dataclass(frozen=True, slots=True)
+class GedcomLineage:
+    """A path from an Italian-born ancestor down to the applicant."""
+
+    person_ids: Tuple[str, ...]
+    # ``relationships[i]`` is how ``person_ids[i]`` relates to ``person_ids[i + 1]``.
+    relationships: Tuple[str, ...]
+
+
+class GedcomIndex:
+    """The parent structure of a GEDCOM file, built in one streaming pass.
+
+    Only offsets and ids are kept, so memory grows with the number of records but
+    not with their contents; ``load_people`` reads full records on demand.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offsets: Dict[str, int] = {}
+        self.birth_families: Dict[str, Tuple[str, ...]] = {}
+        self.families: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self.italian_born: Set[str] = set()
+        with open(path, "rb") as handle:
+            self._scan(handle)
+
+    def _scan(self, handle: IO[bytes]) -> None:
+        offsets = self.offsets
+        italian_born = self.italian_born
+        position = 0
+        individual: Optional[str] = None
+        family: Optional[str] = None
+        famc: List[str] = []
+        husband = wife = None
+        in_birth = False
+
+        def close_record() -> None:
+            if individual is not None and famc:
+                self.birth_families[individual] = tuple(famc)
+            if family is not None:
+                self.families[family] = (husband, wife)
+
+        for line in handle:
+            offset = position
+            position += len(line)
+            parts = line.split(None, 2)
+            if not parts:
+                continue
+            level = parts[0]
+            if level == b"0" or level == b"\xef\xbb\xbf0":
+                close_record()
+                individual = family = None
+                husband = wife = None
+                in_birth = False
+                if len(parts) == 3:
+                    kind = parts[2].strip()
+                    if kind == b"INDI":
+                        individual = _xref(parts[1])
+                        offsets[individual] = offset
+                        famc = []
+                    elif kind == b"FAM":
+                        family = _xref(parts[1])
+            elif level == b"1" and len(parts) > 1:
+                tag = parts[1]
+                in_birth = tag == b"BIRT"
+                if len(parts) < 3:
+                    continue
+                if individual is not None and tag == b"FAMC":
+                    famc.append(_xref(parts[2]))
+                elif family is not None:
+                    if tag == b"HUSB":
+                        husband = _xref(parts[2])
+                    elif tag == b"WIFE":
+                        wife = _xref(parts[2])
+            elif in_birth and level == b"2" and len(parts) == 3 and parts[1] == b"PLAC":
+                if individual is None:
+                    continue
+                place = parts[2].decode("utf-8", "replace")
+                if normalize_country(place_country(place)) == ITALY:
+                    italian_born.add(individual)
+        close_record()
+
+    def lineages(
+        self,
+        applicant_id: str,
+        max_generations: int = MAX_GENERATIONS,
+        max_lineages: int = MAX_LINEAGES,
+    ) -> List[GedcomLineage]:
+        """Every path from the applicant up to its nearest Italian-born ancestor.
+
+        A path ends at the first Italian-born ancestor met; paths that reach
+        ``max_generations`` or a person without recorded parents are dropped.
+        Fathers are explored before mothers.
+        """
+        applicant_id = applicant_id.strip("@")
+        if applicant_id not in self.offsets:
+            raise GedcomError(f"Unknown individual '{applicant_id}'")
+        found: List[GedcomLineage] = []
+        # Paths run from the applicant upwards: (person ids, relationships).
+        stack: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = [((applicant_id,), ())]
+        while stack:
+            ids, relationships = stack.pop()
+            person_id = ids[-1]
+            if len(ids) > 1 and person_id in self.italian_born:
+                found.append(GedcomLineage(ids[::-1], relationships[::-1]))
+                if len(found) > max_lineages:
+                    raise GedcomError(
+                        f"Individual '{applicant_id}' has more than {max_lineages} lineages"
+                    )
+                continue
+            if len(ids) > max_generations:
+                continue
+            parents = []
+            for family_id in self.birth_families.get(person_id, ()):
+                husband, wife = self.families.get(family_id, (None, None))
+                parents.extend(((husband, "father"), (wife, "mother")))
+            for parent_id, relationship in reversed(parents):
+                if parent_id is not None and parent_id in self.offsets and parent_id not in ids:
+                    stack.append((ids + (parent_id,), relationships + (relationship,)))
+        return found
+
+    def load_people(self, person_ids: Iterable[str]) -> Dict[str, Person]:
+        """Decode the records of ``person_ids``, reading nothing else from the file."""
+        people = {}
+        with open(self.path, "rb") as handle:
+            for person_id in sorted(set(person_ids), key=self.offsets.__getitem__):
+                handle.seek(self.offsets[person_id])
+                people[person_id] = _read_person(handle, person_id)
+        return people
+
+    def lineage_chains(self, applicant_id: str, **limits: int) -> List[List[LineageLink]]:
+        lineages = self.lineages(applicant_id, **limits)
+        people = self.load_people(
+            person_id for lineage in lineages for person_id in lineage.person_ids
+        )
+        return [lineage_chain(lineage, people) for lineage in lineages]
+
+
+def _read_person(handle: IO[bytes], person_id: str) -> Person:
+    person = Person(id=person_id, name=person_id)
+    handle.readline()  # the "0 @ID@ INDI" line
+    event: Optional[str] = None
+    event_fields: Dict[str, str] = {}
+
+    def close_event() -> None:
+        if event is None:
+            return
+        event_date, precision = parse_gedcom_date(event_fields.get("DATE", ""))
+        country = place_country(event_fields.get("PLAC", ""))
+        # Imprecise dates keep their original text and precision for review; they
+        # are still evaluated as their first day.
+        imprecise = "DATE" in event_fields and precision != "day"
+        if event == "BIRT":
+            person.birth_date = event_date
+            person.birth_country = country
+            if imprecise:
+                person.notes["gedcom_birth_date"] = event_fields["DATE"]
+                if precision is not None:
+                    person.notes[BIRTH_DATE_PRECISION] = precision
+        else:
+            metadata = {}
+            if imprecise:
+                metadata["gedcom_date"] = event_fields["DATE"]
+                if precision is not None:
+                    metadata[DATE_PRECISION] = precision
+            person.events.append(
+                CitizenshipEvent(
+                    kind="naturalization_foreign",
+                    date=event_date,
+                    country=country,
+                    metadata=metadata,
+                )
+            )
+
+    for raw_line in handle:
+        parts = raw_line.decode("utf-8", "replace").split(None, 2)
+        if not parts:
+            continue
+        level = parts[0]
+        if level == "0":
+            break
+        tag = parts[1] if len(parts) > 1 else ""
+        value = parts[2].strip() if len(parts) > 2 else ""
+        if level == "1":
+            close_event()
+            event, event_fields = (tag, {}) if tag in ("BIRT", "NATU") else (None, {})
+            if tag == "NAME" and value and person.name == person_id:
+                person.name = " ".join(value.replace("/", " ").split()) or person_id
+        elif level == "2" and event is not None and tag in ("DATE", "PLAC"):
+            event_fields[tag] = value
+    close_event()
+    return person
+
+
+def lineage_chain(lineage: GedcomLineage, people: Dict[str, Person]) -> List[LineageLink]:
+    ids = lineage.person_ids
+    return [
+        LineageLink(
+            parent=people[ids[index]], child=people[ids[index + 1]], relationship=relationship
+        )
+        for index, relationship in enumerate(lineage.relationships)
+    ]
+
+
+def _person_payload(person: Person) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {"id": person.id, "name": person.name}
+    if person.birth_date is not None:
+        payload["birth_date"] = person.birth_date.isoformat()
+    if person.birth_country is not None:
+        payload["birth_country"] = person.birth_country
+    events = []
+    for event in person.events:
+        encoded: Dict[str, Any] = {"kind": event.kind}
+        if event.date is not None:
+            encoded["date"] = event.date.isoformat()
+        if event.country is not None:
+            encoded["country"] = event.country
+        if event.metadata:
+            encoded["metadata"] = event.metadata
+        events.append(encoded)
+    if events:
+        payload["events"] = events
+    if person.notes:
+        payload["notes"] = person.notes
+    return payload
+
+
+def lineage_payload(chain: List[LineageLink]) -> Dict[str, Any]:
+    """The ``/api/evaluate/`` request body for a lineage chain."""
+    return {
+        "applicant": _person_payload(chain[-1].child),
+        "ancestors": [_person_payload(link.parent) for link in chain],
+        "lineage_links": [
+            {
+                "parent_id": link.parent.id,
+                "child_id": link.child.id,
+                "relationship": link.relationship,
+            }
+            for link in chain
+        ],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Extract and evaluate lineages from a GEDCOM file."
+    )
+    parser.add_argument("input", help="GEDCOM file")
+    parser.add_argument("--applicant", required=True, help="GEDCOM id of the applicant, e.g. I123")
+    parser.add_argument("--max-generations", type=int, default=MAX_GENERATIONS)
+    parser.add_argument(
+        "--payloads", action="store_true", help="write request payloads instead of evaluating"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        index = GedcomIndex(args.input)
+        chains = index.lineage_chains(args.applicant, max_generations=args.max_generations)
+    except GedcomError as exc:
+        parser.exit(1, f"{exc}\n")
+    for chain in chains:
+        if args.payloads:
+            line = lineage_payload(chain)
+        else:
+            path = [chain[0].parent.id] + [link.child.id for link in chain]
+            line = {"path": path, "result": evaluate_lineage(chain).to_payload()}
+        sys.stdout.write(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n")
+    print(
+        f"{len(index.offsets)} individuals, {len(chains)} lineage(s) to Italian-born ancestors",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Per-stage request timing.
+
+A request is timed by starting a ``StageTimer`` with ``start_timer``; code on the
+request path wraps each stage in ``with stage("name"):``. The timer lives in a
+context variable, so when no timer is active ``stage`` costs one lookup and
+returns a shared no-op context manager. Repeated stages (for example one
+evaluation per batch item) add up.
+
+Finished timers are folded into ``STAGE_METRICS``, a set of cumulative histograms
+rendered in the Prometheus text exposition format.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Tuple
+
+
+# Upper bounds in seconds, from 100µs to 2.5s.
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+
+class StageTimer:
+    """Accumulated monotonic-clock durations, in seconds, by stage name."""
+
+    __slots__ = ("durations",)
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """The durations as a ``Server-Timing`` header value, in milliseconds."""
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.durations.items()
+        )
+
+
+_TIMER: ContextVar[Optional[StageTimer]] = ContextVar("stage_timer", default=None)
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "started")
+
+    def __init__(self, timer: StageTimer, name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.timer.record(self.name, time.perf_counter() - self.started)
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name: str):
+    """Context manager timing ``name`` on the active timer, if there is one."""
+    timer = _TIMER.get()
+    if timer is None:
+        return _NO_STAGE
+    return _Stage(timer, name)
+
+
+def current_timer() -> Optional[StageTimer]:
+    return _TIMER.get()
+
+
+def start_timer() -> Tuple[StageTimer, Token]:
+    timer = StageTimer()
+    return timer, _TIMER.set(timer)
+
+
+def stop_timer(token: Token) -> None:
+    _TIMER.reset(token)
+
+
+class StageHistograms:
+    """Thread-safe cumulative latency histograms, one per stage."""
+
+    def __init__(self, name: str = "evaluation_stage_duration_seconds", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, timer: StageTimer) -> None:
+        with self._lock:
+            for name, seconds in timer.durations.items():
+                counts = self._counts.get(name)
+                if counts is None:
+                    counts = self._counts[name] = [0] * (len(self.buckets) + 1)
+                    self._sums[name] = 0.0
+                counts[bisect.bisect_left(self.buckets, seconds)] += 1
+                self._sums[name] += seconds
+
+    def render(self) -> str:
+        """Prometheus text exposition (version 0.0.4) of every histogram."""
+        lines = [
+            f"# HELP {self.name} Time spent in each request stage.",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for name in sorted(self._counts):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (None,), self._counts[name]):
+                    cumulative += count
+                    le = "+Inf" if bound is None else repr(bound)
+                    lines.append(f'{self.name}_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{self.name}_sum{{stage="{name}"}} {self._sums[name]!r}')
+                lines.append(f'{self.name}_count{{stage="{name}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+
+STAGE_METRICS = StageHistograms()
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "STAGE_METRICS",
+    "StageHistograms",
+    "StageTimer",
+    "current_timer",
+    "stage",
+    "start_timer",
+    "stop_timer",
+]
@@ -48,7 +48,7 @@ class CourtViability(str, Enum):
     HIGH = "HIGH"
 
 
-@dataclass
+@dataclass(slots=True)
 class CitizenshipEvent:
     kind: str
     date: Optional[date] = None
@@ -56,7 +56,7 @@ class CitizenshipEvent:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Person:
     id: str
     name: str
@@ -68,7 +68,7 @@ class Person:
     notes: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class LineageLink:
     parent: Person
     child: Person
@@ -77,16 +77,26 @@ class LineageLink:
     notes: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RuleOutcome:
+    # Immutable so one instance per rule can be shared by every result it fires in.
     rule_id: str
     status: TransmissionStatus
     notes: str
     confidence: Confidence = Confidence.MEDIUM
     needs_lawyer: bool = False
 
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            "rule_id": self.rule_id,
+            "status": self.status.value,
+            "notes": self.notes,
+            "confidence": self.confidence.value,
+            "needs_lawyer": self.needs_lawyer,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class EvaluationResult:
     lineage: List[LineageLink]
     overall_status: OverallStatus
@@ -96,9 +106,23 @@ class EvaluationResult:
     acquisition_mode: AcquisitionMode
     explanations: List[str] = field(default_factory=list)
     rule_outcomes: List[RuleOutcome] = field(default_factory=list)
-
-
-@dataclass
+    rule_set_version: Optional[str] = None
+
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON-ready representation of the result, as returned by the API."""
+        return {
+            "overall_status": self.overall_status.value,
+            "confidence": self.confidence.value,
+            "court_viability": self.court_viability.value,
+            "needs_lawyer": self.needs_lawyer,
+            "acquisition_mode": self.acquisition_mode.value,
+            "explanations": self.explanations,
+            "rule_outcomes": [outcome.to_payload() for outcome in self.rule_outcomes],
+            "rule_set_version": self.rule_set_version,
+        }
+
+
+@dataclass(slots=True)
 class Rule:
     id: str
     description: str
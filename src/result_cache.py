@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.models import (
+    AcquisitionMode,
+    Confidence,
+    CourtViability,
+    EvaluationResult,
+    LineageLink,
+    OverallStatus,
+    Person,
+    RuleOutcome,
+    TransmissionStatus,
+)
+
+
+def _person_key(person: Person) -> Dict[str, Any]:
+    return {
+        "id": person.id,
+        "name": person.name,
+        "birth_date": person.birth_date,
+        "birth_country": person.birth_country,
+        "other_citizenships_at_birth": person.other_citizenships_at_birth,
+        "events": [
+            {"kind": event.kind, "date": event.date, "country": event.country, "metadata": event.metadata}
+            for event in person.events
+        ],
+        "acquisition_mode": person.acquisition_mode.value,
+        "notes": person.notes,
+    }
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return repr(value)
+
+
+def lineage_fingerprint(
+    lineage_chain: List[LineageLink], process_context: Dict[str, Any], rule_set_version: str
+) -> str:
+    """Canonical content hash of an evaluation's inputs.
+
+    Two requests with equal people, events, links and process context hash the same
+    regardless of dict key order or object identity. ``parent_citizenship_status_at_birth``
+    is excluded because it is an output written by feature extraction.
+    """
+    canonical = {
+        "rules": rule_set_version,
+        "context": process_context,
+        "links": [
+            {
+                "parent": _person_key(link.parent),
+                "child": _person_key(link.child),
+                "relationship": link.relationship,
+                "notes": link.notes,
+            }
+            for link in lineage_chain
+        ],
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedEvaluation:
+    """The lineage-independent part of an ``EvaluationResult``."""
+
+    overall_status: OverallStatus
+    confidence: Confidence
+    court_viability: CourtViability
+    needs_lawyer: bool
+    acquisition_mode: AcquisitionMode
+    explanations: Tuple[str, ...]
+    rule_outcomes: Tuple[RuleOutcome, ...]
+    link_statuses: Tuple[TransmissionStatus, ...]
+    rule_set_version: Optional[str] = None
+
+    @classmethod
+    def from_result(cls, result: EvaluationResult) -> "CachedEvaluation":
+        return cls(
+            overall_status=result.overall_status,
+            confidence=result.confidence,
+            court_viability=result.court_viability,
+            needs_lawyer=result.needs_lawyer,
+            acquisition_mode=result.acquisition_mode,
+            explanations=tuple(result.explanations),
+            rule_outcomes=tuple(result.rule_outcomes),
+            link_statuses=tuple(link.parent_citizenship_status_at_birth for link in result.lineage),
+            rule_set_version=result.rule_set_version,
+        )
+
+    def to_result(self, lineage_chain: List[LineageLink]) -> EvaluationResult:
+        # Replay the link annotations feature extraction would have written.
+        for link, status in zip(lineage_chain, self.link_statuses):
+            if status != TransmissionStatus.INTACT:
+                link.parent_citizenship_status_at_birth = status
+        return EvaluationResult(
+            lineage=lineage_chain,
+            overall_status=self.overall_status,
+            confidence=self.confidence,
+            court_viability=self.court_viability,
+            needs_lawyer=self.needs_lawyer,
+            acquisition_mode=self.acquisition_mode,
+            explanations=list(self.explanations),
+            rule_outcomes=list(self.rule_outcomes),
+            rule_set_version=self.rule_set_version,
+        )
+
+
+class ResultCache:
+    """Bounded, thread-safe LRU cache of evaluations with a per-entry time to live.
+
+    Keys are ``lineage_fingerprint`` digests, which already include the rule-set
+    version. The cache also remembers the last version it saw and drops every entry
+    when a different one arrives, so reloaded rules free memory immediately.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, CachedEvaluation]]" = OrderedDict()
+        self._rule_set_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, rule_set_version: str) -> None:
+        if rule_set_version != self._rule_set_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._rule_set_version = rule_set_version
+
+    def get(self, key: str, rule_set_version: str) -> Optional[CachedEvaluation]:
+        with self._lock:
+            self._check_version(rule_set_version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, rule_set_version: str, value: CachedEvaluation) -> None:
+        with self._lock:
+            self._check_version(rule_set_version)
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+RESULT_CACHE = ResultCache()
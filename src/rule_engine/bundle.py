@@ -0,0 +1,110 @@
+"""Precompiled rule bundles.
+
+A bundle holds every rule from a list of rule files in one ``marshal`` blob, with
+the SHA-256 of each source file and the rule-set version computed the same way as
+``RuleLoader.fingerprint``. Build one after editing rules::
+
+    python -m src.rule_engine.bundle -o rules/rules.bundle
+
+At startup ``load_bundle`` unmarshals it instead of parsing the JSON sources, and
+returns ``None`` when the bundle is missing, unreadable or was built from files
+whose contents have since changed, so callers fall back to the sources.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import hashlib
+import marshal
+import os
+import sys
+from typing import List, Optional, Sequence, Tuple
+
+from src.models import Rule
+from src.rule_engine.loader import RuleLoader, content_fingerprint
+from src.rule_engine.pipeline import RuleEngine
+
+
+BUNDLE_MAGIC = b"JSRB"
+BUNDLE_FORMAT = 1
+
+_RULE_FIELDS = tuple(field.name for field in dataclasses.fields(Rule))
+
+
+def _read_sources(rule_paths: Sequence[str]) -> List[bytes]:
+    contents = []
+    for path in rule_paths:
+        with open(path, "rb") as handle:
+            contents.append(handle.read())
+    return contents
+
+
+def build_bundle(rule_paths: Sequence[str], bundle_path: str) -> str:
+    """Compile ``rule_paths`` into ``bundle_path`` and return the rule-set version.
+
+    Rules are loaded into a ``RuleEngine`` first, so conditions that do not compile
+    and effects with unknown statuses fail the build rather than a later request.
+    """
+    contents = _read_sources(rule_paths)
+    rules = RuleLoader(list(rule_paths)).load()
+    RuleEngine(rules)
+    version = content_fingerprint(contents)
+    payload = {
+        "format": BUNDLE_FORMAT,
+        "version": version,
+        "sources": [hashlib.sha256(content).hexdigest() for content in contents],
+        "rules": [{name: getattr(rule, name) for name in _RULE_FIELDS} for rule in rules],
+    }
+    temporary = f"{bundle_path}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(BUNDLE_MAGIC)
+        marshal.dump(payload, handle)
+    # Readers only ever see the previous bundle or the complete new one.
+    os.replace(temporary, bundle_path)
+    return version
+
+
+def load_bundle(bundle_path: str, rule_paths: Sequence[str]) -> Optional[Tuple[List[Rule], str]]:
+    """Rules and version from ``bundle_path``, or ``None`` if it does not match ``rule_paths``."""
+    try:
+        with open(bundle_path, "rb") as handle:
+            data = handle.read()
+    except FileNotFoundError:
+        return None
+    if not data.startswith(BUNDLE_MAGIC):
+        return None
+    try:
+        payload = marshal.loads(data[len(BUNDLE_MAGIC):])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != BUNDLE_FORMAT:
+        return None
+
+    digests = [hashlib.sha256(content).hexdigest() for content in _read_sources(rule_paths)]
+    if digests != payload.get("sources"):
+        return None
+    version = payload.get("version")
+    try:
+        rules = [Rule(**record) for record in payload["rules"]]
+    except (KeyError, TypeError):
+        return None
+    if not isinstance(version, str):
+        return None
+    return rules, version
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.evaluator import DEFAULT_BUNDLE_PATH, DEFAULT_RULE_PATHS
+
+    parser = argparse.ArgumentParser(description="Compile rule files into a bundle.")
+    parser.add_argument("rules", nargs="*", default=DEFAULT_RULE_PATHS, help="rule files to bundle")
+    parser.add_argument("-o", "--output", default=DEFAULT_BUNDLE_PATH, help="bundle file to write")
+    args = parser.parse_args(argv)
+
+    version = build_bundle(args.rules, args.output)
+    print(f"Wrote {args.output} (rule set {version})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,81 +1,165 @@
 from __future__ import annotations
 
+import sys
+from dataclasses import dataclass
 from datetime import date
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional
 
-from src.models import LineageLink, TransmissionStatus, Person, CitizenshipEvent
+from src.models import CitizenshipEvent, LineageLink, Person, TransmissionStatus
 
 
 POST_REFORM_EFFECTIVE_DATE = date(2024, 12, 23)
-
-
-def _find_event(person: Person, kind: str) -> CitizenshipEvent | None:
-    return next((event for event in person.events if event.kind == kind), None)
+MATERNAL_TRANSMISSION_DATE = date(1948, 1, 1)
+
+ITALY = "IT"
+
+# Spellings of Italy seen in civil records and user input, keyed by normalized form.
+COUNTRY_ALIASES = {
+    "italy": ITALY,
+    "italia": ITALY,
+    "it": ITALY,
+    "ita": ITALY,
+    "regno d'italia": ITALY,
+    "kingdom of italy": ITALY,
+    "repubblica italiana": ITALY,
+    "italian republic": ITALY,
+}
+
+# Boolean flags raised by individual links; a chain has a flag if any link raises it.
+LINK_FLAGS = (
+    "has_pre1948_maternal_link",
+    "has_minor_issue_block",
+    "has_minor_issue_edge",
+    "has_automatic_loss_marriage",
+    "tajani_non_exempt",
+    "tajani_exempt",
+    "alternative_path_by_residence",
+    "has_italian_birth_anchor",
+)
+
+
+@lru_cache(maxsize=1024)
+def normalize_country(name: Optional[str]) -> Optional[str]:
+    """Interned country code for ``name``: ``"IT"`` for any alias of Italy, else the upper-cased name."""
+    if name is None:
+        return None
+    key = " ".join(name.replace("’", "'").split()).lower()
+    if not key:
+        return None
+    return sys.intern(COUNTRY_ALIASES.get(key, key.upper()))
+
+
+@dataclass(slots=True)
+class PersonFacts:
+    """Everything feature extraction needs from one person, computed once per person."""
+
+    country: Optional[str]
+    born_pre1948: bool
+    born_post_reform: bool
+    naturalization: Optional[CitizenshipEvent]
+    has_marriage_loss: bool
+
+
+def person_facts(person: Person) -> PersonFacts:
+    # One scan over the events finds every kind the link flags use; the first
+    # naturalization wins, as it did when each link searched the list itself.
+    naturalization = None
+    has_marriage_loss = False
+    for event in person.events:
+        kind = event.kind
+        if kind == "naturalization_foreign":
+            if naturalization is None:
+                naturalization = event
+        elif kind == "automatic_loss_by_marriage":
+            has_marriage_loss = True
+    birth_date = person.birth_date
+    return PersonFacts(
+        country=normalize_country(person.birth_country),
+        born_pre1948=birth_date is not None and birth_date < MATERNAL_TRANSMISSION_DATE,
+        born_post_reform=birth_date is not None and birth_date >= POST_REFORM_EFFECTIVE_DATE,
+        naturalization=naturalization,
+        has_marriage_loss=has_marriage_loss,
+    )
+
+
+def apply_link_features(
+    link: LineageLink, parent: PersonFacts, child: PersonFacts, flags: Dict
+) -> bool:
+    """Set the flags one link raises to ``True`` in ``flags``.
+
+    Returns whether the parent naturalized before the child's birth. Depends only
+    on the link and its two people, so callers may record the flags of a link in
+    an empty dict and reuse them across chains that share it.
+    """
+    child_birth = link.child.birth_date
+
+    # At least one person in the chain must be born in Italy for jure sanguinis.
+    if parent.country == ITALY or child.country == ITALY:
+        flags["has_italian_birth_anchor"] = True
+    # 1948 maternal rule
+    if child.born_pre1948 and link.relationship.lower().startswith("mother"):
+        flags["has_pre1948_maternal_link"] = True
+
+    # naturalization timing and minor issue detection
+    broken = False
+    naturalization = parent.naturalization
+    if naturalization and child_birth and naturalization.date:
+        broken = naturalization.date < child_birth
+        age_at_nat = (naturalization.date - child_birth).days / 365.25
+        if age_at_nat < 18:
+            co_resident = naturalization.metadata.get("co_resident_child", True)
+            emancipated = naturalization.metadata.get("child_emancipated", False)
+            jus_soli_country = naturalization.metadata.get("jus_soli_country", False)
+            if co_resident and jus_soli_country and not emancipated:
+                flags["has_minor_issue_block"] = True
+            elif not co_resident or emancipated:
+                flags["has_minor_issue_edge"] = True
+
+    # automatic loss by marriage
+    if parent.has_marriage_loss:
+        flags["has_automatic_loss_marriage"] = True
+
+    # Tajani-style reforms
+    if child.born_post_reform and link.child.other_citizenships_at_birth:
+        if not link.child.notes.get("tajani_exemption", False):
+            flags["tajani_non_exempt"] = True
+        else:
+            flags["tajani_exempt"] = True
+
+    # Residence-based alternative path
+    if link.child.notes.get("resident_in_italy_as_descendant", False):
+        flags["alternative_path_by_residence"] = True
+
+    return broken
+
+
+def default_feature_flags() -> Dict:
+    flags: Dict = dict.fromkeys(LINK_FLAGS, False)
+    flags["parent_citizenship_status"] = TransmissionStatus.INTACT.value
+    return flags
 
 
 def build_feature_flags(lineage_chain: List[LineageLink]) -> Dict:
-    flags = {
-        "has_pre1948_maternal_link": False,
-        "has_minor_issue_block": False,
-        "has_minor_issue_edge": False,
-        "has_automatic_loss_marriage": False,
-        "tajani_non_exempt": False,
-        "tajani_exempt": False,
-        "alternative_path_by_residence": False,
-        "parent_citizenship_status": TransmissionStatus.INTACT.value,
-        "has_italian_birth_anchor": False,
-    }
+    """Chain-level flags from a single pass over the links.
+
+    Each person's facts are computed once, even though everyone but the applicant
+    and the oldest ancestor is the child of one link and the parent of the next.
+    Links whose parent naturalized before the child's birth are marked
+    ``BROKEN_NATURALIZATION``.
+    """
+    flags = default_feature_flags()
+    previous_child = None
+    child = None
 
     for link in lineage_chain:
-        parent = link.parent
-        child = link.child
-
-        # At least one person in the chain must be born in Italy for jure sanguinis.
-        for person in (parent, child):
-            birth_country = (person.birth_country or "").strip().lower()
-            if birth_country == "italy":
-                flags["has_italian_birth_anchor"] = True
-        # 1948 maternal rule
-        if link.relationship.lower().startswith("mother"):
-            if child.birth_date and child.birth_date < date(1948, 1, 1):
-                flags["has_pre1948_maternal_link"] = True
-
-        # naturalization timing
-        naturalization = _find_event(parent, "naturalization_foreign")
-        if naturalization and child.birth_date and naturalization.date:
-            if naturalization.date < child.birth_date:
-                link.parent_citizenship_status_at_birth = TransmissionStatus.BROKEN_NATURALIZATION
-                flags["parent_citizenship_status"] = (
-                    TransmissionStatus.BROKEN_NATURALIZATION.value
-                )
-
-        # minor issue detection
-        if naturalization and child.birth_date and naturalization.date:
-            age_at_nat = (naturalization.date - child.birth_date).days / 365.25
-            if age_at_nat < 18:
-                co_resident = naturalization.metadata.get("co_resident_child", True)
-                emancipated = naturalization.metadata.get("child_emancipated", False)
-                jus_soli_country = naturalization.metadata.get("jus_soli_country", False)
-                if co_resident and jus_soli_country and not emancipated:
-                    flags["has_minor_issue_block"] = True
-                elif not co_resident or emancipated:
-                    flags["has_minor_issue_edge"] = True
-
-        # automatic loss by marriage
-        marriage_loss = _find_event(parent, "automatic_loss_by_marriage")
-        if marriage_loss:
-            flags["has_automatic_loss_marriage"] = True
-
-        # Tajani-style reforms
-        if child.birth_date and child.birth_date >= POST_REFORM_EFFECTIVE_DATE:
-            if child.other_citizenships_at_birth:
-                if not child.notes.get("tajani_exemption", False):
-                    flags["tajani_non_exempt"] = True
-                else:
-                    flags["tajani_exempt"] = True
-
-        # Residence-based alternative path
-        if child.notes.get("resident_in_italy_as_descendant", False):
-            flags["alternative_path_by_residence"] = True
+        # In a chain the parent of each link is the child of the one before it.
+        parent = child if link.parent is previous_child else person_facts(link.parent)
+        child = person_facts(link.child)
+        previous_child = link.child
+
+        if apply_link_features(link, parent, child, flags):
+            link.parent_citizenship_status_at_birth = TransmissionStatus.BROKEN_NATURALIZATION
+            flags["parent_citizenship_status"] = TransmissionStatus.BROKEN_NATURALIZATION.value
 
     return flags
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable
+import operator
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Set, Tuple
 
 
 class JsonLogicEvaluator:
@@ -66,3 +67,238 @@ class JsonLogicEvaluator:
         a, b = list(args)
         return self.evaluate(a) <= self.evaluate(b)
 
+
+
+Compiled = Callable[[Dict[str, Any]], Any]
+
+_NOT_CONSTANT = object()
+
+
+class _Node:
+    """A compiled sub-expression: either a folded constant or a closure over the context."""
+
+    __slots__ = ("fn", "constant", "var_key")
+
+    def __init__(
+        self,
+        fn: Compiled | None = None,
+        constant: Any = _NOT_CONSTANT,
+        var_key: Any = _NOT_CONSTANT,
+    ):
+        self.fn = fn
+        self.constant = constant
+        self.var_key = var_key
+
+    @property
+    def is_constant(self) -> bool:
+        return self.constant is not _NOT_CONSTANT
+
+    def as_function(self) -> Compiled:
+        if self.is_constant:
+            value = self.constant
+            return lambda context: value
+        return self.fn
+
+
+def compile_expression(expr: Any) -> Compiled:
+    """Compile a JSON-logic expression into a closure taking the flattened context.
+
+    The returned callable produces the same result as ``JsonLogicEvaluator(context).evaluate(expr)``.
+    Operators and arities are checked once here instead of on every evaluation, ``var``
+    nodes become direct dictionary lookups and sub-trees without variables are folded
+    into constants.
+    """
+    return _compile(expr).as_function()
+
+
+def _compile(expr: Any) -> _Node:
+    if isinstance(expr, (int, float, str, bool)) or expr is None:
+        return _Node(constant=expr)
+    if isinstance(expr, list):
+        return _compile_list(expr)
+    if isinstance(expr, dict):
+        if len(expr) != 1:
+            raise ValueError(f"Invalid expression {expr}")
+        op, value = next(iter(expr.items()))
+        compiler = _OPERATORS.get(op)
+        if not compiler:
+            raise ValueError(f"Unsupported operator {op}")
+        return compiler(value)
+    raise ValueError(f"Unsupported expression type: {type(expr)}")
+
+
+def _fold(fn: Compiled, nodes: List[_Node]) -> _Node:
+    """Evaluate ``fn`` once when every input is constant; errors are left for runtime."""
+    if all(node.is_constant for node in nodes):
+        try:
+            return _Node(constant=fn({}))
+        except Exception:
+            pass
+    return _Node(fn=fn)
+
+
+def _compile_list(items: List[Any]) -> _Node:
+    nodes = [_compile(item) for item in items]
+    fns = [node.as_function() for node in nodes]
+
+    def evaluate_list(context):
+        return [fn(context) for fn in fns]
+
+    return _fold(evaluate_list, nodes)
+
+
+def _compile_var(key: Any) -> _Node:
+    return _Node(fn=lambda context: context.get(key), var_key=key)
+
+
+def _compile_and(args: Iterable[Any]) -> _Node:
+    return _compile_short_circuit(args, stop_on=False)
+
+
+def _compile_or(args: Iterable[Any]) -> _Node:
+    return _compile_short_circuit(args, stop_on=True)
+
+
+def _compile_short_circuit(args: Iterable[Any], stop_on: bool) -> _Node:
+    """Compile ``and`` (stop on a falsy argument) or ``or`` (stop on a truthy argument)."""
+    fns: List[Compiled] = []
+    exhausted_result = not stop_on
+    for node in (_compile(arg) for arg in args):
+        if node.is_constant:
+            if bool(node.constant) == stop_on:
+                # Arguments after this constant are never reached.
+                exhausted_result = stop_on
+                break
+            continue
+        fns.append(node.fn)
+
+    if not fns:
+        return _Node(constant=exhausted_result)
+
+    if len(fns) == 1:
+        (only,) = fns
+        if stop_on:
+            return _Node(fn=lambda context: bool(only(context)) or exhausted_result)
+        return _Node(fn=lambda context: bool(only(context)) and exhausted_result)
+
+    def short_circuit(context):
+        for fn in fns:
+            if bool(fn(context)) == stop_on:
+                return stop_on
+        return exhausted_result
+
+    return _Node(fn=short_circuit)
+
+
+def _compile_not(arg: Any) -> _Node:
+    node = _compile(arg)
+    if node.is_constant:
+        return _Node(constant=not node.constant)
+    fn = node.fn
+    return _Node(fn=lambda context: not fn(context))
+
+
+def _binary_operands(args: Iterable[Any]) -> Tuple[_Node, _Node]:
+    a, b = list(args)
+    return _compile(a), _compile(b)
+
+
+def _compile_in(args: Iterable[Any]) -> _Node:
+    haystack_node, needle_node = _binary_operands(args)
+    haystack_fn = haystack_node.as_function()
+    needle_fn = needle_node.as_function()
+
+    def op_in(context):
+        haystack = haystack_fn(context)
+        needle = needle_fn(context)
+        return haystack is not None and needle in haystack
+
+    return _fold(op_in, [haystack_node, needle_node])
+
+
+def _comparison(compare: Callable[[Any, Any], bool]) -> Callable[[Iterable[Any]], _Node]:
+    def compile_comparison(args: Iterable[Any]) -> _Node:
+        left, right = _binary_operands(args)
+        left_fn = left.as_function()
+        right_fn = right.as_function()
+
+        if right.is_constant and left.var_key is not _NOT_CONSTANT:
+            # The dominant rule shape: {"eq": [{"var": name}, constant]}.
+            key = left.var_key
+            value = right.constant
+            return _Node(fn=lambda context: compare(context.get(key), value))
+        if right.is_constant and not left.is_constant:
+            value = right.constant
+            return _Node(fn=lambda context: compare(left_fn(context), value))
+
+        return _fold(lambda context: compare(left_fn(context), right_fn(context)), [left, right])
+
+    return compile_comparison
+
+
+_OPERATORS: Dict[str, Callable[[Any], _Node]] = {
+    "var": _compile_var,
+    "and": _compile_and,
+    "or": _compile_or,
+    "not": _compile_not,
+    "in": _compile_in,
+    "eq": _comparison(operator.eq),
+    "neq": _comparison(operator.ne),
+    "gt": _comparison(operator.gt),
+    "gte": _comparison(operator.ge),
+    "lt": _comparison(operator.lt),
+    "lte": _comparison(operator.le),
+}
+
+
+def guard_variables(expr: Any) -> FrozenSet[str]:
+    """Return variables that must all be truthy in the context for ``expr`` to be truthy.
+
+    The analysis is conservative: an empty set means the expression may hold
+    regardless of the context, never that it cannot hold.
+    """
+    if not isinstance(expr, dict) or len(expr) != 1:
+        return frozenset()
+    op, value = next(iter(expr.items()))
+    if op == "var":
+        return frozenset([value]) if isinstance(value, str) else frozenset()
+    if op == "eq" and isinstance(value, list) and len(value) == 2:
+        for candidate, other in (value, value[::-1]):
+            if _is_var_expression(candidate) and _is_truthy_scalar(other):
+                return frozenset([candidate["var"]])
+        return frozenset()
+    if op == "and" and isinstance(value, list):
+        guards: Set[str] = set()
+        for arg in value:
+            guards |= guard_variables(arg)
+        return frozenset(guards)
+    if op == "or" and isinstance(value, list) and value:
+        shared = set(guard_variables(value[0]))
+        for arg in value[1:]:
+            shared &= guard_variables(arg)
+        return frozenset(shared)
+    return frozenset()
+
+
+def condition_variables(expr: Any) -> FrozenSet[str]:
+    """Return every context variable ``expr`` reads."""
+    if isinstance(expr, list):
+        names: Set[str] = set()
+        for item in expr:
+            names |= condition_variables(item)
+        return frozenset(names)
+    if not isinstance(expr, dict) or len(expr) != 1:
+        return frozenset()
+    op, value = next(iter(expr.items()))
+    if op == "var":
+        return frozenset([value]) if isinstance(value, str) else frozenset()
+    return condition_variables(value if isinstance(value, list) else [value])
+
+
+def _is_var_expression(expr: Any) -> bool:
+    return isinstance(expr, dict) and len(expr) == 1 and isinstance(expr.get("var"), str)
+
+
+def _is_truthy_scalar(value: Any) -> bool:
+    # A falsy JSON value (None, False, 0, "", [] or {}) never equals a truthy scalar.
+    return isinstance(value, (bool, int, float, str)) and bool(value)
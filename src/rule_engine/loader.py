@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 from src.models import Rule
 
 
+def content_fingerprint(contents: Iterable[bytes]) -> str:
+    """Hash of rule file contents in order; identical files always give the same version."""
+    digest = hashlib.sha256()
+    for content in contents:
+        digest.update(len(content).to_bytes(8, "big"))
+        digest.update(content)
+    return digest.hexdigest()
+
+
 class RuleLoader:
     def __init__(self, rule_paths: List[str]):
         self.rule_paths = rule_paths
@@ -29,3 +39,11 @@ class RuleLoader:
                     )
                 )
         return rules
+
+    def fingerprint(self) -> str:
+        """Content hash of the rule files, used as the rule-set version."""
+        contents = []
+        for path in self.rule_paths:
+            with open(path, "rb") as handle:
+                contents.append(handle.read())
+        return content_fingerprint(contents)
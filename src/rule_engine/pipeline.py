@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from src.models import (
     AcquisitionMode,
@@ -15,7 +16,30 @@ from src.models import (
     RuleOutcome,
     TransmissionStatus,
 )
-from src.rule_engine.json_logic import JsonLogicEvaluator
+from src.rule_engine.json_logic import compile_expression, condition_variables, guard_variables
+from src.rule_engine.stats import RuleStats
+
+
+# Outcome statuses that override the aggregate status; any other status leaves it as is.
+OVERALL_STATUS_BY_TRANSMISSION = {
+    TransmissionStatus.BLOCKED_REFORM_NO_EXEMPTION: OverallStatus.BLOCKED_REFORM_NO_EXEMPTION,
+    TransmissionStatus.BLOCKED_ADMIN_MINOR_ISSUE: OverallStatus.BLOCKED_ADMIN_MINOR_ISSUE,
+    TransmissionStatus.COURT_ONLY_1948: OverallStatus.COURT_ONLY_1948,
+    TransmissionStatus.ALTERNATIVE_PATH: OverallStatus.POTENTIAL_VIA_RESIDENCE,
+    TransmissionStatus.CONTESTED_EDGE_CASE: OverallStatus.INDETERMINATE_COMPLEX_CASE,
+    TransmissionStatus.BROKEN_NATURALIZATION: OverallStatus.INDETERMINATE_COMPLEX_CASE,
+    TransmissionStatus.NO_ITALIAN_LINEAGE_ANCHOR: OverallStatus.NOT_ELIGIBLE_NO_ITALIAN_LINEAGE,
+}
+
+COURT_VIABLE_STATUSES = (
+    TransmissionStatus.COURT_ONLY_1948,
+    TransmissionStatus.BLOCKED_ADMIN_MINOR_ISSUE,
+    TransmissionStatus.CONTESTED_EDGE_CASE,
+)
+
+NO_OUTCOME_EXPLANATION = (
+    "No blocking rules triggered; defaulting to classical transmission pending document review."
+)
 
 
 @dataclass
@@ -43,11 +67,120 @@ class EvaluationContext:
 
 
 class RuleEngine:
-    def __init__(self, rules: List[Rule]):
-        self.rules = rules
+    def __init__(
+        self, rules: Iterable[Rule], version: str | None = None, record_stats: bool = False
+    ):
+        self.rules = tuple(rules)
+        # Identifies the rule set for caching and audit; None for ad-hoc rule lists.
+        self.version = version
+        self.stats: Optional[RuleStats] = None
+        # A ``TruthTable`` of this engine's results, set by ``RuleSetRegistry``; any
+        # object with a ``lookup(context)`` returning a result or ``None`` will do.
+        self.table = None
+        if record_stats:
+            self.enable_stats()
+        self._conditions = tuple(compile_expression(rule.condition) for rule in self.rules)
+        # Effects do not depend on the context, so each rule's outcome is built once here
+        # and shared by every result it fires in; an invalid status or mode fails when
+        # the rule set loads, not mid-evaluation.
+        self._effects = tuple(
+            (self._apply_effects(rule), self._effect_acquisition_mode(rule)) for rule in self.rules
+        )
+        self._unguarded, self._rule_index = self._build_rule_index(self.rules)
+        self._readers: Dict[str, List[int]] = {}
+        for position, rule in enumerate(self.rules):
+            for name in condition_variables(rule.condition):
+                self._readers.setdefault(name, []).append(position)
+
+    @staticmethod
+    def _build_rule_index(rules: Tuple[Rule, ...]) -> Tuple[Tuple[int, ...], Tuple]:
+        """Index rules by one variable that must be truthy for their condition to hold.
+
+        Rules whose condition has no such guard are always evaluated. The remaining
+        guards of an indexed rule are still checked by its compiled condition.
+        """
+        unguarded: List[int] = []
+        index: Dict[str, List[int]] = {}
+        for position, rule in enumerate(rules):
+            guards = guard_variables(rule.condition)
+            if guards:
+                index.setdefault(min(guards), []).append(position)
+            else:
+                unguarded.append(position)
+        return tuple(unguarded), tuple((name, tuple(positions)) for name, positions in index.items())
+
+    def enable_stats(self) -> RuleStats:
+        """Start recording per-rule counters in ``self.stats``; a no-op if already recording."""
+        if self.stats is None:
+            self.stats = RuleStats([rule.id for rule in self.rules], self.version)
+        return self.stats
+
+    def _candidate_rules(self, flat_context: Dict) -> List[int]:
+        candidates = list(self._unguarded)
+        for name, positions in self._rule_index:
+            if flat_context.get(name):
+                candidates.extend(positions)
+        # Keep file order so last-writer-wins aggregation is unchanged.
+        candidates.sort()
+        return candidates
 
     def evaluate(self, context: EvaluationContext) -> EvaluationResult:
-        evaluator = JsonLogicEvaluator(context.to_dict())
+        # Table lookups skip the rules, so they are bypassed while recording stats.
+        if self.table is not None and self.stats is None:
+            result = self.table.lookup(context)
+            if result is not None:
+                return result
+        flat_context = context.to_dict()
+        return self.aggregate(context, self.fired_rules(context, flat_context))
+
+    def fired_rules(
+        self,
+        context: EvaluationContext,
+        flat_context: Dict,
+        positions: Iterable[int] | None = None,
+    ) -> List[int]:
+        """The rules among ``positions`` whose preconditions and condition hold.
+
+        Without ``positions`` every rule the guard index cannot rule out is checked.
+        """
+        if positions is None:
+            positions = self._candidate_rules(flat_context)
+        if self.stats is not None:
+            return self._recorded_fired_rules(context, flat_context, list(positions))
+        fired = []
+        for position in positions:
+            if not self._preconditions_met(self.rules[position], context):
+                continue
+            if self._conditions[position](flat_context):
+                fired.append(position)
+        return fired
+
+    def _recorded_fired_rules(
+        self, context: EvaluationContext, flat_context: Dict, positions: List[int]
+    ) -> List[int]:
+        clock = time.perf_counter_ns
+        evaluated = []
+        fired = []
+        for position in positions:
+            if not self._preconditions_met(self.rules[position], context):
+                continue
+            started = clock()
+            holds = self._conditions[position](flat_context)
+            evaluated.append((position, clock() - started))
+            if holds:
+                fired.append(position)
+        self.stats.record(positions, evaluated, fired)
+        return fired
+
+    def rules_reading(self, names: Iterable[str]) -> Set[int]:
+        """Positions of the rules whose condition reads any of the context keys ``names``."""
+        affected: Set[int] = set()
+        for name in names:
+            affected.update(self._readers.get(name, ()))
+        return affected
+
+    def aggregate(self, context: EvaluationContext, fired: Iterable[int]) -> EvaluationResult:
+        """Build the result for rules that fired, given as positions in file order."""
         rule_outcomes: List[RuleOutcome] = []
         overall_status = OverallStatus.CLEAR_ADMIN_ELIGIBLE
         acquisition_mode = AcquisitionMode.AUTOMATIC_BY_BLOOD
@@ -55,24 +188,20 @@ class RuleEngine:
         court_viability = CourtViability.NONE
         confidence = Confidence.HIGH
 
-        for rule in self.rules:
-            if not self._preconditions_met(rule, context):
-                continue
-            if evaluator.evaluate(rule.condition):
-                outcome = self._apply_effects(rule)
-                rule_outcomes.append(outcome)
-                # derive aggregate state
-                overall_status = self._update_overall_status(overall_status, outcome.status)
-                acquisition_mode = self._update_acquisition_mode(acquisition_mode, rule.effects)
-                needs_lawyer = needs_lawyer or outcome.needs_lawyer
-                court_viability = self._update_court_viability(court_viability, outcome)
-                confidence = self._update_confidence(confidence, outcome)
+        for position in fired:
+            outcome, effect_mode = self._effects[position]
+            rule_outcomes.append(outcome)
+            # derive aggregate state
+            overall_status = self._update_overall_status(overall_status, outcome.status)
+            if effect_mode is not None:
+                acquisition_mode = effect_mode
+            needs_lawyer = needs_lawyer or outcome.needs_lawyer
+            court_viability = self._update_court_viability(court_viability, outcome)
+            confidence = self._update_confidence(confidence, outcome)
 
         explanations = [f"{o.rule_id}: {o.notes}" for o in rule_outcomes]
         if not rule_outcomes:
-            explanations.append(
-                "No blocking rules triggered; defaulting to classical transmission pending document review."
-            )
+            explanations.append(NO_OUTCOME_EXPLANATION)
 
         return EvaluationResult(
             lineage=context.lineage_chain,
@@ -83,6 +212,7 @@ class RuleEngine:
             acquisition_mode=acquisition_mode,
             explanations=explanations,
             rule_outcomes=rule_outcomes,
+            rule_set_version=self.version,
         )
 
     def _preconditions_met(self, rule: Rule, context: EvaluationContext) -> bool:
@@ -104,34 +234,20 @@ class RuleEngine:
             needs_lawyer=needs_lawyer,
         )
 
+    @staticmethod
+    def _effect_acquisition_mode(rule: Rule) -> AcquisitionMode | None:
+        mode = rule.effects.get("acquisition_mode")
+        return AcquisitionMode(mode) if mode else None
+
     def _update_overall_status(
         self, current: OverallStatus, status: TransmissionStatus
     ) -> OverallStatus:
-        priority = {
-            TransmissionStatus.BLOCKED_REFORM_NO_EXEMPTION: OverallStatus.BLOCKED_REFORM_NO_EXEMPTION,
-            TransmissionStatus.BLOCKED_ADMIN_MINOR_ISSUE: OverallStatus.BLOCKED_ADMIN_MINOR_ISSUE,
-            TransmissionStatus.COURT_ONLY_1948: OverallStatus.COURT_ONLY_1948,
-            TransmissionStatus.ALTERNATIVE_PATH: OverallStatus.POTENTIAL_VIA_RESIDENCE,
-            TransmissionStatus.CONTESTED_EDGE_CASE: OverallStatus.INDETERMINATE_COMPLEX_CASE,
-            TransmissionStatus.BROKEN_NATURALIZATION: OverallStatus.INDETERMINATE_COMPLEX_CASE,
-            TransmissionStatus.NO_ITALIAN_LINEAGE_ANCHOR: OverallStatus.NOT_ELIGIBLE_NO_ITALIAN_LINEAGE,
-        }
-        return priority.get(status, current)
-
-    def _update_acquisition_mode(self, current: AcquisitionMode, effects: Dict) -> AcquisitionMode:
-        mode = effects.get("acquisition_mode")
-        if mode:
-            return AcquisitionMode(mode)
-        return current
+        return OVERALL_STATUS_BY_TRANSMISSION.get(status, current)
 
     def _update_court_viability(
         self, current: CourtViability, outcome: RuleOutcome
     ) -> CourtViability:
-        if outcome.status in (
-            TransmissionStatus.COURT_ONLY_1948,
-            TransmissionStatus.BLOCKED_ADMIN_MINOR_ISSUE,
-            TransmissionStatus.CONTESTED_EDGE_CASE,
-        ):
+        if outcome.status in COURT_VIABLE_STATUSES:
             return CourtViability.HIGH
         return current
 
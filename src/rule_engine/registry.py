@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.rule_engine.bundle import load_bundle
+from src.rule_engine.loader import RuleLoader
+from src.rule_engine.pipeline import RuleEngine
+from src.rule_engine.truth_table import TruthTable
+
+
+FileSignature = Tuple[Tuple[int, int], ...]
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """An immutable snapshot of a loaded rule set and the file state it was built from."""
+
+    paths: Tuple[str, ...]
+    signature: FileSignature
+    engine: RuleEngine
+    bundled: bool = False
+
+
+def _stat_signature(paths: Iterable[str]) -> FileSignature:
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class RuleSetRegistry:
+    """Process-wide cache of compiled rule sets keyed by their resolved file paths.
+
+    Files are stat'ed on every lookup; when any modification time or size changes
+    the rule set is reloaded and the new snapshot replaces the old one in a single
+    dictionary assignment, so concurrent readers always see a complete engine.
+
+    When a ``bundle_path`` is given, rules are read from that precompiled bundle
+    as long as it was built from the current file contents.
+    """
+
+    def __init__(self):
+        self._rule_sets: Dict[Tuple[str, ...], RuleSet] = {}
+        self._lock = threading.Lock()
+        self.record_stats = False
+        self.truth_tables = False
+
+    def enable_stats(self) -> None:
+        """Record per-rule stats on every engine, including ones built by later reloads.
+
+        A reload starts from zero, since its counters describe a different rule set.
+        """
+        with self._lock:
+            self.record_stats = True
+            for rule_set in self._rule_sets.values():
+                rule_set.engine.enable_stats()
+
+    def enable_truth_tables(self) -> None:
+        """Evaluate through a precomputed ``TruthTable`` on every engine, including reloads."""
+        with self._lock:
+            self.truth_tables = True
+            for rule_set in self._rule_sets.values():
+                if rule_set.engine.table is None:
+                    rule_set.engine.table = TruthTable(rule_set.engine)
+
+    def get(self, rule_paths: Iterable[str], bundle_path: Optional[str] = None) -> RuleSet:
+        key = tuple(os.path.realpath(path) for path in rule_paths)
+        signature = _stat_signature(key)
+        current = self._rule_sets.get(key)
+        if current is not None and current.signature == signature:
+            return current
+
+        with self._lock:
+            # Another thread may have reloaded while we were waiting for the lock.
+            current = self._rule_sets.get(key)
+            if current is not None and current.signature == signature:
+                return current
+            bundled = load_bundle(bundle_path, key) if bundle_path else None
+            if bundled is not None:
+                rules, version = bundled
+            else:
+                loader = RuleLoader(list(key))
+                rules, version = loader.load(), loader.fingerprint()
+            engine = RuleEngine(rules, version=version, record_stats=self.record_stats)
+            if self.truth_tables:
+                engine.table = TruthTable(engine)
+            rule_set = RuleSet(
+                paths=key, signature=signature, engine=engine, bundled=bundled is not None
+            )
+            self._rule_sets[key] = rule_set
+            return rule_set
+
+    def get_engine(
+        self, rule_paths: Iterable[str], bundle_path: Optional[str] = None
+    ) -> RuleEngine:
+        return self.get(rule_paths, bundle_path).engine
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rule_sets.clear()
+
+
+RULE_SETS = RuleSetRegistry()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class RuleStats:
+    """Per-rule hit and cost counters of one ``RuleEngine``.
+
+    For every rule, in file order, counts how often it was a candidate (not ruled
+    out by the guard index), how often its preconditions passed and its condition
+    was evaluated, how often it fired, and the total time spent evaluating its
+    condition. ``passes`` counts calls to ``RuleEngine.fired_rules``.
+    """
+
+    def __init__(self, rule_ids: Sequence[str], version: Optional[str] = None):
+        self.rule_ids = tuple(rule_ids)
+        self.version = version
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        size = len(self.rule_ids)
+        with self._lock:
+            self.passes = 0
+            self.candidates = [0] * size
+            self.evaluated = [0] * size
+            self.fired = [0] * size
+            self.nanoseconds = [0] * size
+
+    def record(
+        self,
+        candidates: Iterable[int],
+        evaluated: Iterable[Tuple[int, int]],
+        fired: Iterable[int],
+    ) -> None:
+        """Add one pass: candidate positions, ``(position, ns)`` evaluations and fired positions."""
+        with self._lock:
+            self.passes += 1
+            for position in candidates:
+                self.candidates[position] += 1
+            for position, nanoseconds in evaluated:
+                self.evaluated[position] += 1
+                self.nanoseconds[position] += nanoseconds
+            for position in fired:
+                self.fired[position] += 1
+
+    def merge(self, payload: Dict) -> None:
+        """Add the counters of a ``to_payload`` dump, e.g. from another process."""
+        positions = {rule_id: position for position, rule_id in enumerate(self.rule_ids)}
+        with self._lock:
+            self.passes += payload["passes"]
+            for entry in payload["rules"]:
+                position = positions[entry["rule_id"]]
+                self.candidates[position] += entry["candidates"]
+                self.evaluated[position] += entry["evaluated"]
+                self.fired[position] += entry["fired"]
+                self.nanoseconds[position] += round(entry["total_us"] * 1000)
+
+    def to_payload(self) -> Dict:
+        with self._lock:
+            rules: List[Dict] = []
+            for position, rule_id in enumerate(self.rule_ids):
+                evaluated = self.evaluated[position]
+                total_us = self.nanoseconds[position] / 1000
+                rules.append(
+                    {
+                        "rule_id": rule_id,
+                        "candidates": self.candidates[position],
+                        "evaluated": evaluated,
+                        "fired": self.fired[position],
+                        "fire_rate": round(self.fired[position] / evaluated, 4) if evaluated else None,
+                        "total_us": round(total_us, 3),
+                        "mean_us": round(total_us / evaluated, 3) if evaluated else None,
+                    }
+                )
+            return {"rule_set_version": self.version, "passes": self.passes, "rules": rules}
+
+
+__all__ = ["RuleStats"]
@@ -0,0 +1,201 @@
+"""Precomputed outcome tables over the enumerable part of the feature space.
+
+Feature extraction reduces a lineage to a handful of booleans (``LINK_FLAGS``) and
+``parent_citizenship_status``, which only ever holds ``INTACT`` or
+``BROKEN_NATURALIZATION``. A ``TruthTable`` enumerates every combination of the
+variables the rule conditions read, together with whether the chain is empty (the
+``needs_lineage`` precondition), and stores the aggregate result of each one, so
+evaluating is a tuple build and a dictionary lookup.
+
+Rules that read anything else (``process_type``, ``lineage_length``, birth
+countries, ...) cannot be enumerated. They are evaluated by the engine at lookup
+time and merged with the precomputed fired rules of the row before aggregating.
+Contexts holding a value outside a domain are not in the table and fall back to
+the engine entirely.
+
+The table also serves as an exhaustive coverage report of the rule set::
+
+    python -m src.rule_engine.truth_table -o coverage.json
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.models import EvaluationResult, TransmissionStatus
+from src.result_cache import CachedEvaluation
+from src.rule_engine.features import LINK_FLAGS, default_feature_flags
+from src.rule_engine.json_logic import condition_variables
+from src.rule_engine.pipeline import EvaluationContext, RuleEngine
+
+
+# Every value feature extraction can produce for each enumerable variable.
+FEATURE_DOMAINS: Dict[str, Tuple] = {name: (False, True) for name in LINK_FLAGS}
+FEATURE_DOMAINS["parent_citizenship_status"] = (
+    TransmissionStatus.INTACT.value,
+    TransmissionStatus.BROKEN_NATURALIZATION.value,
+)
+
+# Rows compiled before giving up; the default rules read eight variables, so 2**8 + 1.
+MAX_ROWS = 1 << 16
+
+
+class TruthTable:
+    """Fired rules, and the whole result when no rule falls back, per feature combination.
+
+    Built from a ``RuleEngine``'s compiled conditions and effects, so a lookup gives
+    the same result as ``engine.evaluate`` for the same context.
+    """
+
+    def __init__(self, engine: RuleEngine, max_rows: int = MAX_ROWS):
+        self.engine = engine
+        readers: Dict[int, frozenset] = {
+            position: condition_variables(rule.condition)
+            for position, rule in enumerate(engine.rules)
+        }
+        self.fallback = tuple(
+            position
+            for position, names in readers.items()
+            if not names <= FEATURE_DOMAINS.keys()
+        )
+        self.variables = tuple(
+            sorted(
+                {
+                    name
+                    for position, names in readers.items()
+                    if position not in self.fallback
+                    for name in names
+                }
+            )
+        )
+        domains = [FEATURE_DOMAINS[name] for name in self.variables]
+        rows = 1
+        for domain in domains:
+            rows *= len(domain)
+        if rows + 1 > max_rows:
+            raise ValueError(f"Feature space of {rows + 1} rows exceeds the limit of {max_rows}")
+
+        enumerable = [
+            position for position in range(len(engine.rules)) if position not in self.fallback
+        ]
+        self._fired: Dict[Tuple, Tuple[int, ...]] = {}
+        self._evaluations: Dict[Tuple, CachedEvaluation] = {}
+        # An empty chain always carries the default flags.
+        defaults = default_feature_flags()
+        self._add_row((False,) + tuple(defaults.get(name) for name in self.variables), enumerable)
+        for values in itertools.product(*domains):
+            self._add_row((True,) + values, enumerable)
+
+    def _add_row(self, key: Tuple, enumerable: List[int]) -> None:
+        has_lineage, values = key[0], key[1:]
+        features = default_feature_flags()
+        features.update(zip(self.variables, values))
+        context = EvaluationContext(
+            # Preconditions only check whether the chain is empty.
+            lineage_chain=[None] if has_lineage else [],
+            process_context={},
+            now=None,
+            features=features,
+        )
+        fired = tuple(self._fired_among(context, features, enumerable))
+        self._fired[key] = fired
+        if not self.fallback:
+            # Aggregated over an empty chain so no link statuses are recorded for replay.
+            context.lineage_chain = []
+            result = self.engine.aggregate(context, fired)
+            self._evaluations[key] = CachedEvaluation.from_result(result)
+
+    def _fired_among(self, context: EvaluationContext, flat_context: Dict, positions) -> List[int]:
+        engine = self.engine
+        return [
+            position
+            for position in positions
+            if engine._preconditions_met(engine.rules[position], context)
+            and engine._conditions[position](flat_context)
+        ]
+
+    def key(self, context: EvaluationContext) -> Tuple:
+        # Enumerable variables are all feature flags, which take precedence in to_dict.
+        features = context.features
+        return (bool(context.lineage_chain),) + tuple(
+            features.get(name) for name in self.variables
+        )
+
+    def lookup(self, context: EvaluationContext) -> Optional[EvaluationResult]:
+        """The result of evaluating ``context``, or ``None`` if its combination is not tabled."""
+        key = self.key(context)
+        evaluation = self._evaluations.get(key)
+        if evaluation is not None:
+            return evaluation.to_result(context.lineage_chain)
+        fired = self._fired.get(key)
+        if fired is None:
+            return None
+        if self.fallback:
+            extra = self._fired_among(context, context.to_dict(), self.fallback)
+            fired = sorted(fired + tuple(extra))
+        return self.engine.aggregate(context, fired)
+
+    def __len__(self) -> int:
+        return len(self._fired)
+
+    def coverage(self) -> Dict:
+        """How often each rule fires and each aggregate occurs across every tabled combination.
+
+        Fallback rules are listed separately since their firing depends on context
+        outside the table; aggregates are only reported when there are none.
+        """
+        rules = self.engine.rules
+        fired_counts = Counter(
+            position for fired in self._fired.values() for position in fired
+        )
+        report = {
+            "rule_set_version": self.engine.version,
+            "rows": len(self._fired),
+            "variables": {name: list(FEATURE_DOMAINS[name]) for name in self.variables},
+            "fallback_rules": [rules[position].id for position in self.fallback],
+            "rules": [
+                {"rule_id": rules[position].id, "fired_rows": fired_counts[position]}
+                for position in range(len(rules))
+                if position not in self.fallback
+            ],
+            "never_fired": [
+                rules[position].id
+                for position in range(len(rules))
+                if position not in self.fallback and not fired_counts[position]
+            ],
+        }
+        if not self.fallback:
+            evaluations = self._evaluations.values()
+            for field in ("overall_status", "acquisition_mode", "court_viability", "confidence"):
+                counts = Counter(getattr(evaluation, field).value for evaluation in evaluations)
+                report[field] = dict(sorted(counts.items()))
+            report["needs_lawyer"] = sum(evaluation.needs_lawyer for evaluation in evaluations)
+        return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from src.evaluator import DEFAULT_RULE_PATHS
+    from src.rule_engine.loader import RuleLoader
+
+    parser = argparse.ArgumentParser(description="Report rule coverage over the feature space.")
+    parser.add_argument("rules", nargs="*", default=DEFAULT_RULE_PATHS, help="rule files to table")
+    parser.add_argument("-o", "--output", help="write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    loader = RuleLoader(args.rules)
+    table = TruthTable(RuleEngine(loader.load(), version=loader.fingerprint()))
+    encoded = json.dumps(table.coverage(), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
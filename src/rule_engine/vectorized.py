@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - numpy is an optional dependency
+    raise ImportError(
+        "src.rule_engine.vectorized requires numpy; install it with `pip install numpy`."
+    ) from exc
+
+from src.models import (
+    AcquisitionMode,
+    Confidence,
+    CourtViability,
+    EvaluationResult,
+    LineageLink,
+    OverallStatus,
+    Rule,
+    RuleOutcome,
+)
+from src.rule_engine.json_logic import compile_expression
+from src.rule_engine.pipeline import (
+    COURT_VIABLE_STATUSES,
+    NO_OUTCOME_EXPLANATION,
+    OVERALL_STATUS_BY_TRANSMISSION,
+    EvaluationContext,
+    RuleEngine,
+)
+
+
+OVERALL_STATUSES = tuple(OverallStatus)
+ACQUISITION_MODES = tuple(AcquisitionMode)
+COURT_VIABILITIES = tuple(CourtViability)
+# Ordered so that the aggregate confidence is the maximum code seen so far.
+CONFIDENCES = (Confidence.HIGH, Confidence.MEDIUM, Confidence.LOW)
+
+_CODE_DTYPE = np.int8
+
+
+class FeatureMatrix:
+    """Column-oriented view of many flattened evaluation contexts.
+
+    Each key of ``EvaluationContext.to_dict`` becomes one array. Columns holding only
+    booleans are stored as ``bool`` arrays; anything else (categorical strings,
+    ``None``, counts mixed with ``None``) is kept as an ``object`` array so element
+    comparisons follow Python semantics exactly.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], size: int):
+        self.columns = columns
+        self.size = size
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "FeatureMatrix":
+        """Build a matrix from flattened contexts or raw ``build_feature_flags`` outputs.
+
+        Records without a ``lineage_length`` key are treated as coming from a
+        non-empty chain, which is the only way ``build_feature_flags`` is called.
+        """
+        size = len(records)
+        names: Dict[str, None] = {}
+        for record in records:
+            names.update(dict.fromkeys(record))
+
+        columns = {}
+        for name in names:
+            values = [record.get(name) for record in records]
+            if all(value is True or value is False for value in values):
+                columns[name] = np.fromiter(values, dtype=bool, count=size)
+            else:
+                column = np.empty(size, dtype=object)
+                column[:] = values
+                columns[name] = column
+        return cls(columns, size)
+
+    @classmethod
+    def from_contexts(cls, contexts: Iterable[EvaluationContext]) -> "FeatureMatrix":
+        return cls.from_records([context.to_dict() for context in contexts])
+
+    def column(self, name: Any) -> np.ndarray:
+        column = self.columns.get(name)
+        if column is None:
+            return np.full(self.size, None, dtype=object)
+        return column
+
+    def has_lineage(self) -> np.ndarray:
+        lengths = self.columns.get("lineage_length")
+        if lengths is None:
+            return np.ones(self.size, dtype=bool)
+        return _truthy(lengths)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        names = list(self.columns)
+        for values in zip(*(self.columns[name].tolist() for name in names)):
+            yield dict(zip(names, values))
+
+
+VectorFn = Callable[[FeatureMatrix], Any]
+
+_bool_of = np.frompyfunc(bool, 1, 1)
+
+
+def _truthy(values: Any) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        if values.dtype == bool:
+            return values
+        if values.dtype == object:
+            return _bool_of(values).astype(bool)
+        return values.astype(bool)
+    raise TypeError("expected an array")
+
+
+def _is_numeric(value: Any) -> bool:
+    if isinstance(value, np.ndarray):
+        return value.dtype != object
+    return isinstance(value, (bool, int, float))
+
+
+def _as_object(value: Any) -> Any:
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return value.astype(object)
+    return value
+
+
+def _compare(compare: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+    elementwise = np.frompyfunc(compare, 2, 1)
+
+    def vector_compare(left: Any, right: Any) -> Any:
+        if _is_numeric(left) and _is_numeric(right):
+            return compare(left, right)
+        # Mixed or object operands go through Python comparisons element by element.
+        return elementwise(_as_object(left), _as_object(right))
+
+    return vector_compare
+
+
+_COMPARISONS = {
+    "eq": _compare(operator.eq),
+    "neq": _compare(operator.ne),
+    "gt": _compare(operator.gt),
+    "gte": _compare(operator.ge),
+    "lt": _compare(operator.lt),
+    "lte": _compare(operator.le),
+}
+
+
+def compile_mask(expr: Any) -> Callable[[FeatureMatrix], np.ndarray]:
+    """Compile a JSON-logic condition into a function returning a boolean row mask."""
+    fn = _compile_vector(expr)
+
+    def mask(matrix: FeatureMatrix) -> np.ndarray:
+        value = fn(matrix)
+        if isinstance(value, np.ndarray):
+            return _truthy(value)
+        return np.full(matrix.size, bool(value), dtype=bool)
+
+    return mask
+
+
+def _compile_vector(expr: Any) -> VectorFn:
+    if isinstance(expr, (int, float, str, bool)) or expr is None:
+        return lambda matrix: expr
+    if isinstance(expr, dict) and len(expr) == 1:
+        op, value = next(iter(expr.items()))
+        if op == "var":
+            return lambda matrix: matrix.column(value)
+        if op in _COMPARISONS and isinstance(value, list) and len(value) == 2:
+            left, right = (_compile_vector(arg) for arg in value)
+            compare = _COMPARISONS[op]
+            return lambda matrix: compare(left(matrix), right(matrix))
+        if op in ("and", "or") and isinstance(value, list):
+            parts = [compile_mask(arg) for arg in value]
+            reduce = np.logical_and.reduce if op == "and" else np.logical_or.reduce
+            empty = op == "and"
+
+            def combine(matrix: FeatureMatrix) -> np.ndarray:
+                if not parts:
+                    return np.full(matrix.size, empty, dtype=bool)
+                return reduce([part(matrix) for part in parts])
+
+            return combine
+        if op == "not":
+            inner = compile_mask(value)
+            return lambda matrix: ~inner(matrix)
+    # Lists, "in" and anything unusual are evaluated row by row with the scalar compiler.
+    return _rowwise(expr)
+
+
+def _rowwise(expr: Any) -> VectorFn:
+    condition = compile_expression(expr)
+
+    def evaluate_rows(matrix: FeatureMatrix) -> np.ndarray:
+        return np.fromiter(
+            (bool(condition(row)) for row in matrix.rows()), dtype=bool, count=matrix.size
+        )
+
+    return evaluate_rows
+
+
+@dataclass
+class BatchEvaluation:
+    """Aggregate results for every row of a ``FeatureMatrix``.
+
+    Enum-valued columns hold integer codes into ``OVERALL_STATUSES``,
+    ``ACQUISITION_MODES``, ``COURT_VIABILITIES`` and ``CONFIDENCES``; ``fired`` is a
+    rules-by-rows boolean matrix in rule order.
+    """
+
+    overall_status: np.ndarray
+    acquisition_mode: np.ndarray
+    court_viability: np.ndarray
+    confidence: np.ndarray
+    needs_lawyer: np.ndarray
+    fired: np.ndarray
+    outcomes: Sequence[RuleOutcome]
+    rule_set_version: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.needs_lawyer)
+
+    def result(self, index: int, lineage: Optional[List[LineageLink]] = None) -> EvaluationResult:
+        """Materialize row ``index`` as the ``EvaluationResult`` the scalar engine returns."""
+        rule_outcomes = [
+            outcome for position, outcome in enumerate(self.outcomes) if self.fired[position, index]
+        ]
+        explanations = [f"{o.rule_id}: {o.notes}" for o in rule_outcomes]
+        if not rule_outcomes:
+            explanations.append(NO_OUTCOME_EXPLANATION)
+        return EvaluationResult(
+            lineage=lineage if lineage is not None else [],
+            overall_status=OVERALL_STATUSES[self.overall_status[index]],
+            confidence=CONFIDENCES[self.confidence[index]],
+            court_viability=COURT_VIABILITIES[self.court_viability[index]],
+            needs_lawyer=bool(self.needs_lawyer[index]),
+            acquisition_mode=ACQUISITION_MODES[self.acquisition_mode[index]],
+            explanations=explanations,
+            rule_outcomes=rule_outcomes,
+            rule_set_version=self.rule_set_version,
+        )
+
+    def results(self) -> Iterator[EvaluationResult]:
+        for index in range(len(self)):
+            yield self.result(index)
+
+
+class VectorizedRuleEngine:
+    """Evaluates a rule set over a whole ``FeatureMatrix`` with array operations.
+
+    Rules are applied in file order and each aggregate is overwritten only where the
+    rule fired, which reproduces ``RuleEngine``'s last-writer-wins semantics row by row.
+    """
+
+    def __init__(self, rules: Iterable[Rule], version: Optional[str] = None):
+        self.rules = tuple(rules)
+        self.version = version
+        self._masks = tuple(compile_mask(rule.condition) for rule in self.rules)
+        # Effects do not depend on the context, so each rule's outcome is fixed.
+        scalar = RuleEngine(())
+        self._outcomes = tuple(scalar._apply_effects(rule) for rule in self.rules)
+
+    @classmethod
+    def from_engine(cls, engine: RuleEngine) -> "VectorizedRuleEngine":
+        return cls(engine.rules, version=engine.version)
+
+    def evaluate(self, matrix: FeatureMatrix) -> BatchEvaluation:
+        size = matrix.size
+        overall = np.full(size, OVERALL_STATUSES.index(OverallStatus.CLEAR_ADMIN_ELIGIBLE), _CODE_DTYPE)
+        mode = np.full(size, ACQUISITION_MODES.index(AcquisitionMode.AUTOMATIC_BY_BLOOD), _CODE_DTYPE)
+        viability = np.full(size, COURT_VIABILITIES.index(CourtViability.NONE), _CODE_DTYPE)
+        confidence = np.full(size, CONFIDENCES.index(Confidence.HIGH), _CODE_DTYPE)
+        needs_lawyer = np.zeros(size, dtype=bool)
+        fired = np.zeros((len(self.rules), size), dtype=bool)
+        has_lineage = matrix.has_lineage()
+
+        for position, (rule, mask, outcome) in enumerate(zip(self.rules, self._masks, self._outcomes)):
+            hits = mask(matrix)
+            if (rule.preconditions or {}).get("needs_lineage"):
+                hits = hits & has_lineage
+            if not hits.any():
+                continue
+            fired[position] = hits
+
+            status = OVERALL_STATUS_BY_TRANSMISSION.get(outcome.status)
+            if status is not None:
+                overall[hits] = OVERALL_STATUSES.index(status)
+            effect_mode = rule.effects.get("acquisition_mode")
+            if effect_mode:
+                mode[hits] = ACQUISITION_MODES.index(AcquisitionMode(effect_mode))
+            if outcome.needs_lawyer:
+                needs_lawyer |= hits
+            if outcome.status in COURT_VIABLE_STATUSES:
+                viability[hits] = COURT_VIABILITIES.index(CourtViability.HIGH)
+            code = CONFIDENCES.index(outcome.confidence)
+            np.maximum(confidence, np.where(hits, code, 0).astype(_CODE_DTYPE), out=confidence)
+
+        return BatchEvaluation(
+            overall_status=overall,
+            acquisition_mode=mode,
+            court_viability=viability,
+            confidence=confidence,
+            needs_lawyer=needs_lawyer,
+            fired=fired,
+            outcomes=self._outcomes,
+            rule_set_version=self.version,
+        )
@@ -72,6 +72,29 @@ def applicant_input_schema() -> Dict[str, Any]:
     }
 
 
+def family_tree_input_schema() -> Dict[str, Any]:
+    applicant_schema = applicant_input_schema()
+    return {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "title": "JureSanguinisFamilyTreeInput",
+        "type": "object",
+        "required": ["persons", "lineage_links"],
+        "properties": {
+            "persons": {
+                "type": "array",
+                "items": {"$ref": "#/definitions/person"},
+            },
+            "lineage_links": applicant_schema["properties"]["lineage_links"],
+            "targets": {
+                "type": "array",
+                "items": {"type": "string"},
+            },
+            "context": applicant_schema["properties"]["context"],
+        },
+        "definitions": applicant_schema["definitions"],
+    }
+
+
 def evaluation_output_schema() -> Dict[str, Any]:
     return {
         "$schema": "http://json-schema.org/draft-07/schema#",
@@ -95,6 +118,7 @@ def evaluation_output_schema() -> Dict[str, Any]:
                     "BLOCKED_REFORM_NO_EXEMPTION",
                     "POTENTIAL_VIA_RESIDENCE",
                     "INDETERMINATE_COMPLEX_CASE",
+                    "NOT_ELIGIBLE_NO_ITALIAN_LINEAGE",
                 ]
             },
             "confidence": {"enum": ["HIGH", "MEDIUM", "LOW"]},
@@ -124,10 +148,13 @@ def evaluation_output_schema() -> Dict[str, Any]:
                     },
                 },
             },
+            # Content hash of the rule files that produced the result; null for ad-hoc rules.
+            "rule_set_version": {"type": ["string", "null"]},
         },
     }
 
 
 if __name__ == "__main__":
     print(json.dumps(applicant_input_schema(), indent=2))
+    print(json.dumps(family_tree_input_schema(), indent=2))
     print(json.dumps(evaluation_output_schema(), indent=2))
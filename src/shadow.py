@@ -0,0 +1,234 @@
+"""Shadow evaluation of live traffic against a candidate rule set.
+
+``ShadowEvaluator.submit`` hands a copy of an already-decoded lineage and the
+result served for it to a background thread, which evaluates the lineage again
+with the rule files of a candidate directory and stores every difference in
+overall status, acquisition mode or fired outcomes in a SQLite database. The
+request thread only copies the links and does a non-blocking queue put; when
+the queue is full the lineage is dropped and counted instead of slowing the
+response.
+
+Summarize the recorded differences with::
+
+    python -m src.shadow shadow.sqlite3
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import glob
+import json
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.evaluator import evaluate_lineage
+from src.models import EvaluationResult, LineageLink
+from src.result_cache import lineage_fingerprint
+from src.rule_engine.registry import RULE_SETS, RuleSetRegistry
+
+
+logger = logging.getLogger(__name__)
+
+# Diffs written per transaction while the queue stays busy.
+COMMIT_EVERY = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shadow_diffs (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    input_hash TEXT NOT NULL,
+    primary_version TEXT,
+    candidate_version TEXT NOT NULL,
+    primary_status TEXT NOT NULL,
+    candidate_status TEXT NOT NULL,
+    primary_mode TEXT NOT NULL,
+    candidate_mode TEXT NOT NULL,
+    primary_outcomes TEXT NOT NULL,
+    candidate_outcomes TEXT NOT NULL
+)
+"""
+
+# What a diff compares: overall status, acquisition mode and fired (rule, status) pairs.
+Summary = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+def result_summary(result: EvaluationResult) -> Summary:
+    return (
+        result.overall_status.value,
+        result.acquisition_mode.value,
+        tuple((outcome.rule_id, outcome.status.value) for outcome in result.rule_outcomes),
+    )
+
+
+def candidate_rule_paths(rules_dir: str) -> List[str]:
+    """The rule files of a candidate directory, in name order like ``DEFAULT_RULE_PATHS``."""
+    paths = sorted(glob.glob(os.path.join(rules_dir, "*.yaml")))
+    if not paths:
+        raise ValueError(f"No rule files in {rules_dir}")
+    return paths
+
+
+class ShadowEvaluator:
+    """Evaluates submitted lineages against candidate rules on one background thread.
+
+    The candidate rule set is looked up through the registry on every evaluation,
+    so edits to the candidate files take effect without a restart. ``cache=None``
+    keeps candidate results out of the primary result cache.
+    """
+
+    def __init__(
+        self,
+        rules_dir: str,
+        db_path: str,
+        maxsize: int = 1024,
+        registry: RuleSetRegistry = RULE_SETS,
+    ):
+        self.rule_paths = candidate_rule_paths(rules_dir)
+        self.db_path = db_path
+        self.registry = registry
+        self._queue: "queue.Queue" = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.dropped = 0
+        self.evaluated = 0
+        self.diffs = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="shadow-evaluator", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        lineage_chain: List[LineageLink],
+        process_context: Dict,
+        result: EvaluationResult,
+    ) -> bool:
+        """Queue a lineage and its served result; returns ``False`` if it was dropped.
+
+        The worker evaluates copies of the links: evaluation marks links broken in
+        place, and the submitted chain is still being rendered into the response.
+        People are only read during evaluation and stay shared.
+        """
+        lineage_chain = [copy.copy(link) for link in lineage_chain]
+        item = (lineage_chain, process_context, result_summary(result), result.rule_set_version)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def join(self) -> None:
+        """Wait until every queued lineage has been evaluated and its diff committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "dropped": self.dropped,
+                "evaluated": self.evaluated,
+                "diffs": self.diffs,
+                "errors": self.errors,
+                "queued": self._queue.qsize(),
+            }
+
+    def _run(self) -> None:
+        # SQLite connections belong to the thread that opened them.
+        connection = sqlite3.connect(self.db_path)
+        connection.execute(SCHEMA)
+        pending = 0
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+            lineage_chain, process_context, primary, primary_version = item
+            try:
+                engine = self.registry.get_engine(self.rule_paths)
+                candidate = evaluate_lineage(
+                    lineage_chain, process_context, engine=engine, cache=None
+                )
+                summary = result_summary(candidate)
+                if summary != primary:
+                    connection.execute(
+                        "INSERT INTO shadow_diffs (recorded_at, input_hash, primary_version, "
+                        "candidate_version, primary_status, candidate_status, primary_mode, "
+                        "candidate_mode, primary_outcomes, candidate_outcomes) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            time.time(),
+                            lineage_fingerprint(lineage_chain, process_context, engine.version),
+                            primary_version,
+                            engine.version,
+                            primary[0],
+                            summary[0],
+                            primary[1],
+                            summary[1],
+                            json.dumps(primary[2]),
+                            json.dumps(summary[2]),
+                        ),
+                    )
+                    pending += 1
+                with self._lock:
+                    self.evaluated += 1
+                    self.diffs += summary != primary
+            except Exception:
+                logger.exception("Shadow evaluation failed")
+                with self._lock:
+                    self.errors += 1
+            # Commit once the burst is drained, or periodically while it lasts.
+            if pending and (pending >= COMMIT_EVERY or self._queue.empty()):
+                connection.commit()
+                pending = 0
+            self._queue.task_done()
+        connection.commit()
+        connection.close()
+
+
+def summarize(db_path: str) -> Dict:
+    """Counts of recorded diffs by candidate version and status transition."""
+    connection = sqlite3.connect(db_path)
+    try:
+        rows = connection.execute(
+            "SELECT candidate_version, primary_status, candidate_status, primary_mode, "
+            "candidate_mode, COUNT(*) FROM shadow_diffs GROUP BY 1, 2, 3, 4, 5 ORDER BY 6 DESC"
+        ).fetchall()
+    finally:
+        connection.close()
+    return {
+        "diffs": sum(row[5] for row in rows),
+        "transitions": [
+            {
+                "candidate_version": row[0],
+                "status": [row[1], row[2]],
+                "mode": [row[3], row[4]],
+                "count": row[5],
+            }
+            for row in rows
+        ],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize shadow evaluation diffs.")
+    parser.add_argument("database", help="SQLite file written by ShadowEvaluator")
+    args = parser.parse_args(argv)
+    print(json.dumps(summarize(args.database), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
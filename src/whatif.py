@@ -0,0 +1,301 @@
+"""Incremental "what-if" re-evaluation of a lineage.
+
+A ``WhatIfSession`` evaluates a lineage once and keeps the intermediate state:
+each person's ``PersonFacts``, the flags raised by every link and the rules that
+fired. Applying a patch recomputes the facts of the patched people, the flags of
+the links they belong to, and only the rules reading a context key whose value
+changed; everything else is reused.
+
+Patches are JSON objects with an ``op`` and a ``person_id``::
+
+    {"op": "set_birth_date", "person_id": "a2", "birth_date": "1949-03-01"}
+    {"op": "add_event", "person_id": "a1", "event": {"kind": "naturalization_foreign", ...}}
+    {"op": "remove_event", "person_id": "a1", "index": 0}
+    {"op": "set_note", "person_id": "app", "key": "tajani_exemption", "value": true}
+
+A ``null`` birth date clears it and a ``null`` note value removes the note.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.decoder import DecodeError, decode_citizenship_event, decode_date
+from src.evaluator import load_rule_engine
+from src.models import EvaluationResult, LineageLink, Person, TransmissionStatus
+from src.rule_engine.features import (
+    PersonFacts,
+    apply_link_features,
+    default_feature_flags,
+    person_facts,
+)
+from src.rule_engine.pipeline import EvaluationContext, RuleEngine
+
+
+PATCH_OPS = ("set_birth_date", "add_event", "remove_event", "set_note")
+
+_REQUIRED = "This field is required."
+_INVALID_STRING = "Not a valid string."
+
+
+class _InvalidPatch(Exception):
+    def __init__(self, detail: Any):
+        self.detail = detail
+
+
+@dataclass(frozen=True, slots=True)
+class Patch:
+    op: str
+    person_id: str
+    value: Any
+    key: Optional[str] = None
+
+
+def _parse_patch(raw: Any, people: Dict[str, Person], event_counts: Dict[str, int]) -> Patch:
+    if not isinstance(raw, dict):
+        message = f"Invalid data. Expected a dictionary, but got {type(raw).__name__}."
+        raise _InvalidPatch({"non_field_errors": [message]})
+    errors: Dict[str, List[str]] = {}
+    op = raw.get("op")
+    person_id = raw.get("person_id")
+    if op is None:
+        errors["op"] = [_REQUIRED]
+    elif op not in PATCH_OPS:
+        errors["op"] = [f'"{op}" is not a valid choice.']
+    if person_id is None:
+        errors["person_id"] = [_REQUIRED]
+    elif not isinstance(person_id, str):
+        errors["person_id"] = [_INVALID_STRING]
+    elif person_id not in people:
+        errors["person_id"] = [f"Unknown person_id '{person_id}' in lineage"]
+    if errors:
+        raise _InvalidPatch(errors)
+
+    if op == "set_birth_date":
+        if "birth_date" not in raw:
+            raise _InvalidPatch({"birth_date": [_REQUIRED]})
+        value = raw["birth_date"]
+        try:
+            return Patch(op, person_id, None if value is None else decode_date(value))
+        except DecodeError as exc:
+            raise _InvalidPatch({"birth_date": exc.detail})
+    if op == "add_event":
+        if "event" not in raw:
+            raise _InvalidPatch({"event": [_REQUIRED]})
+        try:
+            event = decode_citizenship_event(raw["event"])
+        except DecodeError as exc:
+            raise _InvalidPatch({"event": exc.detail})
+        event_counts[person_id] += 1
+        return Patch(op, person_id, event)
+    if op == "remove_event":
+        index = raw.get("index")
+        if isinstance(index, bool) or not isinstance(index, int):
+            raise _InvalidPatch({"index": ["A valid integer is required."]})
+        if not 0 <= index < event_counts[person_id]:
+            raise _InvalidPatch({"index": [f"Person '{person_id}' has no event at index {index}."]})
+        event_counts[person_id] -= 1
+        return Patch(op, person_id, index)
+    key = raw.get("key")
+    if not isinstance(key, str) or not key:
+        raise _InvalidPatch({"key": [_REQUIRED]})
+    return Patch(op, person_id, raw.get("value"), key=key)
+
+
+def parse_patches(raw_patches: Any, people: Dict[str, Person]) -> List[Patch]:
+    """Validate every patch before any is applied, so a bad batch changes nothing.
+
+    Errors are reported as ``{"patches": {index: detail}}`` in a ``DecodeError``.
+    """
+    if not isinstance(raw_patches, list):
+        raise DecodeError(
+            {"patches": [f'Expected a list of items but got type "{type(raw_patches).__name__}".']}
+        )
+    # remove_event indexes refer to the events as left by the preceding patches.
+    event_counts = {person_id: len(person.events) for person_id, person in people.items()}
+    patches = []
+    errors = {}
+    for index, raw in enumerate(raw_patches):
+        try:
+            patches.append(_parse_patch(raw, people, event_counts))
+        except _InvalidPatch as exc:
+            errors[index] = exc.detail
+    if errors:
+        raise DecodeError({"patches": errors})
+    return patches
+
+
+def _apply_patch(person: Person, patch: Patch) -> None:
+    if patch.op == "set_birth_date":
+        person.birth_date = patch.value
+    elif patch.op == "add_event":
+        person.events.append(patch.value)
+    elif patch.op == "remove_event":
+        del person.events[patch.value]
+    elif patch.value is None:
+        person.notes.pop(patch.key, None)
+    else:
+        person.notes[patch.key] = patch.value
+
+
+class WhatIfSession:
+    """A lineage evaluation that can be patched and re-evaluated incrementally.
+
+    The session owns the people in ``lineage_chain`` and mutates them as patches
+    are applied. It keeps the engine it started with, so every result in a
+    session is computed against the same rule-set version.
+    """
+
+    def __init__(
+        self,
+        lineage_chain: List[LineageLink],
+        process_context: Dict | None = None,
+        engine: RuleEngine | None = None,
+    ):
+        self.engine = engine or load_rule_engine()
+        self.lineage_chain = lineage_chain
+        self.process_context = process_context or {}
+        self._now = datetime.utcnow()
+        self._lock = threading.Lock()
+
+        self._people: Dict[str, Person] = {}
+        self._links_by_person: Dict[str, List[int]] = {}
+        for position, link in enumerate(lineage_chain):
+            for person in (link.parent, link.child):
+                self._people[person.id] = person
+                self._links_by_person.setdefault(person.id, []).append(position)
+        self._facts: Dict[str, PersonFacts] = {
+            person_id: person_facts(person) for person_id, person in self._people.items()
+        }
+
+        self._link_flags: List[Dict[str, bool]] = []
+        self._link_broken: List[bool] = []
+        self._flag_counts: Dict[str, int] = {}
+        self._broken_links = 0
+        for position in range(len(lineage_chain)):
+            flags, broken = self._compute_link(position)
+            self._link_flags.append(flags)
+            self._link_broken.append(broken)
+            self._count_link(flags, broken, 1)
+
+        self._context = self._build_context()
+        self._flat_context = self._context.to_dict()
+        self._fired = self.engine.fired_rules(self._context, self._flat_context)
+        self.result = self.engine.aggregate(self._context, self._fired)
+
+    def _compute_link(self, position: int) -> Tuple[Dict[str, bool], bool]:
+        link = self.lineage_chain[position]
+        flags: Dict[str, bool] = {}
+        broken = apply_link_features(
+            link, self._facts[link.parent.id], self._facts[link.child.id], flags
+        )
+        link.parent_citizenship_status_at_birth = (
+            TransmissionStatus.BROKEN_NATURALIZATION if broken else TransmissionStatus.INTACT
+        )
+        return flags, broken
+
+    def _count_link(self, flags: Dict[str, bool], broken: bool, delta: int) -> None:
+        for name in flags:
+            self._flag_counts[name] = self._flag_counts.get(name, 0) + delta
+        self._broken_links += delta if broken else 0
+
+    def _build_context(self) -> EvaluationContext:
+        features = default_feature_flags()
+        for name, count in self._flag_counts.items():
+            if count:
+                features[name] = True
+        if self._broken_links:
+            features["parent_citizenship_status"] = TransmissionStatus.BROKEN_NATURALIZATION.value
+        return EvaluationContext(
+            lineage_chain=self.lineage_chain,
+            process_context=self.process_context,
+            now=self._now,
+            features=features,
+        )
+
+    def apply(self, raw_patches: Any) -> EvaluationResult:
+        """Apply a list of patches and return the updated evaluation.
+
+        Raises ``DecodeError`` without changing anything if any patch is invalid.
+        """
+        with self._lock:
+            patches = parse_patches(raw_patches, self._people)
+            touched: Set[str] = set()
+            for patch in patches:
+                _apply_patch(self._people[patch.person_id], patch)
+                touched.add(patch.person_id)
+            return self._reevaluate(touched)
+
+    def _reevaluate(self, touched: Iterable[str]) -> EvaluationResult:
+        positions: Set[int] = set()
+        for person_id in touched:
+            self._facts[person_id] = person_facts(self._people[person_id])
+            positions.update(self._links_by_person[person_id])
+        for position in positions:
+            self._count_link(self._link_flags[position], self._link_broken[position], -1)
+            flags, broken = self._compute_link(position)
+            self._link_flags[position] = flags
+            self._link_broken[position] = broken
+            self._count_link(flags, broken, 1)
+
+        context = self._build_context()
+        flat_context = context.to_dict()
+        changed = [
+            name for name, value in flat_context.items() if self._flat_context.get(name) != value
+        ]
+        self._context, self._flat_context = context, flat_context
+        if not changed:
+            return self.result
+
+        affected = self.engine.rules_reading(changed)
+        unaffected = [position for position in self._fired if position not in affected]
+        refired = self.engine.fired_rules(context, flat_context, sorted(affected))
+        self._fired = sorted(unaffected + refired)
+        self.result = self.engine.aggregate(context, self._fired)
+        return self.result
+
+
+class WhatIfSessionStore:
+    """Bounded, thread-safe LRU store of what-if sessions with an idle time to live."""
+
+    def __init__(
+        self, maxsize: int = 256, ttl: float = 1800.0, clock: Callable[[], float] = time.monotonic
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._sessions: "OrderedDict[str, Tuple[float, WhatIfSession]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, session: WhatIfSession) -> str:
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = (self._clock() + self.ttl, session)
+            while len(self._sessions) > self.maxsize:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def get(self, session_id: str) -> Optional[WhatIfSession]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            expires_at, session = entry
+            now = self._clock()
+            if expires_at <= now:
+                del self._sessions[session_id]
+                return None
+            self._sessions[session_id] = (now + self.ttl, session)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+WHATIF_SESSIONS = WhatIfSessionStore()
@@ -0,0 +1,102 @@
+import io
+import json
+
+import pytest
+
+from src.batch import run_batch
+from src.decoder import DecodeError, decode_request
+from src.evaluator import load_rule_engine
+from src.rule_engine.stats import RuleStats
+
+
+CASE = {
+    "applicant": {"id": "app", "name": "Applicant", "birth_date": "1960-07-01", "birth_country": "USA"},
+    "ancestors": [
+        {"id": "a1", "name": "Giorgio", "birth_date": "1890-05-01", "birth_country": "Italy"},
+        {"id": "a2", "name": "Anna", "birth_date": "1930-06-01", "birth_country": "Argentina"},
+    ],
+    "lineage_links": [
+        {"parent_id": "a1", "child_id": "a2", "relationship": "mother"},
+        {"parent_id": "a2", "child_id": "app", "relationship": "father"},
+    ],
+}
+
+
+def test_decode_request_builds_linked_chain():
+    links, context = decode_request(dict(CASE, context={"process_type": "COURT"}))
+
+    assert [(link.parent.id, link.child.id) for link in links] == [("a1", "a2"), ("a2", "app")]
+    assert links[0].child is links[1].parent
+    assert links[0].child.birth_date.year == 1930
+    assert context == {"process_type": "COURT"}
+
+
+def test_decode_request_rejects_unknown_link_person():
+    payload = dict(CASE, lineage_links=[{"parent_id": "x", "child_id": "app", "relationship": "father"}])
+    with pytest.raises(DecodeError) as excinfo:
+        decode_request(payload)
+    assert excinfo.value.detail == ["Unknown parent_id 'x' in lineage"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_preserves_input_order(workers):
+    lines = []
+    for index in range(25):
+        lines.append("{broken\n" if index == 3 else json.dumps(CASE) + "\n")
+    source = io.StringIO("".join(lines) + "\n")
+    sink = io.StringIO()
+
+    processed, failed = run_batch(source, sink, workers=workers, chunksize=2)
+
+    assert (processed, failed) == (25, 1)
+    results = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [result["index"] for result in results] == list(range(25))
+    assert "JSON parse error" in results[3]["errors"]["detail"]
+    assert results[0]["result"]["overall_status"] == "COURT_ONLY_1948"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_reports_evaluation_errors_per_record(tmp_path, workers):
+    # Comparing a missing country of filing with a string raises TypeError in the rule.
+    rule_file = tmp_path / "rules.yaml"
+    rule = {"id": "broken", "condition": {"gt": [{"var": "country_of_filing"}, "A"]}, "effects": {}}
+    rule_file.write_text(json.dumps({"rules": [rule]}), encoding="utf-8")
+    filed = dict(CASE, context={"country_of_filing": "USA"})
+    source = io.StringIO(json.dumps(CASE) + "\n" + json.dumps(filed) + "\n")
+    sink = io.StringIO()
+
+    processed, failed = run_batch(source, sink, workers=workers, rule_paths=[str(rule_file)])
+
+    assert (processed, failed) == (2, 1)
+    results = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert results[0]["errors"] == {"detail": "Evaluation failed."}
+    assert results[1]["result"]["rule_outcomes"][0]["rule_id"] == "broken"
+
+
+def test_run_batch_only_reports_json_errors_as_parse_errors(monkeypatch):
+    def fail(*args, **kwargs):
+        raise ValueError("bad date")
+
+    monkeypatch.setattr("src.batch.evaluate_lineage", fail)
+    source = io.StringIO("{broken\n" + json.dumps(CASE) + "\n")
+    sink = io.StringIO()
+
+    assert run_batch(source, sink) == (2, 2)
+    parsed, evaluated = [json.loads(line)["errors"] for line in sink.getvalue().splitlines()]
+    assert parsed["detail"].startswith("JSON parse error - ")
+    assert evaluated == {"detail": "Evaluation failed."}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_collects_rule_stats_from_every_worker(workers):
+    engine = load_rule_engine()
+    rule_stats = RuleStats([rule.id for rule in engine.rules], engine.version)
+    source = io.StringIO(json.dumps(CASE) + "\n" + "{broken\n" + json.dumps(CASE) + "\n")
+
+    run_batch(source, io.StringIO(), workers=workers, chunksize=1, rule_stats=rule_stats)
+
+    payload = rule_stats.to_payload()
+    assert payload["passes"] == 2
+    fired = {entry["rule_id"]: entry["fired"] for entry in payload["rules"] if entry["fired"]}
+    assert fired == {"maternal_1948_court_only": 2}
+    assert load_rule_engine().stats is None
@@ -0,0 +1,49 @@
+from benchmarks.loadtest import free_port, load_corpus, run_load, start_server
+from benchmarks.microbench import compare, run_benchmarks
+from benchmarks.synthetic import generate_corpus
+from src.decoder import decode_request
+
+
+def test_synthetic_corpus_is_seeded_and_valid():
+    first = list(generate_corpus(seed=4, count=20, min_depth=2, max_depth=50))
+    assert first == list(generate_corpus(seed=4, count=20, min_depth=2, max_depth=50))
+    assert first != list(generate_corpus(seed=5, count=20, min_depth=2, max_depth=50))
+    for payload in first:
+        links, _ = decode_request(payload)
+        assert 2 <= len(links) <= 50
+
+
+def test_microbench_reports_every_stage():
+    report = run_benchmarks(seed=1, cases=5, repeat=1, max_depth=5)
+    assert set(report["stages"]) == {
+        "decode_request",
+        "build_feature_flags",
+        "rule_loader_load",
+        "json_logic_evaluate",
+        "rule_engine_evaluate",
+    }
+    assert all(timing["median_us"] > 0 for timing in report["stages"].values())
+
+    faster = {
+        "stages": {stage: {"median_us": timing["median_us"] / 2} for stage, timing in report["stages"].items()}
+    }
+    assert compare(report, faster, max_slowdown=1.5) == list(report["stages"])
+    assert compare(report, report, max_slowdown=1.5) == []
+
+
+def test_loadtest_against_local_wsgi_server():
+    port = free_port()
+    server = start_server("wsgi", port, settings="juresanguinisapi.settings_lean")
+    try:
+        bodies = load_corpus(None, seed=2, count=5) + [b"{}"]
+        report = run_load(
+            f"http://127.0.0.1:{port}/api/evaluate/", bodies, concurrency=3, requests=12, warmup=0
+        )
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    assert report["requests"] == 12
+    assert report["statuses"] == {"200": 10, "400": 2}
+    assert report["errors"] == 2 and report["error_rate"] == round(2 / 12, 4)
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
@@ -0,0 +1,65 @@
+import json
+import marshal
+
+from src.evaluator import DEFAULT_RULE_PATHS, evaluate_lineage, load_rule_engine
+from src.models import LineageLink, Person
+from src.rule_engine.bundle import BUNDLE_FORMAT, BUNDLE_MAGIC, build_bundle, load_bundle
+from src.rule_engine.loader import RuleLoader
+from src.rule_engine.registry import RuleSetRegistry
+from src.schemas import evaluation_output_schema
+
+
+def test_bundle_round_trips_rules_and_version(tmp_path):
+    bundle_path = str(tmp_path / "rules.bundle")
+    version = build_bundle(DEFAULT_RULE_PATHS, bundle_path)
+
+    loader = RuleLoader(DEFAULT_RULE_PATHS)
+    rules, bundled_version = load_bundle(bundle_path, DEFAULT_RULE_PATHS)
+    assert rules == loader.load()
+    assert bundled_version == version == loader.fingerprint()
+
+
+def test_registry_falls_back_to_sources_when_bundle_is_stale(tmp_path):
+    rule_file = tmp_path / "rules.yaml"
+    rule_file.write_text(json.dumps({"rules": [{"id": "first", "condition": True}]}))
+    bundle_path = str(tmp_path / "rules.bundle")
+    build_bundle([str(rule_file)], bundle_path)
+
+    assert RuleSetRegistry().get([str(rule_file)], bundle_path).bundled
+
+    rule_file.write_text(json.dumps({"rules": [{"id": "second", "condition": True}]}))
+    rule_set = RuleSetRegistry().get([str(rule_file)], bundle_path)
+    assert not rule_set.bundled
+    assert [rule.id for rule in rule_set.engine.rules] == ["second"]
+
+
+def test_unreadable_bundle_is_ignored(tmp_path):
+    bundle_path = tmp_path / "rules.bundle"
+    bundle_path.write_bytes(BUNDLE_MAGIC + b"\x00garbage")
+    assert load_bundle(str(bundle_path), DEFAULT_RULE_PATHS) is None
+    assert load_bundle(str(tmp_path / "missing.bundle"), DEFAULT_RULE_PATHS) is None
+
+
+def test_bundle_missing_fields_is_ignored(tmp_path):
+    bundle_path = tmp_path / "rules.bundle"
+    build_bundle(DEFAULT_RULE_PATHS, str(bundle_path))
+    payload = marshal.loads(bundle_path.read_bytes()[len(BUNDLE_MAGIC):])
+    assert payload["format"] == BUNDLE_FORMAT
+
+    for field in ("sources", "rules", "version"):
+        partial = {key: value for key, value in payload.items() if key != field}
+        bundle_path.write_bytes(BUNDLE_MAGIC + marshal.dumps(partial))
+        assert load_bundle(str(bundle_path), DEFAULT_RULE_PATHS) is None
+
+
+def test_results_carry_rule_set_version():
+    applicant = Person(id="app", name="Applicant", birth_country="USA")
+    parent = Person(id="p", name="Parent", birth_country="Italy")
+    result = evaluate_lineage(
+        [LineageLink(parent=parent, child=applicant, relationship="father")], cache=None
+    )
+    assert result.rule_set_version == load_rule_engine().version
+    assert result.to_payload()["rule_set_version"] == result.rule_set_version
+    schema = evaluation_output_schema()
+    assert set(result.to_payload()) - {"lineage"} <= set(schema["properties"])
+    assert result.overall_status.value in schema["properties"]["overall_status"]["enum"]
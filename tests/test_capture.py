@@ -0,0 +1,75 @@
+import gzip
+import json
+
+from benchmarks.loadtest import load_corpus
+from src.capture import REDACTED, TrafficCapture, iter_captured_requests, redact
+
+
+def _capture(tmp_path, **options):
+    # A long interval leaves flushing to the test.
+    return TrafficCapture(str(tmp_path), flush_interval=3600, **options)
+
+
+def _body(name="Giorgio"):
+    return json.dumps(
+        {"applicant": {"id": "app", "name": name}, "ancestors": [{"id": "a1", "name": name}]}
+    ).encode("utf-8")
+
+
+def test_redacts_fields_at_any_depth():
+    value = {"name": "x", "people": [{"name": "y", "id": "1"}], "notes": {"name": None}}
+    assert redact(value, frozenset(["name"])) == {
+        "name": REDACTED,
+        "people": [{"name": REDACTED, "id": "1"}],
+        "notes": {"name": REDACTED},
+    }
+
+
+def test_flushes_redacted_exchanges_to_jsonl(tmp_path):
+    capture = _capture(tmp_path)
+    assert capture.record("/api/evaluate/", 200, _body(), b'{"overall_status":"OK"}')
+    capture.record("/api/evaluate/", 400, b"not json", b'{"detail":"bad"}')
+    assert list(tmp_path.iterdir()) == []
+
+    capture.close()
+    (path,) = tmp_path.iterdir()
+    assert path.name.startswith("capture-") and path.name.endswith(".jsonl")
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["status"] for line in lines] == [200, 400]
+    assert lines[0]["request"]["applicant"] == {"id": "app", "name": REDACTED}
+    assert lines[0]["response"] == {"overall_status": "OK"}
+    assert lines[1]["request"] == "not json"
+    assert capture.stats()["written"] == 2
+
+
+def test_rotates_by_size_and_compresses(tmp_path):
+    capture = _capture(tmp_path, max_bytes=1, compress=True)
+    for _ in range(3):
+        capture.record("/api/evaluate/", 200, _body(), b"{}")
+    capture.close()
+
+    paths = sorted(tmp_path.iterdir())
+    assert len(paths) == 3
+    for path in paths:
+        assert path.name.endswith(".jsonl.gz")
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            assert len(handle.read().splitlines()) == 1
+    requests = list(iter_captured_requests(str(paths[0])))
+    assert requests[0]["applicant"]["name"] == REDACTED
+    assert len(load_corpus(str(paths[0]), seed=0, count=0)) == 1
+
+
+def test_sampling_and_full_buffer_drop_instead_of_blocking(tmp_path):
+    capture = _capture(tmp_path, sample_rate=0.0)
+    assert not capture.record("/api/evaluate/", 200, _body(), b"{}")
+    assert capture.stats()["sampled_out"] == 1
+    capture.close()
+
+    capture = _capture(tmp_path / "ring", capacity=2)
+    for index in range(5):
+        capture.record(f"/api/evaluate/{index}", 200, _body(), b"{}")
+    assert capture.stats()["overwritten"] == 3
+    capture.close()
+    (path,) = (tmp_path / "ring").iterdir()
+    paths = [json.loads(line)["path"] for line in path.read_text(encoding="utf-8").splitlines()]
+    assert paths == ["/api/evaluate/3", "/api/evaluate/4"]
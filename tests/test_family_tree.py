@@ -0,0 +1,107 @@
+import copy
+import random
+from datetime import date
+
+import pytest
+
+from src.decoder import DecodeError, decode_family_tree_request
+from src.evaluator import evaluate_lineage, load_rule_engine
+from src.family_tree import evaluate_family_tree
+from src.models import CitizenshipEvent, LineageLink, Person
+
+
+def _random_tree(rng, generations=4, width=4):
+    people = {}
+    links = []
+    previous = []
+    for generation in range(generations):
+        current = []
+        for index in range(rng.randint(1, width)):
+            born = date(1860 + 30 * generation + rng.randint(0, 15), 1 + index, 1)
+            person = Person(
+                id=f"g{generation}p{index}",
+                name=f"Person {generation}.{index}",
+                birth_date=born,
+                birth_country=rng.choice(["Italy", "USA", "Argentina"]),
+                other_citizenships_at_birth=["USA"] if rng.random() < 0.3 else [],
+            )
+            if rng.random() < 0.3:
+                person.events.append(
+                    CitizenshipEvent(kind="naturalization_foreign", date=date(born.year + 28, 6, 1))
+                )
+            people[person.id] = person
+            current.append(person)
+            for parent in rng.sample(previous, min(len(previous), rng.randint(1, 2))):
+                links.append(
+                    LineageLink(parent=parent, child=person, relationship=rng.choice(["father", "mother"]))
+                )
+        previous = current
+    return people, links
+
+
+def test_tree_results_match_each_lineage():
+    rng = random.Random(3)
+    engine = load_rule_engine()
+    for _ in range(40):
+        people, links = _random_tree(rng)
+        evaluations = evaluate_family_tree(people, links, engine=engine)
+
+        descendants = {link.child.id for link in links}
+        assert {evaluation.person_id for evaluation in evaluations} == descendants
+        for evaluation in evaluations:
+            chain = copy.deepcopy(evaluation.result.lineage)
+            assert [link.parent.id for link in chain] + [evaluation.person_id] == list(evaluation.path)
+            expected = evaluate_lineage(chain, engine=engine, cache=None)
+            assert evaluation.result.to_payload() == expected.to_payload()
+
+
+def test_decodes_tree_payload_and_rejects_cycles():
+    payload = {
+        "persons": [
+            {"id": "a", "name": "A", "birth_country": "Italy"},
+            {"id": "b", "name": "B"},
+            {"id": "c", "name": "C"},
+        ],
+        "lineage_links": [
+            {"parent_id": "a", "child_id": "b", "relationship": "father"},
+            {"parent_id": "a", "child_id": "c", "relationship": "father"},
+        ],
+        "targets": ["c"],
+    }
+    people, links, targets, _ = decode_family_tree_request(payload)
+    [evaluation] = evaluate_family_tree(people, links, targets)
+    assert evaluation.path == ("a", "c")
+
+    payload["lineage_links"].append({"parent_id": "c", "child_id": "a", "relationship": "father"})
+    people, links, targets, _ = decode_family_tree_request(payload)
+    with pytest.raises(DecodeError) as excinfo:
+        evaluate_family_tree(people, links, targets)
+    assert excinfo.value.detail == {"lineage_links": ["Lineage links must not form a cycle"]}
+
+
+def test_path_limit_only_applies_to_targets_and_their_ancestors():
+    # A complete eight-generation pedigree: the applicant has 2**8 lineages.
+    people = {"p1": Person(id="p1", name="Applicant", birth_date=date(1990, 1, 1))}
+    links = []
+    for number in range(1, 2 ** 8):
+        child = people[f"p{number}"]
+        for parent_number in (2 * number, 2 * number + 1):
+            parent = Person(
+                id=f"p{parent_number}",
+                name=f"Ancestor {parent_number}",
+                birth_country="Italy" if parent_number >= 2 ** 8 else "USA",
+            )
+            people[parent.id] = parent
+            relationship = "father" if parent_number % 2 == 0 else "mother"
+            links.append(LineageLink(parent=parent, child=child, relationship=relationship))
+
+    # p128 sits one generation below the roots; its descendants are not walked.
+    evaluations = evaluate_family_tree(people, links, ["p128", "p128"])
+    assert [evaluation.path for evaluation in evaluations] == [
+        ("p256", "p128"),
+        ("p257", "p128"),
+    ]
+
+    with pytest.raises(DecodeError) as excinfo:
+        evaluate_family_tree(people, links, ["p1"])
+    assert excinfo.value.detail == {"lineage_links": ["Person 'p2' has more than 64 lineages"]}
@@ -0,0 +1,122 @@
+import copy
+import random
+from datetime import date, timedelta
+
+from src.models import CitizenshipEvent, LineageLink, Person, TransmissionStatus
+from src.rule_engine.features import (
+    POST_REFORM_EFFECTIVE_DATE,
+    build_feature_flags,
+    normalize_country,
+)
+
+
+def _reference_flags(lineage_chain):
+    """The original per-link implementation, kept to check the single-pass extractor."""
+
+    def find_event(person, kind):
+        return next((event for event in person.events if event.kind == kind), None)
+
+    flags = {
+        "has_pre1948_maternal_link": False,
+        "has_minor_issue_block": False,
+        "has_minor_issue_edge": False,
+        "has_automatic_loss_marriage": False,
+        "tajani_non_exempt": False,
+        "tajani_exempt": False,
+        "alternative_path_by_residence": False,
+        "parent_citizenship_status": TransmissionStatus.INTACT.value,
+        "has_italian_birth_anchor": False,
+    }
+    for link in lineage_chain:
+        parent, child = link.parent, link.child
+        for person in (parent, child):
+            if (person.birth_country or "").strip().lower() == "italy":
+                flags["has_italian_birth_anchor"] = True
+        if link.relationship.lower().startswith("mother"):
+            if child.birth_date and child.birth_date < date(1948, 1, 1):
+                flags["has_pre1948_maternal_link"] = True
+        naturalization = find_event(parent, "naturalization_foreign")
+        if naturalization and child.birth_date and naturalization.date:
+            if naturalization.date < child.birth_date:
+                link.parent_citizenship_status_at_birth = TransmissionStatus.BROKEN_NATURALIZATION
+                flags["parent_citizenship_status"] = TransmissionStatus.BROKEN_NATURALIZATION.value
+            if (naturalization.date - child.birth_date).days / 365.25 < 18:
+                co_resident = naturalization.metadata.get("co_resident_child", True)
+                emancipated = naturalization.metadata.get("child_emancipated", False)
+                jus_soli_country = naturalization.metadata.get("jus_soli_country", False)
+                if co_resident and jus_soli_country and not emancipated:
+                    flags["has_minor_issue_block"] = True
+                elif not co_resident or emancipated:
+                    flags["has_minor_issue_edge"] = True
+        if find_event(parent, "automatic_loss_by_marriage"):
+            flags["has_automatic_loss_marriage"] = True
+        if child.birth_date and child.birth_date >= POST_REFORM_EFFECTIVE_DATE:
+            if child.other_citizenships_at_birth:
+                if not child.notes.get("tajani_exemption", False):
+                    flags["tajani_non_exempt"] = True
+                else:
+                    flags["tajani_exempt"] = True
+        if child.notes.get("resident_in_italy_as_descendant", False):
+            flags["alternative_path_by_residence"] = True
+    return flags
+
+
+def _random_person(rng, index, born):
+    events = []
+    for _ in range(rng.randint(0, 3)):
+        events.append(
+            CitizenshipEvent(
+                kind=rng.choice(["naturalization_foreign", "automatic_loss_by_marriage", "marriage"]),
+                date=born + timedelta(days=rng.randint(-2000, 20000)) if rng.random() < 0.9 else None,
+                metadata={
+                    key: rng.random() < 0.5
+                    for key in ("co_resident_child", "child_emancipated", "jus_soli_country")
+                    if rng.random() < 0.6
+                },
+            )
+        )
+    return Person(
+        id=f"p{index}",
+        name=f"Person {index}",
+        birth_date=born if rng.random() < 0.9 else None,
+        birth_country=rng.choice(["Italy", " italy ", "USA", "Argentina", None]),
+        other_citizenships_at_birth=["USA"] if rng.random() < 0.5 else [],
+        events=events,
+        notes={
+            key: rng.random() < 0.5
+            for key in ("tajani_exemption", "resident_in_italy_as_descendant")
+            if rng.random() < 0.4
+        },
+    )
+
+
+def test_single_pass_matches_reference_extractor():
+    rng = random.Random(12)
+    for _ in range(500):
+        born = date(rng.randint(1850, 1900), 1, 1)
+        people = []
+        for index in range(rng.randint(1, 6)):
+            people.append(_random_person(rng, index, born))
+            born += timedelta(days=rng.randint(5000, 14000))
+        chain = [
+            LineageLink(parent=parent, child=child, relationship=rng.choice(["father", "Mother"]))
+            for parent, child in zip(people, people[1:])
+        ]
+        reference_chain = copy.deepcopy(chain)
+
+        assert build_feature_flags(chain) == _reference_flags(reference_chain)
+        assert [link.parent_citizenship_status_at_birth for link in chain] == [
+            link.parent_citizenship_status_at_birth for link in reference_chain
+        ]
+
+
+def test_country_aliases_anchor_italian_birth():
+    for spelling in ("Italy", "Italia", "IT", "Regno d'Italia", "regno d’italia", "  ITALIA "):
+        assert normalize_country(spelling) == "IT"
+    assert normalize_country("usa") == "USA"
+    assert normalize_country("  ") is None
+
+    parent = Person(id="p", name="Parent", birth_country="Regno d'Italia")
+    child = Person(id="c", name="Child", birth_country="USA")
+    flags = build_feature_flags([LineageLink(parent=parent, child=child, relationship="father")])
+    assert flags["has_italian_birth_anchor"]
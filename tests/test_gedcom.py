@@ -0,0 +1,159 @@
+from datetime import date
+
+import pytest
+
+from src.decoder import decode_request
+from src.evaluator import evaluate_lineage
+from src.gedcom import GedcomError, GedcomIndex, lineage_payload, main, parse_gedcom_date
+
+
+TREE = """﻿0 HEAD
+1 CHAR UTF-8
+0 @I1@ INDI
+1 NAME Giorgio /Rossi/
+1 BIRT
+2 DATE 3 MAR 1880
+2 PLAC Lucca, Toscana, Italia
+1 NATU
+2 DATE ABT 1925
+2 PLAC New York, USA
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Anna /Bianchi/
+1 BIRT
+2 DATE 1885
+2 PLAC Boston, USA
+1 FAMS @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+0 @I3@ INDI
+1 NAME Maria /Rossi/
+1 BIRT
+2 DATE 12 JUN 1920
+2 PLAC Boston, Massachusetts, USA
+1 FAMC @F1@
+1 FAMS @F2@
+0 @I4@ INDI
+1 NAME Paul /Smith/
+1 BIRT
+2 DATE 1 JAN 1915
+2 PLAC Chicago, USA
+1 FAMC @F3@
+1 FAMS @F2@
+0 @F2@ FAM
+1 HUSB @I4@
+1 WIFE @I3@
+1 CHIL @I5@
+0 @I5@ INDI
+1 NAME John /Smith/
+1 BIRT
+2 DATE 5 MAY 1950
+2 PLAC Chicago, USA
+1 FAMC @F2@
+0 @I6@ INDI
+1 NAME Luigi /Smith/
+1 BIRT
+2 DATE 1890
+2 PLAC Napoli, Regno d'Italia
+1 FAMS @F3@
+0 @F3@ FAM
+1 HUSB @I6@
+1 CHIL @I4@
+0 @I7@ INDI
+1 NAME Unrelated /Branch/
+1 BIRT
+2 PLAC Roma, Italy
+0 TRLR
+"""
+
+
+@pytest.fixture
+def tree_path(tmp_path):
+    path = tmp_path / "tree.ged"
+    path.write_bytes(TREE.replace("\n", "\r\n").encode("utf-8"))
+    return str(path)
+
+
+def test_index_keeps_only_the_parent_structure(tree_path):
+    index = GedcomIndex(tree_path)
+
+    assert set(index.offsets) == {"I1", "I2", "I3", "I4", "I5", "I6", "I7"}
+    assert index.birth_families == {"I3": ("F1",), "I4": ("F3",), "I5": ("F2",)}
+    assert index.families == {"F1": ("I1", "I2"), "F2": ("I4", "I3"), "F3": ("I6", None)}
+    assert index.italian_born == {"I1", "I6", "I7"}
+
+
+def test_lineages_stop_at_the_nearest_italian_born_ancestor(tree_path):
+    lineages = GedcomIndex(tree_path).lineages("@I5@")
+
+    assert [(lineage.person_ids, lineage.relationships) for lineage in lineages] == [
+        (("I6", "I4", "I5"), ("father", "father")),
+        (("I1", "I3", "I5"), ("father", "mother")),
+    ]
+    assert GedcomIndex(tree_path).lineages("I5", max_generations=1) == []
+
+
+def test_lineage_chains_load_only_people_on_the_lineages(tree_path):
+    index = GedcomIndex(tree_path)
+    people = index.load_people(["I1", "I3", "I5"])
+    assert set(people) == {"I1", "I3", "I5"}
+
+    giorgio = people["I1"]
+    assert giorgio.name == "Giorgio Rossi"
+    assert giorgio.birth_date == date(1880, 3, 3)
+    assert giorgio.birth_country == "Italia"
+    [naturalization] = giorgio.events
+    assert naturalization.kind == "naturalization_foreign"
+    assert naturalization.date == date(1925, 1, 1)
+    assert naturalization.country == "USA"
+    assert naturalization.metadata == {"gedcom_date": "ABT 1925", "date_precision": "approximate"}
+    assert people["I3"].notes == {}
+    assert index.load_people(["I6"])["I6"].notes == {
+        "gedcom_birth_date": "1890",
+        "birth_date_precision": "year",
+    }
+
+    chains = index.lineage_chains("I5")
+    assert [[link.parent.id for link in chain] for chain in chains] == [["I6", "I4"], ["I1", "I3"]]
+    assert chains[1][0].child is chains[1][1].parent
+
+
+def test_payloads_evaluate_like_the_chains(tree_path):
+    for chain in GedcomIndex(tree_path).lineage_chains("I5"):
+        links, context = decode_request(lineage_payload(chain))
+        expected = evaluate_lineage(chain, cache=None).to_payload()
+        assert evaluate_lineage(links, context, cache=None).to_payload() == expected
+
+
+def test_unknown_applicant_is_rejected(tree_path):
+    with pytest.raises(GedcomError):
+        GedcomIndex(tree_path).lineages("I99")
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("3 MAR 1880", (date(1880, 3, 3), "day")),
+        ("MAR 1880", (date(1880, 3, 1), "month")),
+        ("1880", (date(1880, 1, 1), "year")),
+        ("ABT 12 JAN 1901", (date(1901, 1, 12), "approximate")),
+        ("BET 1900 AND 1910", (date(1900, 1, 1), "approximate")),
+        ("@#DGREGORIAN@ 2 FEB 1700/01", (date(1700, 2, 2), "day")),
+        ("INT 1900 (from census)", (date(1900, 1, 1), "approximate")),
+        ("31 FEB 1900", (None, None)),
+        ("(unknown)", (None, None)),
+        ("", (None, None)),
+    ],
+)
+def test_parse_gedcom_date(value, expected):
+    assert parse_gedcom_date(value) == expected
+
+
+def test_cli_writes_payloads(tree_path, capsys):
+    assert main([tree_path, "--applicant", "I5", "--payloads"]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    assert '"applicant":{"id":"I5","name":"John Smith"' in lines[0]
@@ -0,0 +1,66 @@
+import asyncio
+
+from src.instrumentation import StageHistograms, StageTimer, current_timer, stage, start_timer, stop_timer
+
+
+def test_stage_is_a_no_op_without_a_timer():
+    assert current_timer() is None
+    with stage("decode"):
+        pass
+    assert current_timer() is None
+
+
+def test_stages_accumulate_on_the_active_timer():
+    timer, token = start_timer()
+    try:
+        for _ in range(3):
+            with stage("evaluate"):
+                pass
+        with stage("decode"):
+            pass
+    finally:
+        stop_timer(token)
+
+    assert list(timer.durations) == ["evaluate", "decode"]
+    assert all(seconds >= 0 for seconds in timer.durations.values())
+    assert current_timer() is None
+    header = timer.server_timing()
+    assert header.startswith("evaluate;dur=") and ", decode;dur=" in header
+
+
+def test_timers_are_isolated_between_tasks():
+    async def request(name):
+        timer, token = start_timer()
+        await asyncio.sleep(0)
+        with stage(name):
+            await asyncio.sleep(0)
+        stop_timer(token)
+        return timer
+
+    async def both():
+        return await asyncio.gather(request("first"), request("second"))
+
+    first, second = asyncio.run(both())
+    assert list(first.durations) == ["first"]
+    assert list(second.durations) == ["second"]
+
+
+def test_histograms_render_cumulative_buckets():
+    histograms = StageHistograms(name="stage_seconds", buckets=(0.001, 0.01))
+    for seconds in (0.0005, 0.005, 0.5):
+        timer = StageTimer()
+        timer.record("evaluate", seconds)
+        histograms.observe(timer)
+
+    lines = histograms.render().splitlines()
+    assert lines[:2] == [
+        "# HELP stage_seconds Time spent in each request stage.",
+        "# TYPE stage_seconds histogram",
+    ]
+    assert lines[2:5] == [
+        'stage_seconds_bucket{stage="evaluate",le="0.001"} 1',
+        'stage_seconds_bucket{stage="evaluate",le="0.01"} 2',
+        'stage_seconds_bucket{stage="evaluate",le="+Inf"} 3',
+    ]
+    assert lines[5] == 'stage_seconds_sum{stage="evaluate"} 0.5055'
+    assert lines[6] == 'stage_seconds_count{stage="evaluate"} 3'
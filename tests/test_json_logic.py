@@ -0,0 +1,104 @@
+import itertools
+
+import pytest
+
+from src.evaluator import DEFAULT_RULE_PATHS
+from src.models import TransmissionStatus
+from src.rule_engine.json_logic import JsonLogicEvaluator, compile_expression, guard_variables
+from src.rule_engine.loader import RuleLoader
+
+
+BOOLEAN_FLAGS = [
+    "has_pre1948_maternal_link",
+    "has_minor_issue_block",
+    "has_minor_issue_edge",
+    "has_automatic_loss_marriage",
+    "tajani_non_exempt",
+    "tajani_exempt",
+    "alternative_path_by_residence",
+    "has_italian_birth_anchor",
+]
+
+
+def _contexts():
+    statuses = [TransmissionStatus.INTACT.value, TransmissionStatus.BROKEN_NATURALIZATION.value]
+    for values in itertools.product([False, True], repeat=len(BOOLEAN_FLAGS)):
+        for status in statuses:
+            context = dict(zip(BOOLEAN_FLAGS, values))
+            context["parent_citizenship_status"] = status
+            context["process_type"] = "COURT" if values[0] else None
+            context["lineage_length"] = sum(values)
+            yield context
+    yield {}
+
+
+def _outcome(evaluate, context):
+    try:
+        return ("value", evaluate(context))
+    except Exception as exc:  # errors must surface identically from both paths
+        return ("error", type(exc))
+
+
+def test_compiled_rules_match_interpreter():
+    rules = RuleLoader(DEFAULT_RULE_PATHS).load()
+    compiled = [(rule, compile_expression(rule.condition)) for rule in rules]
+    for context in _contexts():
+        evaluator = JsonLogicEvaluator(context)
+        for rule, condition in compiled:
+            assert condition(context) == evaluator.evaluate(rule.condition), (rule.id, context)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        True,
+        None,
+        [1, {"var": "lineage_length"}],
+        {"var": "missing"},
+        {"not": {"var": "has_italian_birth_anchor"}},
+        {"and": [{"var": "tajani_exempt"}, True, {"var": "has_italian_birth_anchor"}]},
+        {"and": [{"var": "tajani_exempt"}, False, {"unknown_is_never_reached": 1}]},
+        {"or": [False, {"var": "tajani_exempt"}]},
+        {"or": [{"var": "tajani_exempt"}, {"eq": [{"var": "process_type"}, "COURT"]}]},
+        {"in": [{"var": "process_type"}, ["ADMIN", "COURT"]]},
+        {"in": [["ADMIN", "COURT"], {"var": "process_type"}]},
+        {"neq": [{"var": "parent_citizenship_status"}, "INTACT"]},
+        {"gte": [{"var": "lineage_length"}, 3]},
+        {"lt": [2, {"var": "lineage_length"}]},
+        {"eq": [{"eq": [1, 1]}, {"not": [False]}]},
+    ],
+)
+def test_compiled_expressions_match_interpreter(expr):
+    for context in _contexts():
+        if "unknown_is_never_reached" in str(expr):
+            # The interpreter never reaches the bogus operator after a constant false.
+            assert compile_expression(expr)(context) is False
+            continue
+        compiled = _outcome(compile_expression(expr), context)
+        interpreted = _outcome(lambda ctx: JsonLogicEvaluator(ctx).evaluate(expr), context)
+        assert compiled == interpreted, context
+
+
+def test_invalid_expressions_are_rejected_at_compile_time():
+    with pytest.raises(ValueError, match="Unsupported operator"):
+        compile_expression({"xor": [True, False]})
+    with pytest.raises(ValueError, match="Invalid expression"):
+        compile_expression({"eq": [1, 1], "neq": [1, 2]})
+
+
+@pytest.mark.parametrize(
+    "expr, guards",
+    [
+        ({"eq": [{"var": "tajani_exempt"}, True]}, {"tajani_exempt"}),
+        ({"eq": ["COURT", {"var": "process_type"}]}, {"process_type"}),
+        ({"eq": [{"var": "has_italian_birth_anchor"}, False]}, set()),
+        ({"var": "tajani_exempt"}, {"tajani_exempt"}),
+        ({"and": [{"var": "a"}, {"eq": [{"var": "b"}, 1]}]}, {"a", "b"}),
+        ({"or": [{"and": [{"var": "a"}, {"var": "b"}]}, {"var": "a"}]}, {"a"}),
+        ({"or": [{"var": "a"}, {"var": "b"}]}, set()),
+        ({"not": {"var": "a"}}, set()),
+        ({"gt": [{"var": "lineage_length"}, 0]}, set()),
+    ],
+)
+def test_guard_variables(expr, guards):
+    assert guard_variables(expr) == guards
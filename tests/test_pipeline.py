@@ -0,0 +1,135 @@
+import dataclasses
+import itertools
+from datetime import datetime
+
+import pytest
+
+from src.evaluator import DEFAULT_RULE_PATHS
+from src.models import Rule
+from src.rule_engine.features import build_feature_flags
+from src.rule_engine.json_logic import JsonLogicEvaluator
+from src.rule_engine.loader import RuleLoader
+from src.rule_engine.pipeline import EvaluationContext, RuleEngine
+
+
+def _context(features):
+    return EvaluationContext(lineage_chain=[], process_context={}, now=datetime(2025, 1, 1), features=features)
+
+
+def _reference_rule_ids(rules, flat_context):
+    evaluator = JsonLogicEvaluator(flat_context)
+    return [rule.id for rule in rules if evaluator.evaluate(rule.condition)]
+
+
+def test_indexed_engine_matches_full_scan_over_flag_space():
+    rules = RuleLoader(DEFAULT_RULE_PATHS).load()
+    # Drop the lineage precondition so every rule is reachable with an empty chain.
+    for rule in rules:
+        rule.preconditions = {}
+    engine = RuleEngine(rules)
+    defaults = build_feature_flags([])
+    boolean_flags = [name for name, value in defaults.items() if isinstance(value, bool)]
+
+    for values in itertools.product([False, True], repeat=len(boolean_flags)):
+        for status in ("INTACT", "BROKEN_NATURALIZATION"):
+            features = dict(defaults, **dict(zip(boolean_flags, values)))
+            features["parent_citizenship_status"] = status
+            context = _context(features)
+            result = engine.evaluate(context)
+            expected = _reference_rule_ids(rules, context.to_dict())
+            assert [outcome.rule_id for outcome in result.rule_outcomes] == expected
+
+
+def test_indexed_rules_keep_file_order_for_aggregation():
+    def rule(rule_id, flag, status, mode):
+        return Rule(
+            id=rule_id,
+            description="",
+            preconditions={},
+            condition={"eq": [{"var": flag}, True]},
+            effects={"status": status, "acquisition_mode": mode},
+        )
+
+    engine = RuleEngine(
+        [
+            rule("z_first", "zeta", "ALTERNATIVE_PATH", "BY_RESIDENCE"),
+            rule("a_second", "alpha", "COURT_ONLY_1948", "BENEFIT_OF_LAW"),
+        ]
+    )
+    result = engine.evaluate(_context({"zeta": True, "alpha": True}))
+
+    assert [outcome.rule_id for outcome in result.rule_outcomes] == ["z_first", "a_second"]
+    assert result.overall_status.value == "COURT_ONLY_1948"
+    assert result.acquisition_mode.value == "BENEFIT_OF_LAW"
+
+
+def test_outcomes_are_shared_immutable_instances():
+    engine = RuleEngine(
+        [
+            Rule(
+                id="always",
+                description="Always fires",
+                preconditions={},
+                condition=True,
+                effects={"status": "COURT_ONLY_1948", "confidence": "LOW"},
+            )
+        ]
+    )
+    first = engine.evaluate(_context({}))
+    second = engine.evaluate(_context({}))
+
+    assert first.rule_outcomes[0] is second.rule_outcomes[0]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.rule_outcomes[0].notes = "changed"
+    assert first.to_payload()["rule_outcomes"] == [
+        {
+            "rule_id": "always",
+            "status": "COURT_ONLY_1948",
+            "notes": "Always fires",
+            "confidence": "LOW",
+            "needs_lawyer": False,
+        }
+    ]
+
+
+def test_rule_stats_count_candidates_evaluations_and_hits():
+    def rule(rule_id, condition, preconditions=None):
+        return Rule(
+            id=rule_id,
+            description="",
+            preconditions=preconditions or {},
+            condition=condition,
+            effects={"status": "COURT_ONLY_1948"},
+        )
+
+    engine = RuleEngine(
+        [
+            rule("guarded", {"eq": [{"var": "flag"}, True]}),
+            rule("always", True),
+            rule("needs_lineage", True, {"needs_lineage": True}),
+        ],
+        version="v1",
+    )
+    assert engine.stats is None
+    engine.evaluate(_context({"flag": False}))
+
+    stats = engine.enable_stats()
+    assert engine.enable_stats() is stats
+    for flag in (True, False, False):
+        engine.evaluate(_context({"flag": flag}))
+
+    payload = stats.to_payload()
+    assert payload["rule_set_version"] == "v1"
+    assert payload["passes"] == 3
+    counts = {
+        entry["rule_id"]: (entry["candidates"], entry["evaluated"], entry["fired"])
+        for entry in payload["rules"]
+    }
+    assert counts == {"guarded": (1, 1, 1), "always": (3, 3, 3), "needs_lineage": (3, 0, 0)}
+    assert payload["rules"][1]["fire_rate"] == 1.0 and payload["rules"][1]["total_us"] > 0
+    assert payload["rules"][2]["mean_us"] is None
+
+    stats.merge(payload)
+    assert stats.to_payload()["rules"][1]["evaluated"] == 6
+    stats.reset()
+    assert stats.to_payload()["passes"] == 0
@@ -0,0 +1,80 @@
+import json
+import os
+
+from src.evaluator import DEFAULT_RULE_PATHS
+from src.rule_engine.registry import RuleSetRegistry
+
+
+def _write_rules(path, rule_ids):
+    rules = [
+        {
+            "id": rule_id,
+            "condition": {"eq": [{"var": "has_pre1948_maternal_link"}, True]},
+            "effects": {"status": "COURT_ONLY_1948"},
+        }
+        for rule_id in rule_ids
+    ]
+    path.write_text(json.dumps({"rules": rules}), encoding="utf-8")
+
+
+def test_registry_reuses_engine_until_file_changes(tmp_path):
+    rule_file = tmp_path / "rules.yaml"
+    _write_rules(rule_file, ["first"])
+    registry = RuleSetRegistry()
+
+    engine = registry.get_engine([str(rule_file)])
+    assert registry.get_engine([str(rule_file)]) is engine
+    assert [rule.id for rule in engine.rules] == ["first"]
+
+    _write_rules(rule_file, ["first", "second"])
+    stat = os.stat(rule_file)
+    os.utime(rule_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    reloaded = registry.get_engine([str(rule_file)])
+    assert reloaded is not engine
+    assert [rule.id for rule in reloaded.rules] == ["first", "second"]
+    # The previous snapshot is left untouched for callers still holding it.
+    assert [rule.id for rule in engine.rules] == ["first"]
+
+
+def test_registry_keys_on_resolved_paths():
+    registry = RuleSetRegistry()
+    relative = registry.get(DEFAULT_RULE_PATHS)
+    absolute = registry.get([os.path.abspath(path) for path in DEFAULT_RULE_PATHS])
+    assert relative is absolute
+
+
+def test_registry_enables_stats_on_current_and_reloaded_engines(tmp_path):
+    rule_file = tmp_path / "rules.yaml"
+    _write_rules(rule_file, ["first"])
+    registry = RuleSetRegistry()
+
+    engine = registry.get_engine([str(rule_file)])
+    assert engine.stats is None
+    registry.enable_stats()
+    assert engine.stats is not None
+
+    _write_rules(rule_file, ["first", "second"])
+    stat = os.stat(rule_file)
+    os.utime(rule_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    reloaded = registry.get_engine([str(rule_file)])
+    assert reloaded is not engine
+    assert reloaded.stats.rule_ids == ("first", "second")
+
+
+def test_registry_builds_truth_tables_on_current_and_reloaded_engines(tmp_path):
+    rule_file = tmp_path / "rules.yaml"
+    _write_rules(rule_file, ["first"])
+    registry = RuleSetRegistry()
+
+    engine = registry.get_engine([str(rule_file)])
+    assert engine.table is None
+    registry.enable_truth_tables()
+    assert engine.table is not None
+
+    _write_rules(rule_file, ["first", "second"])
+    stat = os.stat(rule_file)
+    os.utime(rule_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    reloaded = registry.get_engine([str(rule_file)])
+    assert reloaded is not engine
+    assert [entry["rule_id"] for entry in reloaded.table.coverage()["rules"]] == ["first", "second"]
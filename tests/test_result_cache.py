@@ -0,0 +1,72 @@
+import copy
+from datetime import date
+
+from src.evaluator import evaluate_lineage
+from src.models import CitizenshipEvent, LineageLink, Person, TransmissionStatus
+from src.result_cache import CachedEvaluation, ResultCache, lineage_fingerprint
+
+
+def _lineage():
+    ancestor = Person(
+        id="a1",
+        name="Giorgio",
+        birth_date=date(1890, 5, 1),
+        birth_country="Italy",
+        events=[CitizenshipEvent(kind="naturalization_foreign", date=date(1910, 1, 1))],
+    )
+    child = Person(id="a2", name="Giulio", birth_date=date(1920, 6, 1), birth_country="USA")
+    applicant = Person(id="app", name="Applicant", birth_date=date(1950, 7, 1), birth_country="USA")
+    return [
+        LineageLink(parent=ancestor, child=child, relationship="father"),
+        LineageLink(parent=child, child=applicant, relationship="mother"),
+    ]
+
+
+def test_fingerprint_is_canonical():
+    first = _lineage()
+    second = copy.deepcopy(first)
+    second[0].parent.notes = {}
+    assert lineage_fingerprint(first, {"a": 1, "b": 2}, "v1") == lineage_fingerprint(
+        second, {"b": 2, "a": 1}, "v1"
+    )
+    assert lineage_fingerprint(first, {}, "v1") != lineage_fingerprint(first, {}, "v2")
+    second[1].child.birth_date = date(1951, 7, 1)
+    assert lineage_fingerprint(first, {}, "v1") != lineage_fingerprint(second, {}, "v1")
+
+
+def test_cache_hit_reproduces_uncached_result():
+    cache = ResultCache()
+    expected = evaluate_lineage(_lineage(), cache=None)
+
+    evaluate_lineage(_lineage(), cache=cache)
+    lineage = _lineage()
+    cached = evaluate_lineage(lineage, cache=cache)
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cached == evaluate_lineage(_lineage(), cache=None)
+    assert cached.rule_outcomes == expected.rule_outcomes
+    assert cached.lineage is lineage
+    assert lineage[0].parent_citizenship_status_at_birth == TransmissionStatus.BROKEN_NATURALIZATION
+
+
+def test_cache_lru_ttl_and_version_invalidation():
+    now = [0.0]
+    cache = ResultCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    value = CachedEvaluation.from_result(evaluate_lineage(_lineage(), cache=None))
+
+    cache.put("a", "v1", value)
+    cache.put("b", "v1", value)
+    assert cache.get("a", "v1") is value
+    cache.put("c", "v1", value)
+    assert cache.get("b", "v1") is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] = 11
+    assert cache.get("a", "v1") is None
+    assert cache.stats()["expirations"] == 1
+
+    cache.put("d", "v1", value)
+    assert cache.get("d", "v2") is None
+    assert len(cache) == 0
+    assert cache.stats()["invalidations"] == 1
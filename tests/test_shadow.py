@@ -0,0 +1,126 @@
+import copy
+import json
+import shutil
+import sqlite3
+import threading
+from datetime import date
+
+from src.evaluator import DEFAULT_RULE_PATHS, evaluate_lineage
+from src.models import CitizenshipEvent, LineageLink, Person, TransmissionStatus
+from src.rule_engine.registry import RuleSetRegistry
+from src.shadow import ShadowEvaluator, main, summarize
+
+
+def _candidate_rules(tmp_path):
+    """The default rules with the 1948 maternal rule turned into a contested edge case."""
+    rules_dir = tmp_path / "candidate"
+    rules_dir.mkdir()
+    for path in DEFAULT_RULE_PATHS:
+        shutil.copy(path, rules_dir)
+    maternal = rules_dir / "maternal1948.yaml"
+    data = json.loads(maternal.read_text(encoding="utf-8"))
+    data["rules"][0]["effects"]["status"] = "CONTESTED_EDGE_CASE"
+    maternal.write_text(json.dumps(data), encoding="utf-8")
+    return rules_dir
+
+
+def _lineage(mother_line):
+    ancestor = Person(id="a", name="Nonna", birth_date=date(1895, 1, 1), birth_country="Italy")
+    applicant = Person(id="app", name="Applicant", birth_date=date(1930, 1, 1), birth_country="USA")
+    relationship = "mother" if mother_line else "father"
+    return [LineageLink(parent=ancestor, child=applicant, relationship=relationship)]
+
+
+def test_records_only_differing_evaluations(tmp_path):
+    db_path = tmp_path / "shadow.sqlite3"
+    shadow = ShadowEvaluator(
+        str(_candidate_rules(tmp_path)), str(db_path), registry=RuleSetRegistry()
+    )
+    for mother_line in (True, False):
+        lineage = _lineage(mother_line)
+        shadow.submit(lineage, {}, evaluate_lineage(lineage, cache=None))
+    shadow.join()
+
+    assert shadow.stats() == {
+        "submitted": 2,
+        "dropped": 0,
+        "evaluated": 2,
+        "diffs": 1,
+        "errors": 0,
+        "queued": 0,
+    }
+    connection = sqlite3.connect(db_path)
+    rows = connection.execute(
+        "SELECT primary_status, candidate_status, candidate_outcomes FROM shadow_diffs"
+    ).fetchall()
+    connection.close()
+    assert rows == [
+        (
+            "COURT_ONLY_1948",
+            "INDETERMINATE_COMPLEX_CASE",
+            json.dumps([["maternal_1948_court_only", "CONTESTED_EDGE_CASE"]]),
+        )
+    ]
+    summary = summarize(str(db_path))
+    assert summary["diffs"] == 1
+    assert summary["transitions"][0]["status"] == ["COURT_ONLY_1948", "INDETERMINATE_COMPLEX_CASE"]
+    assert main([str(db_path)]) == 0
+    shadow.close()
+
+
+class _BlockingRegistry(RuleSetRegistry):
+    """Holds the shadow worker in its first rule-set lookup until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def get_engine(self, rule_paths, bundle_path=None):
+        self.started.set()
+        self.release.wait(5)
+        return super().get_engine(rule_paths, bundle_path)
+
+
+def test_worker_evaluates_a_copy_of_the_lineage(tmp_path):
+    shadow = ShadowEvaluator(
+        str(_candidate_rules(tmp_path)),
+        str(tmp_path / "shadow.sqlite3"),
+        registry=RuleSetRegistry(),
+    )
+    lineage = _lineage(False)
+    lineage[0].parent.events.append(
+        CitizenshipEvent(kind="naturalization_foreign", date=date(1925, 1, 1))
+    )
+    result = evaluate_lineage(copy.deepcopy(lineage), cache=None)
+    shadow.submit(lineage, {}, result)
+    shadow.join()
+
+    # Evaluating marks the link broken; the submitted chain must be left alone.
+    assert shadow.stats()["evaluated"] == 1
+    assert lineage[0].parent_citizenship_status_at_birth == TransmissionStatus.INTACT
+    shadow.close()
+
+
+def test_drops_work_when_queue_is_full(tmp_path):
+    registry = _BlockingRegistry()
+    shadow = ShadowEvaluator(
+        str(_candidate_rules(tmp_path)),
+        str(tmp_path / "shadow.sqlite3"),
+        maxsize=1,
+        registry=registry,
+    )
+    lineage = _lineage(True)
+    result = evaluate_lineage(lineage, cache=None)
+    assert shadow.submit(lineage, {}, result)
+    registry.started.wait(5)
+
+    # The worker holds the first lineage, so only one more fits in the queue.
+    accepted = [shadow.submit(lineage, {}, result) for _ in range(4)]
+    registry.release.set()
+    shadow.join()
+
+    assert accepted == [True, False, False, False]
+    assert shadow.stats()["dropped"] == 3
+    assert shadow.stats()["evaluated"] == 2
+    shadow.close()
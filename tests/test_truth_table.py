@@ -0,0 +1,144 @@
+import itertools
+import json
+from datetime import datetime
+
+import pytest
+
+from src.evaluator import DEFAULT_RULE_PATHS
+from src.models import LineageLink, Person, Rule
+from src.rule_engine.features import LINK_FLAGS, default_feature_flags
+from src.rule_engine.loader import RuleLoader
+from src.rule_engine.pipeline import EvaluationContext, RuleEngine
+from src.rule_engine.truth_table import TruthTable, main
+
+
+def _context(features, lineage_chain=(), **process_context):
+    return EvaluationContext(
+        lineage_chain=list(lineage_chain),
+        process_context=process_context,
+        now=datetime(2025, 1, 1),
+        features=features,
+    )
+
+
+def _link():
+    # Feature flags are given directly, so the people on the link do not matter.
+    return LineageLink(
+        parent=Person(id="p", name="P"), child=Person(id="c", name="C"), relationship="father"
+    )
+
+
+def _payload(result):
+    payload = result.to_payload()
+    payload.pop("lineage", None)
+    return payload
+
+
+def _default_engine():
+    loader = RuleLoader(DEFAULT_RULE_PATHS)
+    return RuleEngine(loader.load(), version=loader.fingerprint())
+
+
+def test_table_matches_engine_over_whole_feature_space():
+    engine = _default_engine()
+    table = TruthTable(engine)
+    link = _link()
+
+    for values in itertools.product([False, True], repeat=len(LINK_FLAGS)):
+        for status in ("INTACT", "BROKEN_NATURALIZATION"):
+            features = dict(default_feature_flags(), **dict(zip(LINK_FLAGS, values)))
+            features["parent_citizenship_status"] = status
+            context = _context(features, lineage_chain=[link])
+            tabled = table.lookup(context)
+            assert tabled is not None
+            assert _payload(tabled) == _payload(engine.evaluate(context))
+
+    empty = _context(default_feature_flags())
+    assert _payload(table.lookup(empty)) == _payload(engine.evaluate(empty))
+
+
+def test_values_outside_domains_are_not_tabled():
+    table = TruthTable(_default_engine())
+    features = dict(default_feature_flags(), parent_citizenship_status="SOMETHING_ELSE")
+
+    assert table.lookup(_context(features, lineage_chain=[_link()])) is None
+    # An empty chain with raised flags cannot come from feature extraction.
+    assert table.lookup(_context(dict(default_feature_flags(), tajani_exempt=True))) is None
+
+
+def test_rules_reading_other_variables_fall_back_to_engine():
+    rules = [
+        Rule(
+            id="maternal",
+            description="",
+            preconditions={},
+            condition={"eq": [{"var": "has_pre1948_maternal_link"}, True]},
+            effects={"status": "COURT_ONLY_1948", "acquisition_mode": "BENEFIT_OF_LAW"},
+        ),
+        Rule(
+            id="long_chain",
+            description="",
+            preconditions={},
+            condition={"gt": [{"var": "lineage_length"}, 2]},
+            effects={"status": "CONTESTED_EDGE_CASE"},
+        ),
+        Rule(
+            id="consular",
+            description="",
+            preconditions={},
+            condition={"eq": [{"var": "process_type"}, "consular"]},
+            effects={"status": "ALTERNATIVE_PATH", "acquisition_mode": "BY_RESIDENCE"},
+        ),
+    ]
+    engine = RuleEngine(rules)
+    table = TruthTable(engine)
+    assert [rules[position].id for position in table.fallback] == ["long_chain", "consular"]
+    assert table.variables == ("has_pre1948_maternal_link",)
+
+    features = dict(default_feature_flags(), has_pre1948_maternal_link=True)
+    context = _context(features, lineage_chain=[_link(), _link(), _link()], process_type="consular")
+    result = table.lookup(context)
+    assert [outcome.rule_id for outcome in result.rule_outcomes] == [
+        "maternal",
+        "long_chain",
+        "consular",
+    ]
+    assert _payload(result) == _payload(engine.evaluate(context))
+
+
+def test_engine_evaluates_through_table_unless_recording_stats():
+    engine = _default_engine()
+    engine.table = TruthTable(engine)
+    features = dict(default_feature_flags(), has_pre1948_maternal_link=True)
+    context = _context(features, lineage_chain=[_link()])
+
+    result = engine.evaluate(context)
+    assert result.overall_status.value == "COURT_ONLY_1948"
+    # Results do not share their lists with the table.
+    result.explanations.append("edited")
+    assert "edited" not in engine.evaluate(context).explanations
+
+    stats = engine.enable_stats()
+    engine.evaluate(context)
+    assert stats.passes == 1
+
+
+def test_oversized_feature_space_is_rejected():
+    with pytest.raises(ValueError, match="exceeds"):
+        TruthTable(_default_engine(), max_rows=64)
+
+
+def test_coverage_report(tmp_path):
+    engine = _default_engine()
+    report = TruthTable(engine).coverage()
+
+    assert report["rows"] == 2 ** 8 + 1
+    assert report["fallback_rules"] == []
+    assert "has_automatic_loss_marriage" not in report["variables"]
+    assert {entry["rule_id"] for entry in report["rules"]} == {rule.id for rule in engine.rules}
+    assert report["never_fired"] == []
+    assert sum(report["overall_status"].values()) == report["rows"]
+
+    output = tmp_path / "coverage.json"
+    assert main(["-o", str(output)]) == 0
+    assert json.loads(output.read_text(encoding="utf-8"))["rows"] == report["rows"]
@@ -0,0 +1,92 @@
+import itertools
+import random
+from datetime import date, datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.evaluator import DEFAULT_RULE_PATHS  # noqa: E402
+from src.models import LineageLink, Person  # noqa: E402
+from src.rule_engine.features import build_feature_flags  # noqa: E402
+from src.rule_engine.loader import RuleLoader  # noqa: E402
+from src.rule_engine.pipeline import EvaluationContext, RuleEngine  # noqa: E402
+from src.rule_engine.vectorized import FeatureMatrix, VectorizedRuleEngine, compile_mask  # noqa: E402
+
+
+def _chain(length):
+    people = [
+        Person(id=f"p{i}", name=f"P{i}", birth_date=date(1900 + i, 1, 1), birth_country="USA")
+        for i in range(length + 1)
+    ]
+    return [
+        LineageLink(parent=people[i], child=people[i + 1], relationship="father")
+        for i in range(length)
+    ]
+
+
+def _contexts():
+    defaults = build_feature_flags([])
+    flags = [name for name, value in defaults.items() if isinstance(value, bool)]
+    rng = random.Random(1948)
+    for values in itertools.product([False, True], repeat=len(flags)):
+        for status in ("INTACT", "BROKEN_NATURALIZATION"):
+            features = dict(defaults, **dict(zip(flags, values)))
+            features["parent_citizenship_status"] = status
+            yield EvaluationContext(
+                lineage_chain=_chain(rng.choice([0, 1, 2, 3])),
+                process_context={"process_type": rng.choice([None, "ADMIN", "COURT"])},
+                now=datetime(2025, 1, 1),
+                features=features,
+            )
+
+
+def test_vectorized_engine_matches_scalar_engine():
+    rules = RuleLoader(DEFAULT_RULE_PATHS).load()
+    scalar = RuleEngine(rules)
+    contexts = list(_contexts())
+
+    batch = VectorizedRuleEngine(rules).evaluate(FeatureMatrix.from_contexts(contexts))
+
+    assert len(batch) == len(contexts)
+    for index, context in enumerate(contexts):
+        assert batch.result(index, lineage=context.lineage_chain) == scalar.evaluate(context)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        {"eq": [{"var": "parent_citizenship_status"}, "BROKEN_NATURALIZATION"]},
+        {"neq": [{"var": "process_type"}, "COURT"]},
+        {"and": [{"var": "flag"}, {"not": {"var": "other"}}]},
+        {"or": [{"var": "flag"}, {"gte": [{"var": "lineage_length"}, 2]}]},
+        {"in": [["ADMIN"], {"var": "process_type"}]},
+        {"eq": [{"var": "flag"}, "yes"]},
+        {"eq": [1, 1]},
+    ],
+)
+def test_masks_match_compiled_conditions(expr):
+    from src.rule_engine.json_logic import compile_expression
+
+    rng = random.Random(7)
+    records = [
+        {
+            "flag": rng.random() < 0.5,
+            "other": rng.random() < 0.5,
+            "lineage_length": rng.randint(0, 4),
+            "process_type": rng.choice([None, "ADMIN", "COURT"]),
+            "parent_citizenship_status": rng.choice(["INTACT", "BROKEN_NATURALIZATION"]),
+        }
+        for _ in range(200)
+    ]
+    mask = compile_mask(expr)(FeatureMatrix.from_records(records))
+    condition = compile_expression(expr)
+    assert mask.tolist() == [bool(condition(record)) for record in records]
+
+
+def test_evaluation_does_not_mutate_feature_columns():
+    rules = RuleLoader(DEFAULT_RULE_PATHS).load()
+    records = [dict(build_feature_flags([]), tajani_exempt=True, lineage_length=0)]
+    matrix = FeatureMatrix.from_records(records)
+    VectorizedRuleEngine(rules).evaluate(matrix)
+    assert matrix.columns["tajani_exempt"].tolist() == [True]
@@ -0,0 +1,116 @@
+import copy
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.decoder import DecodeError
+from src.evaluator import evaluate_lineage, load_rule_engine
+from src.models import CitizenshipEvent, LineageLink, Person, TransmissionStatus
+from src.whatif import WhatIfSession, WhatIfSessionStore
+
+
+def _chain(length):
+    people = [
+        Person(id=f"p{index}", name=f"Person {index}", birth_date=date(1880 + 25 * index, 3, 1))
+        for index in range(length + 1)
+    ]
+    people[0].birth_country = "Italy"
+    return [
+        LineageLink(parent=parent, child=child, relationship="mother" if index % 2 else "father")
+        for index, (parent, child) in enumerate(zip(people, people[1:]))
+    ]
+
+
+def _random_patch(rng, session, event_counts):
+    person_id = f"p{rng.randrange(len(session.lineage_chain) + 1)}"
+    op = rng.choice(["set_birth_date", "add_event", "remove_event", "set_note"])
+    if op == "set_birth_date":
+        born = date(1870, 1, 1) + timedelta(days=rng.randrange(60000))
+        return {"op": op, "person_id": person_id, "birth_date": born.isoformat()}
+    if op == "remove_event" and event_counts[person_id]:
+        event_counts[person_id] -= 1
+        return {"op": op, "person_id": person_id, "index": rng.randrange(event_counts[person_id] + 1)}
+    if op in ("add_event", "remove_event"):
+        event_counts[person_id] += 1
+        happened = date(1870, 1, 1) + timedelta(days=rng.randrange(60000))
+        return {
+            "op": "add_event",
+            "person_id": person_id,
+            "event": {
+                "kind": rng.choice(["naturalization_foreign", "automatic_loss_by_marriage"]),
+                "date": happened.isoformat(),
+                "metadata": {"jus_soli_country": rng.random() < 0.5},
+            },
+        }
+    key = rng.choice(["tajani_exemption", "resident_in_italy_as_descendant"])
+    return {"op": op, "person_id": person_id, "key": key, "value": rng.choice([True, False, None])}
+
+
+def test_incremental_results_match_full_reevaluation():
+    rng = random.Random(7)
+    engine = load_rule_engine()
+    for _ in range(30):
+        session = WhatIfSession(_chain(rng.randint(1, 8)), engine=engine)
+        for _ in range(10):
+            event_counts = {
+                person_id: len(person.events) for person_id, person in session._people.items()
+            }
+            patches = [_random_patch(rng, session, event_counts) for _ in range(rng.randint(1, 3))]
+            result = session.apply(patches)
+
+            reference_chain = copy.deepcopy(session.lineage_chain)
+            for link in reference_chain:
+                link.parent_citizenship_status_at_birth = TransmissionStatus.INTACT
+            expected = evaluate_lineage(reference_chain, engine=engine, cache=None)
+            assert result.to_payload() == expected.to_payload()
+            assert [link.parent_citizenship_status_at_birth for link in session.lineage_chain] == [
+                link.parent_citizenship_status_at_birth for link in reference_chain
+            ]
+
+
+def test_invalid_patch_batch_changes_nothing():
+    session = WhatIfSession(_chain(2))
+    person = session._people["p1"]
+    person.events.append(CitizenshipEvent(kind="marriage"))
+    before = session.result
+
+    with pytest.raises(DecodeError) as excinfo:
+        session.apply(
+            [
+                {"op": "set_birth_date", "person_id": "p1", "birth_date": "1950-01-01"},
+                {"op": "remove_event", "person_id": "p1", "index": 0},
+                {"op": "remove_event", "person_id": "p1", "index": 0},
+                {"op": "rename", "person_id": "nobody"},
+                {"op": "set_note", "person_id": ["p1"], "key": "k", "value": 1},
+            ]
+        )
+
+    assert excinfo.value.detail == {
+        "patches": {
+            2: {"index": ["Person 'p1' has no event at index 0."]},
+            3: {
+                "op": ['"rename" is not a valid choice.'],
+                "person_id": ["Unknown person_id 'nobody' in lineage"],
+            },
+            4: {"person_id": ["Not a valid string."]},
+        }
+    }
+    assert person.birth_date == date(1905, 3, 1)
+    assert len(person.events) == 1
+    assert session.result is before
+
+
+def test_session_store_expires_and_evicts():
+    now = [0.0]
+    store = WhatIfSessionStore(maxsize=2, ttl=10, clock=lambda: now[0])
+    session = WhatIfSession(_chain(1))
+    first = store.add(session)
+    second = store.add(session)
+
+    now[0] = 5
+    assert store.get(first) is session
+    store.add(session)
+    assert store.get(second) is None
+    now[0] = 16
+    assert store.get(first) is None